@@ -0,0 +1,68 @@
+import argparse
+import sys
+
+from benchmarks.cases import get_benchmarks
+from benchmarks.corpus import build_corpus
+from benchmarks.runner import (
+    compare,
+    format_results,
+    load_rates,
+    run_benchmark,
+    save_results,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks move generation and game simulation.",
+    )
+    parser.add_argument("-k", "--filter", help="only run benchmarks containing this")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus")
+    parser.add_argument(
+        "--quick", action="store_true", help="use a small corpus and few games"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed runs per benchmark"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="slowdown relative to the baseline reported as a regression",
+    )
+    args = parser.parse_args()
+
+    corpus = build_corpus(50 if args.quick else 500, args.seed)
+    benchmarks = [
+        benchmark
+        for benchmark in get_benchmarks(corpus, 20 if args.quick else 200, args.seed)
+        if args.filter is None or args.filter in benchmark.name
+    ]
+
+    results = []
+    for benchmark in benchmarks:
+        results.append(run_benchmark(benchmark, args.repeat))
+        print(format_results(results[-1:]), file=sys.stderr)
+
+    comparisons = None
+    if args.baseline:
+        comparisons = compare(results, load_rates(args.baseline))
+    print(format_results(results, comparisons))
+    if args.output:
+        save_results(results, args.output)
+
+    regressions = [
+        comparison
+        for comparison in comparisons or []
+        if comparison.change < -args.tolerance
+    ]
+    for comparison in regressions:
+        print(f"Regression: {comparison.name} {comparison.change:+.1%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+from functools import partial
+from typing import Callable, List, Sequence
+
+from benchmarks.corpus import Corpus
+from benchmarks.runner import Benchmark
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.comparison import play_cmp, sort_cards
+from utils.game_logic import (
+    _get_five_card_hands,
+    _get_flushes,
+    _get_four_of_a_kinds,
+    _get_full_houses,
+    _get_pairs,
+    _get_singles,
+    _get_straights,
+    _get_triplets,
+    get_valid_plays,
+)
+from utils.simulation import PlayerFactory, simulate
+
+_HELPERS = [
+    _get_singles,
+    _get_pairs,
+    _get_triplets,
+    _get_straights,
+    _get_flushes,
+    _get_full_houses,
+    _get_four_of_a_kinds,
+    _get_five_card_hands,
+]
+
+_TABLES = {
+    "lowest": [LowestAIPlayer] * 4,
+    "random": [RandomAIPlayer] * 4,
+}
+
+
+def _count_plays(generate: Callable[..., list], calls: Sequence[tuple]) -> int:
+    return sum(len(generate(*args)) for args in calls)
+
+
+def _sort_hands(hands: Sequence[List[str]]) -> int:
+    for hand in hands:
+        # sort a reversed copy so every run does the same work
+        sort_cards(hand[::-1])
+    return 0
+
+
+def _compare_plays(play_pairs: Sequence[tuple]) -> int:
+    for play1, play2 in play_pairs:
+        play_cmp(play1, play2)
+    return 0
+
+
+def _simulate(
+    n_games: int, player_factories: Sequence[PlayerFactory], seed: int
+) -> int:
+    return sum(result.turns for result in simulate(n_games, player_factories, seed))
+
+
+def get_benchmarks(corpus: Corpus, n_games: int, seed: int = 0) -> List[Benchmark]:
+    """
+    Returns every benchmark over a corpus.
+
+    Args:
+        corpus (Corpus): The inputs of the move generation benchmarks.
+        n_games (int): Number of games per run of the simulation benchmarks.
+        seed (int, optional): Seed of the simulated games. Defaults to 0.
+
+    Returns:
+        List[Benchmark]: The benchmarks.
+    """
+    free_calls = [(hand,) for hand in corpus.hands]
+    benchmarks = [
+        Benchmark(
+            f"helper{helper.__name__}",
+            "calls",
+            len(free_calls),
+            partial(_count_plays, helper, free_calls),
+        )
+        for helper in _HELPERS
+    ]
+
+    states = {
+        "opening": [(hand, None, True) for hand in corpus.opening_hands],
+        "free": [(hand, None, False) for hand in corpus.hands],
+    }
+    for size in (1, 2, 3, 5):
+        states[f"responding_{size}"] = [
+            (hand, play) for hand, play in corpus.responses if len(play.cards) == size
+        ]
+    benchmarks.extend(
+        Benchmark(
+            f"get_valid_plays_{state}",
+            "calls",
+            len(calls),
+            partial(_count_plays, get_valid_plays, calls),
+        )
+        for state, calls in states.items()
+    )
+
+    benchmarks.append(
+        Benchmark(
+            "sort_cards",
+            "calls",
+            len(corpus.hands),
+            partial(_sort_hands, corpus.hands),
+        )
+    )
+    benchmarks.append(
+        Benchmark(
+            "play_cmp",
+            "calls",
+            len(corpus.play_pairs),
+            partial(_compare_plays, corpus.play_pairs),
+        )
+    )
+    benchmarks.extend(
+        Benchmark(
+            f"simulate_{table}",
+            "games",
+            n_games,
+            partial(_simulate, n_games, player_factories, seed),
+        )
+        for table, player_factories in _TABLES.items()
+    )
+    return benchmarks
@@ -0,0 +1,70 @@
+import random
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from classes.card_set import CardSet
+from utils.comparison import play_key
+from utils.dealing import deal_batch, hands_to_cards
+from utils.game_logic import get_valid_plays
+from utils.simulation import derive_seed
+
+
+class Corpus(NamedTuple):
+    """
+    Fixed, seeded inputs shared by the benchmarks, so that runs on different versions
+    of the code measure exactly the same work.
+    """
+
+    # full sorted 13-card hands
+    hands: List[List[str]]
+    # the hands holding the 3 of diamonds, i.e. the hand making the first play
+    opening_hands: List[List[str]]
+    # a hand and a play of another hand that it has to respond to
+    responses: List[Tuple[List[str], CardSet]]
+    # pairs of plays of the same size to compare
+    play_pairs: List[Tuple[CardSet, CardSet]]
+
+
+def build_corpus(size: int, seed: int = 0) -> Corpus:
+    """
+    Builds a corpus from `size` seeded deals.
+
+    Args:
+        size (int): Number of deals to build the corpus from.
+        seed (int, optional): The seed of the deals. Defaults to 0.
+
+    Returns:
+        Corpus: The corpus.
+    """
+    rng = random.Random(seed)
+    deal_ids = np.array(
+        [derive_seed(seed, deal_number) for deal_number in range(size)],
+        dtype=np.uint64,
+    )
+    deals = hands_to_cards(deal_batch(deal_ids))
+
+    hands = []
+    opening_hands = []
+    responses = []
+    play_pairs = []
+    for deal_number, deal in enumerate(deals):
+        seat = deal_number % len(deal)
+        hand = deal[seat]
+        hands.append(hand)
+        opening_hands.extend(hand for hand in deal if hand[0] == "3d")
+
+        # a play of each size from the next hand for this hand to respond to
+        other_plays = get_valid_plays(deal[(seat + 1) % len(deal)])
+        for size in (1, 2, 3, 5):
+            # in a fixed order, so the picks do not depend on generation order
+            candidates = sorted(
+                (play for play in other_plays if len(play.cards) == size),
+                key=lambda play: (play_key(play), play.cards),
+            )
+            if candidates:
+                responses.append((hand, rng.choice(candidates)))
+            if len(candidates) >= 2:
+                play_pairs.append(tuple(rng.sample(candidates, 2)))
+
+    return Corpus(hands, opening_hands, responses, play_pairs)
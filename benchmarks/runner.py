@@ -0,0 +1,176 @@
+import json
+import platform
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# bump whenever the benchmark workloads change, so old baselines are not compared
+RESULTS_VERSION = 2
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # what one operation is, e.g. "calls" or "games"
+    unit: str
+    # number of operations in one run
+    count: int
+    # performs one run, returning the number of plays generated (or made)
+    run: Callable[[], int]
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    unit: str
+    count: int
+    # fastest run, in seconds
+    seconds: float
+    # plays generated (or made) in one run
+    plays: int
+
+    @property
+    def rate(self) -> float:
+        """
+        Operations per second.
+        """
+        return self.count / self.seconds
+
+    @property
+    def plays_rate(self) -> float:
+        """
+        Plays generated (or made) per second.
+        """
+        return self.plays / self.seconds
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "seconds": self.seconds,
+            "plays": self.plays,
+            "rate": self.rate,
+            "plays_rate": self.plays_rate,
+        }
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline_rate: float
+    rate: float
+
+    @property
+    def change(self) -> float:
+        """
+        Relative change in rate, e.g. -0.1 for 10% slower than the baseline.
+        """
+        return self.rate / self.baseline_rate - 1
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int = 5) -> BenchmarkResult:
+    """
+    Times a benchmark, keeping the fastest of several runs to reduce noise.
+
+    Args:
+        benchmark (Benchmark): The benchmark to run.
+        repeat (int, optional): Number of timed runs. Defaults to 5.
+
+    Returns:
+        BenchmarkResult: The result of the fastest run.
+    """
+    best = float("inf")
+    plays = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        plays = benchmark.run()
+        best = min(best, time.perf_counter() - start)
+    return BenchmarkResult(benchmark.name, benchmark.unit, benchmark.count, best, plays)
+
+
+def results_to_json(results: List[BenchmarkResult]) -> Dict[str, object]:
+    """
+    Converts benchmark results to a JSON-serialisable dict, along with the
+    environment they were measured in.
+
+    Args:
+        results (List[BenchmarkResult]): The results.
+
+    Returns:
+        Dict[str, object]: The results document.
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result.name: result.as_dict() for result in results},
+    }
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(results_to_json(results), file, indent=2)
+
+
+def load_rates(path: str) -> Dict[str, float]:
+    """
+    Loads the rate of each benchmark from a results file.
+
+    Args:
+        path (str): The results file.
+
+    Raises:
+        ValueError: If the results were measured with different benchmark workloads.
+
+    Returns:
+        Dict[str, float]: The rate of each benchmark, by name.
+    """
+    with open(path) as file:
+        document = json.load(file)
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} was recorded with different benchmark workloads")
+    return {name: result["rate"] for name, result in document["results"].items()}
+
+
+def compare(
+    results: List[BenchmarkResult], baseline_rates: Dict[str, float]
+) -> List[Comparison]:
+    """
+    Compares results with the rates of a baseline run. Benchmarks missing from the
+    baseline are skipped.
+
+    Args:
+        results (List[BenchmarkResult]): The results.
+        baseline_rates (Dict[str, float]): The baseline rate of each benchmark.
+
+    Returns:
+        List[Comparison]: The comparison of each benchmark in the baseline.
+    """
+    return [
+        Comparison(result.name, baseline_rates[result.name], result.rate)
+        for result in results
+        if result.name in baseline_rates
+    ]
+
+
+def format_results(
+    results: List[BenchmarkResult], comparisons: Optional[List[Comparison]] = None
+) -> str:
+    """
+    Formats results (and their change from a baseline) as a table.
+
+    Args:
+        results (List[BenchmarkResult]): The results.
+        comparisons (Optional[List[Comparison]], optional): Comparisons with a
+            baseline. Defaults to None.
+
+    Returns:
+        str: The table.
+    """
+    changes = {comparison.name: comparison.change for comparison in comparisons or []}
+    width = max((len(result.name) for result in results), default=0)
+    lines = []
+    for result in results:
+        line = f"{result.name:<{width}}  {result.rate:>12,.1f} {result.unit}/s"
+        if result.plays:
+            line += f"  {result.plays_rate:>12,.0f} plays/s"
+        if result.name in changes:
+            line += f"  {changes[result.name]:+.1%}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+from classes.card_set import CardSet
+from utils.bitmask import CARD_STRINGS
+from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
+from utils.game_logic import (
+    _get_flushes,
+    _get_four_of_a_kinds,
+    _get_full_houses,
+    _get_straights,
+    _suit_flushes,
+    get_valid_plays,
+)
+from utils.hand_analysis import analyse_hand
+
+STRESS_CORPUS_PATH = os.path.join(os.path.dirname(__file__), "stress_corpus.json")
+
+# generating every play of any stress hand must stay within these budgets
+TIME_BUDGET_SECONDS = 0.05
+ALLOCATION_BUDGET_BYTES = 1024 * 1024
+
+_GENERATORS: Dict[str, Callable[[List[str]], list]] = {
+    "get_valid_plays": get_valid_plays,
+    "straights": _get_straights,
+    "flushes": _get_flushes,
+    "full_houses": _get_full_houses,
+    "four_of_a_kinds": _get_four_of_a_kinds,
+}
+
+
+class StressResult(NamedTuple):
+    # number of plays from each generator
+    counts: Dict[str, int]
+    # fastest time to generate every play of the hand, from cold caches
+    seconds: float
+    # peak memory allocated while generating every play of the hand
+    peak_bytes: int
+
+
+def _cards(ranks: str, suits: str) -> List[str]:
+    return [rank + suit for rank in ranks for suit in suits]
+
+
+def _sorted(cards: List[str]) -> List[str]:
+    return sorted(cards, key=CARD_STRINGS.index)
+
+
+def _play_count(hand: List[str]) -> int:
+    return len(get_valid_plays(hand))
+
+
+def search_worst_hand(seed: int, iterations: int = 300) -> List[str]:
+    """
+    Searches for a hand with many plays by repeatedly swapping a card for one outside
+    the hand and keeping swaps that do not reduce the number of plays.
+
+    Args:
+        seed (int): Seed of the starting hand and the swaps.
+        iterations (int, optional): Number of swaps to try. Defaults to 300.
+
+    Returns:
+        List[str]: The sorted hand found.
+    """
+    rng = random.Random(seed)
+    hand = rng.sample(CARD_STRINGS, 13)
+    count = _play_count(hand)
+    for _ in range(iterations):
+        candidate = list(hand)
+        candidate[rng.randrange(13)] = rng.choice(
+            [card for card in CARD_STRINGS if card not in hand]
+        )
+        candidate_count = _play_count(candidate)
+        if candidate_count >= count:
+            hand, count = candidate, candidate_count
+    return _sorted(hand)
+
+
+def build_stress_corpus(seed: int = 0) -> Dict[str, List[str]]:
+    """
+    Builds the pathological 13-card hands: hand-picked shapes that maximise each kind
+    of five-card hand, plus hands found by searching for the most plays.
+
+    Args:
+        seed (int, optional): Seed of the searched hands. Defaults to 0.
+
+    Returns:
+        Dict[str, List[str]]: The sorted cards of each hand, by name.
+    """
+    corpus = {
+        # every flush and straight flush of a suit
+        "one_suit": _cards(RANK_PRIORITY, "d"),
+        "one_suit_spades": _cards(RANK_PRIORITY, "s"),
+        "twelve_suited": _cards(RANK_PRIORITY[:12], "h") + ["2s"],
+        "suited_with_quad": _cards(RANK_PRIORITY[:9], "d")
+        + _cards("2", "chs")
+        + ["ac"],
+        # full houses and four of a kinds
+        "three_quads": _cards("345", SUIT_PRIORITY) + ["6d"],
+        "three_top_quads": _cards("ka2", SUIT_PRIORITY) + ["qs"],
+        "four_triples": _cards("3456", "dch") + ["7d"],
+        "six_pairs": _cards("3579jk", "hs") + ["2d"],
+        # straights over a few ranks
+        "straight_block": _sorted(_cards("34567", "dc") + ["3h", "3s", "4h"]),
+        "two_suited_runs": _sorted(_cards("3456789", "d") + _cards("345678", "s")),
+    }
+    for number in range(3):
+        corpus[f"searched_{number}"] = search_worst_hand(seed + number)
+    return {name: _sorted(hand) for name, hand in corpus.items()}
+
+
+def _clear_caches() -> None:
+    # forget interned card sets and cached hand analyses, so the next generation
+    # allocates everything it would for a hand never seen before
+    CardSet._interned.clear()
+    analyse_hand.cache_clear()
+    _suit_flushes.cache_clear()
+
+
+def measure_hand(hand: List[str], repeat: int = 3) -> StressResult:
+    """
+    Counts the plays of a hand and measures the time and memory taken to generate
+    them all with `get_valid_plays`.
+
+    Every measured call is cold, with the card set intern table and the hand analysis
+    caches cleared first, so the time and allocations that the caches would otherwise
+    hide are counted.
+
+    Args:
+        hand (List[str]): The sorted hand.
+        repeat (int, optional): Number of timed runs. Defaults to 3.
+
+    Returns:
+        StressResult: The measurements.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    _clear_caches()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    get_valid_plays(hand)
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    counts = {name: len(generate(hand)) for name, generate in _GENERATORS.items()}
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        get_valid_plays(hand)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    return StressResult(counts, seconds, peak - baseline)
+
+
+def load_stress_corpus(path: str = STRESS_CORPUS_PATH) -> Dict[str, Dict[str, object]]:
+    """
+    Loads the recorded stress corpus: the cards, play counts, time and peak memory of
+    each hand when it was recorded.
+
+    Args:
+        path (str, optional): The corpus file. Defaults to STRESS_CORPUS_PATH.
+
+    Returns:
+        Dict[str, Dict[str, object]]: The record of each hand, by name.
+    """
+    with open(path) as file:
+        return json.load(file)["hands"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.stress",
+        description="Records play counts and timings of pathological hands.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of searched hands")
+    parser.add_argument("--output", default=STRESS_CORPUS_PATH)
+    args = parser.parse_args()
+
+    records = {}
+    for name, hand in build_stress_corpus(args.seed).items():
+        result = measure_hand(hand)
+        records[name] = {
+            "cards": hand,
+            "counts": result.counts,
+            "seconds": result.seconds,
+            "peak_bytes": result.peak_bytes,
+        }
+        print(
+            f"{name:<18} {result.counts['get_valid_plays']:>5} plays"
+            f"  {result.seconds * 1000:>7.2f} ms  {result.peak_bytes / 1024:>8.1f} KiB"
+        )
+    with open(args.output, "w") as file:
+        json.dump({"seed": args.seed, "hands": records}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
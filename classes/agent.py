@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from classes.card_set import CardSet
+
+
+class Observation(NamedTuple):
+    """
+    What a player can see when it is their turn to decide.
+    """
+
+    # seat of the deciding player, -1 if not known
+    seat: int
+    # the deciding player's (sorted) hand
+    hand: Sequence[str]
+    # the play to beat, None if free to play anything
+    last_play: Optional[CardSet]
+    # number of cards in each player's hand, by seat (empty if not known)
+    cards_left: Tuple[int, ...]
+    # card mask of every card played so far
+    played_mask: int
+    # the plays the player may choose from, with passing last when it is allowed
+    legal_actions: List[CardSet]
+    # whether this is the first play of the game (which must contain the 3 of diamonds)
+    is_first_turn: bool
+
+
+class Agent(ABC):
+    """
+    Anything that chooses plays: a player, a heuristic or a learned policy.
+
+    An agent is given an observation of the game and returns the index of its chosen
+    play in the observation's `legal_actions`, or -1 to pass. `decide_batch` decides for
+    many observations (e.g. from many tables) at once, and can be overridden to score
+    them all in a single vectorised call (see `utils.agent_encoding`).
+    """
+
+    @abstractmethod
+    def decide(self, observation: Observation) -> int:
+        """
+        Chooses a play.
+
+        Args:
+            observation (Observation): What the deciding player can see.
+
+        Returns:
+            int: The index of the chosen play in `observation.legal_actions`, or -1 to
+                pass.
+        """
+        pass
+
+    def decide_batch(self, observations: Sequence[Observation]) -> List[int]:
+        """
+        Chooses a play for each of many observations. Calls `decide` for each one
+        unless overridden.
+
+        Args:
+            observations (Sequence[Observation]): The observations to decide for.
+
+        Returns:
+            List[int]: The index of each chosen play, as returned by `decide`.
+        """
+        return [self.decide(observation) for observation in observations]
@@ -0,0 +1,187 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.action_catalogue import ActionCatalogue, get_catalogue, to_card_masks
+from utils.bitmask import CARD_COUNT
+from utils.dealing import deal_seats
+
+# card states used in the state encoding
+UNKNOWN = 0
+IN_HAND = 1
+PLAYED = 2
+
+
+class BatchGameEnv:
+    """
+    Steps many Big Two games in lockstep with the game state held in NumPy arrays.
+
+    Actions are the ids of the plays in the action catalogue, plus its pass action. For each game the env holds:
+        - hands (B x P x 52, bool): the cards in each player's hand
+        - played (B x 52, bool): the cards played so far
+        - last_action (B): the action to beat, -1 at the start of a round
+        - current_player (B): the seat whose turn it is
+        - deal_ids (B): the id of each game's deal (see `utils.dealing`)
+    Legal-action masks and state encodings are computed for the whole batch at once.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        player_count: int = 4,
+        seed: Optional[int] = None,
+        catalogue: Optional[ActionCatalogue] = None,
+    ) -> None:
+        """
+        Args:
+            batch_size (int): Number of games stepped together.
+            player_count (int, optional): Number of players in each game. Defaults to 4.
+            seed (Optional[int], optional): Seed of the deals. Defaults to None.
+            catalogue (Optional[ActionCatalogue], optional): The action catalogue.
+                Defaults to the shared catalogue.
+
+        Raises:
+            ValueError: If the deck cannot be dealt equally to the players, since every
+                card (including the 3 of diamonds) must be dealt for a game to start.
+        """
+        if CARD_COUNT % player_count:
+            raise ValueError(
+                f"{CARD_COUNT} cards cannot be dealt equally to {player_count} players"
+            )
+        self.batch_size = batch_size
+        self.player_count = player_count
+        self.rng = np.random.default_rng(seed)
+
+        self.catalogue = catalogue or get_catalogue()
+        self.pass_action = self.catalogue.pass_action
+        self.action_count = self.catalogue.action_count
+
+        self.reset()
+
+    def reset(self, indices: Optional[np.ndarray] = None) -> None:
+        """
+        Deals new games, either for the whole batch or only the given games.
+
+        Args:
+            indices (Optional[np.ndarray], optional): The games to reset. Defaults to
+                None (all games).
+        """
+        if indices is None:
+            indices = np.arange(self.batch_size)
+            self.hands = np.zeros(
+                (self.batch_size, self.player_count, CARD_COUNT), dtype=bool
+            )
+            self.played = np.zeros((self.batch_size, CARD_COUNT), dtype=bool)
+            self.last_action = np.full(self.batch_size, -1, dtype=np.int32)
+            self.last_player = np.full(self.batch_size, -1, dtype=np.int8)
+            self.current_player = np.zeros(self.batch_size, dtype=np.int8)
+            self.is_first_turn = np.ones(self.batch_size, dtype=bool)
+            self.done = np.zeros(self.batch_size, dtype=bool)
+            self.winner = np.full(self.batch_size, -1, dtype=np.int8)
+            self.deal_ids = np.zeros(self.batch_size, dtype=np.uint64)
+        indices = np.asarray(indices)
+        count = len(indices)
+
+        # random deal ids, dealt the same way as the simulator's games
+        deal_ids = self.rng.integers(0, 1 << 64, count, dtype=np.uint64)
+        seats = deal_seats(deal_ids, self.player_count)
+        self.deal_ids[indices] = deal_ids
+        self.hands[indices] = (
+            seats[:, None, :] == np.arange(self.player_count)[None, :, None]
+        )
+        self.played[indices] = False
+        self.last_action[indices] = -1
+        self.last_player[indices] = -1
+        # the player with the 3 of diamonds starts
+        self.current_player[indices] = seats[:, 0]
+        self.is_first_turn[indices] = True
+        self.done[indices] = False
+        self.winner[indices] = -1
+
+    def _current_hands(self) -> np.ndarray:
+        return self.hands[np.arange(self.batch_size), self.current_player]
+
+    def cards_left(self) -> np.ndarray:
+        """
+        Returns the number of cards in each player's hand (B x P).
+        """
+        return self.hands.sum(axis=2, dtype=np.int8)
+
+    def state_encoding(self) -> np.ndarray:
+        """
+        Encodes each game from the current player's point of view (B x 52): 0 if the
+        card's location is unknown, 1 if it is in the player's hand and 2 if it has been
+        played.
+        """
+        encoding = np.full((self.batch_size, CARD_COUNT), UNKNOWN, dtype=np.int8)
+        encoding[self._current_hands()] = IN_HAND
+        encoding[self.played] = PLAYED
+        return encoding
+
+    def legal_action_mask(self) -> np.ndarray:
+        """
+        Returns which actions the current player of each game may take (B x A).
+
+        A play is legal if all of its cards are in the player's hand and, when
+        responding, it has the same number of cards as the play to beat and a higher
+        strength. On the first turn of the game plays must contain the 3 of diamonds,
+        and passing is only allowed when responding. Finished games have no legal
+        actions.
+        """
+        legal = self.catalogue.legal_masks(
+            to_card_masks(self._current_hands()), self.last_action, self.is_first_turn
+        )
+        legal[self.done] = False
+        return legal
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies one action per game for its current player. Actions for games that are
+        already finished are ignored.
+
+        Args:
+            actions (np.ndarray): The action id for each game (B).
+
+        Raises:
+            ValueError: If an action is not legal for its game.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Whether each game is finished (B) and the
+                seat of each game's winner, -1 if it is still in progress (B).
+        """
+        actions = np.asarray(actions)
+        active = ~self.done
+        games = np.arange(self.batch_size)
+        legal = self.catalogue.is_legal(
+            actions,
+            to_card_masks(self._current_hands()),
+            self.last_action,
+            self.is_first_turn,
+        )
+        if not legal[active].all():
+            raise ValueError("Illegal action")
+
+        playing = active & (actions != self.pass_action)
+        rows = games[playing]
+        seats = self.current_player[playing]
+        cards = self.catalogue.cards[actions[playing]]
+        self.hands[rows, seats] &= ~cards
+        self.played[rows] |= cards
+        self.last_action[playing] = actions[playing]
+        self.last_player[playing] = seats
+        self.is_first_turn[active] = False
+
+        won = playing & ~self.hands[games, self.current_player].any(axis=1)
+        self.done |= won
+        self.winner[won] = self.current_player[won]
+
+        moving = active & ~won
+        self.current_player[moving] = (
+            self.current_player[moving] + 1
+        ) % self.player_count
+        # if all other players have passed, start a new round
+        new_round = moving & (self.current_player == self.last_player)
+        self.last_action[new_round] = -1
+        self.last_player[new_round] = -1
+
+        return self.done.copy(), self.winner.copy()
@@ -1,18 +1,91 @@
-from typing import List
+from typing import Dict, Iterable, Tuple
+
+from utils.bitmask import cards_to_mask, mask_to_cards
+from utils.comparison import HAND_TYPE_TIER, hand_key
 
 
 class CardSet:
-    def __init__(self, hand_type: str, cards: List[str]) -> None:
-        self.hand_type = hand_type
-        self.cards = cards
+    """
+    An immutable, hashable set of cards played together (or a pass).
+
+    CardSets are interned: creating a CardSet with the same hand type and cards as an
+    existing one returns the existing object, so identical plays share one object and
+    can be used as dict or set keys. The strength key, hand type tier and card mask
+    are computed once when a CardSet is first created.
+    """
+
+    __slots__ = ("hand_type", "cards", "key", "tier", "mask")
+
+    _interned: Dict[Tuple[str, Tuple[str, ...]], "CardSet"] = {}
+
+    hand_type: str
+    cards: Tuple[str, ...]
+    # integer strength key, see utils.comparison.hand_key
+    key: int
+    # index of the hand type in PLAYABLE_PRIORITY, -1 for pass and win
+    tier: int
+    mask: int
+
+    def __new__(cls, hand_type: str, cards: Iterable[str]) -> "CardSet":
+        cards = tuple(cards)
+        interned_key = (hand_type, cards)
+        card_set = cls._interned.get(interned_key)
+        if card_set is None:
+            card_set = object.__new__(cls)
+            object.__setattr__(card_set, "hand_type", hand_type)
+            object.__setattr__(card_set, "cards", cards)
+            object.__setattr__(card_set, "key", hand_key(hand_type, cards))
+            object.__setattr__(card_set, "tier", HAND_TYPE_TIER.get(hand_type, -1))
+            object.__setattr__(card_set, "mask", cards_to_mask(cards))
+            cls._interned[interned_key] = card_set
+        return card_set
+
+    @classmethod
+    def from_mask(cls, hand_type: str, mask: int) -> "CardSet":
+        """
+        Creates a CardSet from a card mask, ordering the cards the same way the play
+        generators in utils.game_logic do.
+
+        Args:
+            hand_type (str): The type of the hand (e.g. "pair").
+            mask (int): The card mask of the cards in the set.
+
+        Returns:
+            CardSet: The card set.
+        """
+        cards = mask_to_cards(mask)
+        if hand_type == "fullhouse":
+            # full houses are stored as the pair followed by the triplet
+            if cards[0][0] == cards[2][0]:
+                cards = cards[3:] + cards[:3]
+        elif hand_type == "fourofakind":
+            # four of a kinds are stored as the quartet followed by the extra card
+            if cards[0][0] != cards[1][0]:
+                cards = cards[1:] + cards[:1]
+        return cls(hand_type, cards)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("CardSet is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("CardSet is immutable")
+
+    def __reduce__(self):
+        # recreate (and re-intern) from the constructor arguments when unpickling
+        return (CardSet, (self.hand_type, self.cards))
 
     def __str__(self) -> str:
-        return f"{self.hand_type}: {self.cards}"
+        return f"{self.hand_type}: {list(self.cards)}"
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, CardSet):
             return False
         return self.hand_type == other.hand_type and self.cards == other.cards
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((self.hand_type, self.cards))
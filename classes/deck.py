@@ -1,11 +1,21 @@
 import random
-from typing import List
+from typing import List, Optional
 
-from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
+from utils.bitmask import CARD_STRINGS, cards_to_mask
+
+# the cards ordered by rank and suit, copied on every reset
+_ORDERED_CARDS = tuple(CARD_STRINGS)
 
 
 class Deck:
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        Args:
+            seed (Optional[int], optional): Seed for the deck's own random number
+                generator, so its shuffles are reproducible and independent of any other
+                deck. Defaults to None (unseeded).
+        """
+        self.rng = random.Random(seed)
         self.reset()
 
     def shuffle_and_deal(self, player_count: int) -> List[List[str]]:
@@ -20,7 +30,7 @@ class Deck:
         Returns:
             List[List[str]]: List of cards dealt to each player.
         """
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
         return [
             self.cards[
                 i * (len(self.cards) // player_count) : (i + 1)
@@ -29,8 +39,20 @@ class Deck:
             for i in range(player_count)
         ]
 
+    def shuffle_and_deal_masks(self, player_count: int) -> List[int]:
+        """
+        Deal cards equally to each player, returning each hand as a card mask.
+
+        Args:
+            player_count (int): Number of players to deal cards to.
+
+        Returns:
+            List[int]: The card mask of the cards dealt to each player.
+        """
+        return [cards_to_mask(hand) for hand in self.shuffle_and_deal(player_count)]
+
     def reset(self) -> None:
         """
         Resets the deck's cards to be ordered by rank and suit (with 2 being the highest).
         """
-        self.cards = [card + suit for card in RANK_PRIORITY for suit in SUIT_PRIORITY]
+        self.cards = list(_ORDERED_CARDS)
@@ -1,45 +1,111 @@
-from typing import Sequence
+from time import perf_counter
+from typing import List, Optional, Sequence
 
+from classes.agent import Observation
 from classes.card_set import CardSet
 from classes.deck import Deck
 from classes.player import Player
 from utils.comparison import sort_cards
+from utils.profiling import GameProfile
 
 
 class Game:
-    def __init__(self, player_list: Sequence[Player]) -> None:
+    def __init__(
+        self, player_list: Sequence[Player], profile: Optional[GameProfile] = None
+    ) -> None:
+        """
+        Args:
+            player_list (Sequence[Player]): The players, by seat.
+            profile (Optional[GameProfile], optional): Collects counters and timings of
+                the game and its players. Defaults to None (no profiling).
+        """
         self.deck = Deck()
+        self.profile = profile
+        if profile is not None:
+            for player in player_list:
+                player.profile = profile
         self.players = player_list
         self._player_count = len(player_list)
         self.history = []
         self.round_number = 0
+        # the sorted hand dealt to each player at the start of the game
+        self.dealt_hands = []
+        # card mask of every card played so far
+        self.played_mask = 0
+        # number of cards in each player's hand, by seat
+        self._cards_left = [len(player.hand) for player in player_list]
 
-    def start_new_game(self) -> None:
+    def start_new_game(
+        self, hands: Optional[Sequence[List[str]]] = None, hands_sorted: bool = False
+    ) -> None:
         """
         Starts a new game by resetting all attributes. The deck is suffled and cards are
         dealt equally to each player. The player with the 3 of diamonds in their hand
         is set as the current player.
+
+        Args:
+            hands (Optional[Sequence[List[str]]], optional): The hand to give each player
+                instead of dealing from the deck, e.g. to replay a recorded game.
+                Defaults to None.
+            hands_sorted (bool, optional): Whether the given hands are already sorted
+                (e.g. from `utils.dealing.deal_batch`), so sorting can be skipped.
+                Defaults to False.
         """
+        if self.profile is not None:
+            start = perf_counter()
+            self.profile.count("games")
         self.deck.reset()
         self.is_first_turn = True
+        self.played_mask = 0
         self.start_new_round()
-        player_hands = self.deck.shuffle_and_deal(self._player_count)
+        if hands is None:
+            player_hands = self.deck.shuffle_and_deal(self._player_count)
+        else:
+            player_hands = [list(hand) for hand in hands]
+        if hands is None or not hands_sorted:
+            for player_hand in player_hands:
+                sort_cards(player_hand)
         self.current_player_index = -1
+        self.dealt_hands = []
+        self._cards_left = [len(player_hand) for player_hand in player_hands]
         for idx, player_hand in enumerate(player_hands):
-            sort_cards(player_hand)
+            self.dealt_hands.append(tuple(player_hand))
             self.players[idx].hand = player_hand
             # 3d is always the first card in a sorted hand so time complexity is actually O(1)
             if "3d" in player_hand:
                 self.current_player_index = idx
+        if self.profile is not None:
+            self.profile.add_time("deal", start)
 
     def get_current_player(self) -> Player:
         return self.players[self.current_player_index]
 
+    def observe(self) -> Observation:
+        """
+        Returns what the current player can see, with their play options (see
+        `Player.get_play_options`) as the legal actions.
+
+        Returns:
+            Observation: The current player's observation.
+        """
+        player = self.players[self.current_player_index]
+        return Observation(
+            self.current_player_index,
+            player.hand,
+            self.last_played_set,
+            tuple(self._cards_left),
+            self.played_mask,
+            player.get_play_options(self.last_played_set, self.is_first_turn),
+            self.is_first_turn,
+        )
+
     def start_new_round(self) -> None:
         self.last_played_set = None
         self.last_played_player = None
         self.last_played_set_player = None
         self.round_number += 1
+        if self.profile is not None:
+            self.profile.count("rounds")
 
     # return true if a new round was started
     def next_player(self, played_set: CardSet = CardSet("pass", [])) -> bool:
@@ -54,6 +120,8 @@ class Game:
         """
         self.history.append((self.round_number, self.current_player_index, played_set))
         self.is_first_turn = False
+        self.played_mask |= played_set.mask
+        self._cards_left[self.current_player_index] -= len(played_set.cards)
         if played_set.hand_type != "pass":
             self.last_played_set = played_set
             self.last_played_set_player = self.current_player_index
@@ -68,6 +136,8 @@ class Game:
 
     def did_player_win(self, played_set: CardSet) -> bool:
         if len(self.get_current_player().hand) == 0:
+            self.played_mask |= played_set.mask
+            self._cards_left[self.current_player_index] = 0
             self.history.append(
                 (self.round_number, self.current_player_index, played_set)
             )
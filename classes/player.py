@@ -1,17 +1,63 @@
 import random
-from abc import ABC, abstractmethod
-from time import sleep
-from typing import List, Optional
+from abc import abstractmethod
+from time import perf_counter
+from typing import List, Optional, Sequence
 
+from classes.agent import Agent, Observation
 from classes.card_set import CardSet
-from utils.game_logic import get_valid_plays
+from utils.bitmask import cards_to_mask
+from utils.game_logic import get_valid_plays, get_valid_plays_cached
+from utils.play_index import PlayIndex
+from utils.profiling import GameProfile
 
 
-class Player(ABC):
-    def __init__(self) -> None:
+class Player(Agent):
+    def __init__(
+        self,
+        use_play_index: bool = False,
+        seed: Optional[int] = None,
+        use_play_cache: bool = False,
+    ) -> None:
+        """
+        Args:
+            use_play_index (bool, optional): Whether to build a PlayIndex of every
+                combination when a hand is dealt and answer play options from it, rather
+                than regenerating them each turn. Defaults to False.
+            seed (Optional[int], optional): Seed for the player's own random number
+                generator, used by players that make random choices. Defaults to None
+                (unseeded).
+            use_play_cache (bool, optional): Whether to look play options up in the
+                shared `PLAY_CACHE`, so situations seen before by any player are not
+                regenerated. Ignored when the play index is in use. Defaults to False.
+        """
+        self.use_play_index = use_play_index
+        self.use_play_cache = use_play_cache
+        self.rng = random.Random(seed)
+        # set by Game when the game is profiled
+        self.profile: Optional[GameProfile] = None
         self.hand = []
         self.play_options = None
 
+    @property
+    def hand(self) -> List[str]:
+        """
+        The cards in the player's hand. Setting the hand (i.e. when cards are dealt)
+        rebuilds the play index if it is in use.
+        """
+        return self._hand
+
+    @hand.setter
+    def hand(self, hand: List[str]) -> None:
+        self._hand = hand
+        self._play_index = PlayIndex(hand) if self.use_play_index else None
+
+    @property
+    def hand_mask(self) -> int:
+        """
+        The card mask of the player's hand.
+        """
+        return cards_to_mask(self.hand)
+
     def _play_cards(self, cards: CardSet) -> None:
         """
         Removes the played cards from the player's hand and clears the play options cache.
@@ -22,7 +68,10 @@ class Player(ABC):
         Args:
             cards (CardSet): The card set that was played.
         """
-        self.hand = [card for card in self.hand if card not in cards.cards]
+        self._hand = [card for card in self._hand if card not in cards.cards]
+        if self._play_index is not None:
+            # only the combinations containing the played cards are affected
+            self._play_index.remove_cards(cards.cards)
         # clear play options cache
         self.play_options = None
 
@@ -57,20 +106,68 @@ class Player(ABC):
         """
         if self.play_options is not None:
             # return play options cache
+            if self.profile is not None:
+                self.profile.count("play_options_cache_hits")
             return self.play_options
 
-        valid_plays = get_valid_plays(self.hand, previous_play, is_starting_hand)
+        if self.profile is not None:
+            valid_plays = self._get_profiled_play_options(
+                previous_play, is_starting_hand
+            )
+        elif self._play_index is not None:
+            valid_plays = self._play_index.get_plays(previous_play, is_starting_hand)
+        elif self.use_play_cache:
+            valid_plays = get_valid_plays_cached(
+                self.hand, previous_play, is_starting_hand
+            )
+        else:
+            valid_plays = get_valid_plays(self.hand, previous_play, is_starting_hand)
         self.play_options = valid_plays
         return valid_plays
 
-    @abstractmethod
+    def _get_profiled_play_options(
+        self, previous_play: Optional[CardSet], is_starting_hand: bool
+    ) -> List[CardSet]:
+        # get_play_options with the move generation counted and timed
+        profile = self.profile
+        start = perf_counter()
+        if self._play_index is not None:
+            valid_plays = self._play_index.get_plays(previous_play, is_starting_hand)
+            profile.add_time("move_generation.play_index", start)
+        elif self.use_play_cache:
+            valid_plays = get_valid_plays_cached(
+                self.hand, previous_play, is_starting_hand
+            )
+            profile.add_time("move_generation.play_cache", start)
+        else:
+            valid_plays = get_valid_plays(
+                self.hand, previous_play, is_starting_hand, profile
+            )
+            profile.add_time("move_generation.get_valid_plays", start)
+        profile.count("play_options_generated", len(valid_plays))
+        return valid_plays
+
     def get_play_choice(self) -> int:
         """
-        An abstract method that should be implemented by any class that inherits from the Player class.
-        It takes no parameters and returns an integer that represents the index of the card set that
-        the player wants to play. The player can pass their turn by returning -1.
+        Chooses a play from the cached play options (see `get_play_options`), for
+        callers that drive players without a game observation. The decision is made
+        by `decide` with an observation holding only the player's hand and play
+        options.
+
+        Returns:
+            int: The index of the chosen play option, -1 to pass.
         """
-        pass
+        return self.decide(
+            Observation(
+                seat=-1,
+                hand=self.hand,
+                last_play=None,
+                cards_left=(),
+                played_mask=0,
+                legal_actions=self.play_options or [],
+                is_first_turn=False,
+            )
+        )
 
     @abstractmethod
     def player_type(self) -> str:
@@ -82,7 +179,7 @@ class Player(ABC):
 
 
 class HumanPlayer(Player):
-    def get_play_choice(self) -> int:
+    def decide(self, observation: Observation) -> int:
         """
         Get the user's choice of play from the available options.
 
@@ -93,6 +190,9 @@ class HumanPlayer(Player):
 
         This function also allows the user to quit the game by entering "q".
 
+        Args:
+            observation (Observation): What the player can see, including their play options.
+
         Returns:
             int: The index of the selected play option. Returns -1 if the user chooses
                 to pass their turn.
@@ -104,8 +204,8 @@ class HumanPlayer(Player):
             if (
                 selected.isnumeric()
                 and int(selected) > 0
-                and self.play_options
-                and int(selected) <= len(self.play_options)
+                and observation.legal_actions
+                and int(selected) <= len(observation.legal_actions)
             ):
                 return int(selected) - 1
             else:
@@ -116,15 +216,15 @@ class HumanPlayer(Player):
 
 
 class RandomAIPlayer(Player):
-    def get_play_choice(self) -> int:
+    def decide(self, observation: Observation) -> int:
         """
         Returns a random choice from the available options. Will only pass if that is the only option available.
         """
-        sleep(1)
-        if self.play_options:
-            if len(self.play_options) == 1:
+        legal_actions = observation.legal_actions
+        if legal_actions:
+            if len(legal_actions) == 1:
                 return 0
-            return random.randint(0, len(self.play_options) - 2)
+            return self.rng.randint(0, len(legal_actions) - 2)
 
         return -1
 
@@ -133,13 +233,40 @@ class RandomAIPlayer(Player):
 
 
 class LowestAIPlayer(Player):
-    def get_play_choice(self) -> int:
+    def decide(self, observation: Observation) -> int:
         """
         Always returns the lowest card set from the available options. Will only pass if that is the only option available.
         """
-        if self.play_options:
+        if observation.legal_actions:
             return 0
         return -1
 
+    def decide_batch(self, observations: Sequence[Observation]) -> List[int]:
+        return [0 if observation.legal_actions else -1 for observation in observations]
+
     def player_type(self) -> str:
         return "AI (plays lowest)"
+
+
+class AgentPlayer(Player):
+    """
+    A seat whose decisions are made by an agent, e.g. a policy shared by the same seat
+    of many tables. The player keeps the seat's hand and play options.
+    """
+
+    def __init__(self, agent: Agent, **kwargs) -> None:
+        """
+        Args:
+            agent (Agent): The agent making the decisions.
+            **kwargs: Passed on to `Player`.
+        """
+        super().__init__(**kwargs)
+        self.agent = agent
+
+    def decide(self, observation: Observation) -> int:
+        return self.agent.decide(observation)
+
+    def player_type(self) -> str:
+        if isinstance(self.agent, Player):
+            return self.agent.player_type()
+        return "Agent ({})".format(type(self.agent).__name__)
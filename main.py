@@ -1,3 +1,5 @@
+from time import sleep
+
 from classes.game import Game
 from classes.player import HumanPlayer, LowestAIPlayer, RandomAIPlayer
 
@@ -15,17 +17,18 @@ def main() -> None:
 
     # play game until someone wins or player quits
     while True:
-        play_options = game.get_current_player().get_play_options(
-            game.last_played_set, game.is_first_turn
-        )
+        observation = game.observe()
         if isinstance(game.get_current_player(), HumanPlayer):
             print("Current player's hand: {}".format(game.get_current_player().hand))
             print("Play options:")
-            for idx, play_option in enumerate(play_options):
+            for idx, play_option in enumerate(observation.legal_actions):
                 print("{}) {}".format(idx + 1, play_option))
             print("q) Quit game")
+        elif isinstance(game.get_current_player(), RandomAIPlayer):
+            # give the human player time to follow the AI player's moves
+            sleep(1)
 
-        index_to_play = game.get_current_player().get_play_choice()
+        index_to_play = game.get_current_player().decide(observation)
         if index_to_play == -1:
             return
         played_set = game.get_current_player().play_card_set_by_index(index_to_play)
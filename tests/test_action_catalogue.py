@@ -0,0 +1,112 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from classes.card_set import CardSet
+from classes.deck import Deck
+from utils.action_catalogue import ActionCatalogue, build_catalogue, get_catalogue
+from utils.bitmask import cards_to_mask
+from utils.comparison import sort_cards
+from utils.game_logic import get_valid_plays
+
+
+class TestActionCatalogue(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.catalogue = get_catalogue(None)
+
+    def test_contents(self):
+        catalogue = self.catalogue
+        # singles, pairs, triplets, straights, flushes, full houses, four of a kinds
+        # and straight flushes, plus pass
+        self.assertEqual(
+            len(catalogue), 52 + 78 + 52 + 9180 + 5112 + 3744 + 624 + 36 + 1
+        )
+        self.assertTrue((np.diff(catalogue.order_keys) >= 0).all())
+        self.assertEqual(catalogue.five_card_start, 52 + 78 + 52)
+
+    def test_action_id_round_trip(self):
+        catalogue = self.catalogue
+        for action_id in [0, 51, 52, 200, catalogue.pass_action - 1]:
+            self.assertEqual(catalogue.action_id(catalogue.play(action_id)), action_id)
+        self.assertEqual(
+            catalogue.action_id(CardSet("pass", [])), catalogue.pass_action
+        )
+        self.assertEqual(catalogue.play(catalogue.pass_action), CardSet("pass", []))
+        self.assertEqual(catalogue.play(0), CardSet("single", ["3d"]))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalogue.npz")
+            self.catalogue.save(path)
+            loaded = ActionCatalogue.load(path)
+        self.assertEqual(loaded.plays, self.catalogue.plays)
+        self.assertTrue((loaded.masks == self.catalogue.masks).all())
+
+    def test_get_catalogue_persists(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalogue.npz")
+            catalogue = get_catalogue(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertIs(get_catalogue(path), catalogue)
+        self.assertEqual(catalogue.plays, build_catalogue().plays)
+
+    def test_legal_mask_matches_get_valid_plays(self):
+        catalogue = self.catalogue
+        rng = random.Random(0)
+        deck = Deck()
+        for _ in range(20):
+            hand = rng.sample(deck.cards, 13)
+            sort_cards(hand)
+            previous_plays = [None] + rng.sample(
+                get_valid_plays(rng.sample(deck.cards, 13)), 5
+            )
+            for previous_play in previous_plays:
+                for is_starting_hand in [False, True]:
+                    if is_starting_hand and previous_play is not None:
+                        continue
+                    expected = sorted(
+                        catalogue.action_id(play)
+                        for play in get_valid_plays(
+                            hand, previous_play, is_starting_hand
+                        )
+                    )
+                    legal = catalogue.legal_mask(hand, previous_play, is_starting_hand)
+                    self.assertEqual(list(np.flatnonzero(legal)), expected)
+
+    def test_legal_masks_matches_legal_mask(self):
+        catalogue = self.catalogue
+        rng = random.Random(1)
+        deck = Deck()
+        hands, previous_plays, first_turns = [], [], []
+        for _ in range(10):
+            hands.append(rng.sample(deck.cards, 13))
+            previous_plays.append(
+                rng.choice([None] + get_valid_plays(rng.sample(deck.cards, 13)))
+            )
+            first_turns.append(previous_plays[-1] is None and rng.random() < 0.5)
+
+        legal = catalogue.legal_masks(
+            np.array([cards_to_mask(hand) for hand in hands], dtype=np.uint64),
+            np.array(
+                [
+                    -1 if play is None else catalogue.action_id(play)
+                    for play in previous_plays
+                ]
+            ),
+            np.array(first_turns),
+        )
+        for row, hand in enumerate(hands):
+            self.assertTrue(
+                (
+                    legal[row]
+                    == catalogue.legal_mask(hand, previous_plays[row], first_turns[row])
+                ).all()
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from classes.agent import Agent, Observation
+from classes.card_set import CardSet
+
+
+class FirstAgent(Agent):
+    def decide(self, observation: Observation) -> int:
+        return 0
+
+
+class TestAgent(unittest.TestCase):
+    def test_decide_batch(self):
+        observation = Observation(
+            0, ("3d",), None, (1, 1), 0, [CardSet("single", ["3d"])], True
+        )
+        self.assertEqual(FirstAgent().decide_batch([observation] * 3), [0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from classes.agent import Observation
+from classes.batch_env import IN_HAND, PLAYED, UNKNOWN
+from classes.game import Game
+from classes.player import LowestAIPlayer
+from utils.action_catalogue import get_catalogue
+from utils.agent_encoding import choices_from_actions, encode_observations
+from utils.bitmask import CARD_INDICES
+from utils.simulation import play_game
+
+
+class TestAgentEncoding(unittest.TestCase):
+    def setUp(self) -> None:
+        # built in memory, so the tests do not write a catalogue file
+        self.catalogue = get_catalogue(None)
+        # observations of every decision of a game
+        self.observations = []
+        game = Game([LowestAIPlayer() for _ in range(4)])
+        observe = game.observe
+
+        def recording_observe() -> Observation:
+            observation = observe()
+            self.observations.append(observation)
+            return observation
+
+        game.observe = recording_observe
+        play_game(game)
+
+    def test_encode_observations(self):
+        batch = encode_observations(self.observations, self.catalogue)
+        self.assertEqual(batch.state.shape, (len(self.observations), 52))
+        self.assertEqual(batch.cards_left.shape, (len(self.observations), 4))
+        for row, observation in enumerate(self.observations):
+            for card in observation.hand:
+                self.assertEqual(batch.state[row, CARD_INDICES[card]], IN_HAND)
+            played = np.array(
+                [observation.played_mask >> index & 1 for index in range(52)],
+                dtype=bool,
+            )
+            self.assertTrue((batch.state[row, played] == PLAYED).all())
+            self.assertEqual(
+                (batch.state[row] == UNKNOWN).sum(),
+                52 - len(observation.hand) - played.sum(),
+            )
+            # starting from the deciding player's own hand
+            self.assertEqual(batch.cards_left[row, 0], len(observation.hand))
+            self.assertEqual(
+                sorted(np.flatnonzero(batch.legal[row])),
+                sorted(
+                    self.catalogue.action_id(play) for play in observation.legal_actions
+                ),
+            )
+
+    def test_choices_from_actions(self):
+        observations = self.observations[:5]
+        action_ids = [
+            self.catalogue.action_id(observation.legal_actions[-1])
+            for observation in observations
+        ]
+        self.assertEqual(
+            choices_from_actions(observations, action_ids, self.catalogue),
+            [len(observation.legal_actions) - 1 for observation in observations],
+        )
+        with self.assertRaises(ValueError):
+            choices_from_actions(
+                observations[:1], [self.catalogue.pass_action], self.catalogue
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
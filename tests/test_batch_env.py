@@ -0,0 +1,116 @@
+import random
+import unittest
+
+import numpy as np
+
+from classes.batch_env import IN_HAND, PLAYED, UNKNOWN, BatchGameEnv
+from classes.game import Game
+from classes.player import LowestAIPlayer
+from utils.action_catalogue import get_catalogue
+from utils.bitmask import CARD_STRINGS
+from utils.dealing import deal_batch
+
+
+class TestBatchGameEnv(unittest.TestCase):
+    BATCH_SIZE = 6
+
+    def setUp(self) -> None:
+        # built in memory, so the tests do not write a catalogue file
+        self.env = BatchGameEnv(self.BATCH_SIZE, seed=1, catalogue=get_catalogue(None))
+        self.action_ids = {
+            (action.hand_type, tuple(action.cards)): action_id
+            for action_id, action in enumerate(self.env.catalogue.plays)
+        }
+        self.action_ids[("pass", ())] = self.env.pass_action
+
+    def test_reset_deals_whole_deck(self):
+        self.assertTrue((self.env.hands.sum(axis=1) == 1).all())
+        self.assertTrue((self.env.cards_left() == 13).all())
+        # the player holding the 3 of diamonds starts
+        games = np.arange(self.BATCH_SIZE)
+        self.assertTrue(self.env.hands[games, self.env.current_player, 0].all())
+
+    def test_reset_uses_deal_ids(self):
+        deals = deal_batch(self.env.deal_ids)
+        for game in range(self.BATCH_SIZE):
+            for seat in range(4):
+                np.testing.assert_array_equal(
+                    np.flatnonzero(self.env.hands[game, seat]), deals[game, seat]
+                )
+
+    def test_state_encoding(self):
+        encoding = self.env.state_encoding()
+        self.assertTrue((encoding[:, 0] == IN_HAND).all())
+        self.assertTrue(((encoding == IN_HAND).sum(axis=1) == 13).all())
+        self.assertTrue(((encoding == UNKNOWN).sum(axis=1) == 39).all())
+
+        actions = self.env.legal_action_mask().argmax(axis=1)
+        self.env.step(actions)
+        encoding = self.env.state_encoding()
+        self.assertTrue((encoding[:, 0] == PLAYED).all())
+
+    def test_illegal_action(self):
+        with self.assertRaises(ValueError):
+            # passing is not allowed on the first turn
+            self.env.step(np.full(self.BATCH_SIZE, self.env.pass_action))
+
+    def test_player_count_must_divide_deck(self):
+        # the 3 of diamonds could be left undealt, leaving no seat to start
+        for player_count in (3, 5):
+            with self.subTest(player_count):
+                with self.assertRaises(ValueError):
+                    BatchGameEnv(2, player_count, catalogue=get_catalogue(None))
+        env = BatchGameEnv(2, 2, seed=0, catalogue=get_catalogue(None))
+        self.assertTrue(env.hands[np.arange(2), env.current_player, 0].all())
+
+    def test_matches_game_rules(self):
+        rng = random.Random(0)
+        games = []
+        for game_index in range(self.BATCH_SIZE):
+            game = Game([LowestAIPlayer() for _ in range(4)])
+            game.start_new_game()
+            for seat, player in enumerate(game.players):
+                player.hand = [
+                    CARD_STRINGS[card]
+                    for card in np.flatnonzero(self.env.hands[game_index, seat])
+                ]
+            game.current_player_index = int(self.env.current_player[game_index])
+            games.append(game)
+
+        while not self.env.done.all():
+            legal = self.env.legal_action_mask()
+            actions = np.full(self.BATCH_SIZE, self.env.pass_action)
+            for game_index, game in enumerate(games):
+                if self.env.done[game_index]:
+                    self.assertFalse(legal[game_index].any())
+                    continue
+                player = game.get_current_player()
+                options = player.get_play_options(
+                    game.last_played_set, game.is_first_turn
+                )
+                option_ids = sorted(
+                    self.action_ids[(option.hand_type, tuple(option.cards))]
+                    for option in options
+                )
+                self.assertEqual(option_ids, list(np.flatnonzero(legal[game_index])))
+
+                index = rng.randrange(len(options))
+                actions[game_index] = self.action_ids[
+                    (options[index].hand_type, tuple(options[index].cards))
+                ]
+                played_set = player.play_card_set_by_index(index)
+                if not game.did_player_win(played_set):
+                    game.next_player(played_set)
+
+            done, winner = self.env.step(actions)
+            for game_index, game in enumerate(games):
+                self.assertEqual(
+                    int(self.env.current_player[game_index]), game.current_player_index
+                )
+                if done[game_index]:
+                    self.assertEqual(winner[game_index], game.current_player_index)
+                    self.assertEqual(len(game.get_current_player().hand), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from benchmarks.cases import get_benchmarks
+from benchmarks.corpus import build_corpus
+from benchmarks.runner import (
+    Benchmark,
+    BenchmarkResult,
+    compare,
+    format_results,
+    load_rates,
+    run_benchmark,
+    save_results,
+)
+from utils.game_logic import get_valid_plays
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_corpus_is_reproducible(self):
+        corpus = build_corpus(8, seed=1)
+        self.assertEqual(corpus, build_corpus(8, seed=1))
+        self.assertEqual(len(corpus.hands), 8)
+        self.assertEqual(len(corpus.opening_hands), 8)
+        self.assertTrue(all(hand[0] == "3d" for hand in corpus.opening_hands))
+        for play1, play2 in corpus.play_pairs:
+            self.assertEqual(len(play1.cards), len(play2.cards))
+
+    def test_corpus_ignores_generation_order(self):
+        corpus = build_corpus(8, seed=1)
+        with patch(
+            "benchmarks.corpus.get_valid_plays",
+            lambda hand: get_valid_plays(hand)[::-1],
+        ):
+            self.assertEqual(build_corpus(8, seed=1), corpus)
+
+    def test_run_all_benchmarks(self):
+        benchmarks = get_benchmarks(build_corpus(4), n_games=1)
+        names = [benchmark.name for benchmark in benchmarks]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn("get_valid_plays_free", names)
+        self.assertIn("simulate_random", names)
+        for benchmark in benchmarks:
+            result = run_benchmark(benchmark, repeat=1)
+            self.assertGreater(result.rate, 0)
+
+    def test_run_benchmark_counts_plays(self):
+        result = run_benchmark(Benchmark("test", "calls", 10, lambda: 25), repeat=2)
+        self.assertEqual((result.count, result.plays), (10, 25))
+        self.assertAlmostEqual(result.plays_rate, 2.5 * result.rate)
+
+    def test_compare_with_baseline(self):
+        results = [
+            BenchmarkResult("fast", "calls", 100, 1.0, 0),
+            BenchmarkResult("new", "calls", 100, 1.0, 0),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_results([BenchmarkResult("fast", "calls", 100, 2.0, 0)], path)
+            comparisons = compare(results, load_rates(path))
+        self.assertEqual(len(comparisons), 1)
+        self.assertAlmostEqual(comparisons[0].change, 1.0)
+        self.assertIn("+100.0%", format_results(results, comparisons))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from utils.bitmask import (
+    CARD_COUNT,
+    FULL_DECK_MASK,
+    RANK_MASKS,
+    SUIT_MASKS,
+    card_count,
+    card_to_index,
+    cards_to_mask,
+    index_to_card,
+    mask_to_cards,
+    rank_cards,
+    rank_of,
+    suit_of,
+)
+from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
+
+
+class TestBitmask(unittest.TestCase):
+    def test_card_index_round_trip(self):
+        self.assertEqual(card_to_index("3d"), 0)
+        self.assertEqual(card_to_index("3s"), 3)
+        self.assertEqual(card_to_index("4d"), 4)
+        self.assertEqual(card_to_index("2s"), CARD_COUNT - 1)
+        for rank in RANK_PRIORITY:
+            for suit in SUIT_PRIORITY:
+                card = rank + suit
+                self.assertEqual(index_to_card(card_to_index(card)), card)
+
+    def test_rank_and_suit_of(self):
+        index = card_to_index("th")
+        self.assertEqual(RANK_PRIORITY[rank_of(index)], "t")
+        self.assertEqual(SUIT_PRIORITY[suit_of(index)], "h")
+
+    def test_mask_round_trip_is_sorted(self):
+        cards = ["2s", "3d", "kc", "3h"]
+        mask = cards_to_mask(cards)
+        self.assertEqual(card_count(mask), 4)
+        self.assertEqual(mask_to_cards(mask), ["3d", "3h", "kc", "2s"])
+        self.assertEqual(mask_to_cards(0), [])
+
+    def test_masks(self):
+        self.assertEqual(mask_to_cards(RANK_MASKS[0]), ["3d", "3c", "3h", "3s"])
+        self.assertEqual(card_count(SUIT_MASKS[0]), len(RANK_PRIORITY))
+        self.assertEqual(sum(RANK_MASKS), FULL_DECK_MASK)
+        self.assertEqual(sum(SUIT_MASKS), FULL_DECK_MASK)
+
+    def test_rank_cards(self):
+        mask = cards_to_mask(["4d", "4h", "5s"])
+        self.assertEqual(rank_cards(mask, 0), 0)
+        self.assertEqual(rank_cards(mask, 1), 0b0101)
+        self.assertEqual(rank_cards(mask, 2), 0b1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import pickle
 import unittest
 
 from classes.card_set import CardSet
+from utils.bitmask import cards_to_mask
 
 
 class TestCardSet(unittest.TestCase):
@@ -17,6 +19,67 @@ class TestCardSet(unittest.TestCase):
         card_set2 = CardSet(hand_type, cards)
         self.assertEqual(card_set1, card_set2)
 
+    def test_immutable(self):
+        card_set = CardSet("pair", ["3d", "3s"])
+        with self.assertRaises(AttributeError):
+            card_set.cards = ("4d", "4s")
+        with self.assertRaises(AttributeError):
+            card_set.hand_type = "single"
+        self.assertEqual(card_set.cards, ("3d", "3s"))
+
+    def test_interning(self):
+        card_set1 = CardSet("pair", ["3d", "3s"])
+        card_set2 = CardSet("pair", ("3d", "3s"))
+        self.assertIs(card_set1, card_set2)
+        self.assertIsNot(card_set1, CardSet("pair", ["3d", "3h"]))
+        self.assertIs(CardSet("pass", []), CardSet("pass", []))
+
+    def test_hashable(self):
+        plays = {CardSet("single", ["3d"]): 1, CardSet("pair", ["3d", "3s"]): 2}
+        self.assertEqual(plays[CardSet("pair", ["3d", "3s"])], 2)
+        self.assertEqual(len({CardSet("single", ["3d"]), CardSet("single", ["3d"])}), 1)
+
+    def test_pickle(self):
+        card_set = CardSet("fullhouse", ["3d", "3c", "6d", "6h", "6s"])
+        self.assertIs(pickle.loads(pickle.dumps(card_set)), card_set)
+
+    def test_tier(self):
+        self.assertEqual(CardSet("single", ["3d"]).tier, 0)
+        self.assertEqual(
+            CardSet("straightflush", ["3d", "4d", "5d", "6d", "7d"]).tier, 7
+        )
+        self.assertEqual(CardSet("pass", []).tier, -1)
+
+    def test_mask(self):
+        card_set = CardSet("pair", ["3d", "3s"])
+        self.assertEqual(card_set.mask, 0b1001)
+
+    def test_key(self):
+        self.assertLess(
+            CardSet("pair", ["7c", "7h"]).key, CardSet("pair", ["7d", "7s"]).key
+        )
+        self.assertLess(
+            CardSet("straight", ["td", "jc", "qs", "ks", "2s"]).key,
+            CardSet("flush", ["3d", "4d", "5d", "6d", "8d"]).key,
+        )
+
+    def test_from_mask(self):
+        cards = ["3d", "3c", "6d", "6h", "6s"]
+        card_set = CardSet.from_mask("fullhouse", cards_to_mask(cards))
+        self.assertEqual(card_set, CardSet("fullhouse", cards))
+
+        cards = ["6d", "6h", "3d", "3c", "3s"]
+        card_set = CardSet.from_mask("fullhouse", cards_to_mask(cards))
+        self.assertEqual(card_set, CardSet("fullhouse", cards))
+
+        cards = ["6d", "6c", "6h", "6s", "3d"]
+        card_set = CardSet.from_mask("fourofakind", cards_to_mask(cards))
+        self.assertEqual(card_set, CardSet("fourofakind", cards))
+
+        cards = ["3d", "4c", "5s", "6h", "7d"]
+        card_set = CardSet.from_mask("straight", cards_to_mask(cards))
+        self.assertEqual(card_set, CardSet("straight", cards))
+
 
 if __name__ == "__main__":
     unittest.main()
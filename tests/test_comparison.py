@@ -0,0 +1,78 @@
+import unittest
+
+from classes.card_set import CardSet
+from utils.comparison import (
+    NO_PLAY_KEY,
+    card_cmp,
+    play_cmp,
+    play_key,
+    sort_cards,
+)
+
+
+class TestComparison(unittest.TestCase):
+    def test_card_cmp(self):
+        self.assertEqual(card_cmp("3d", "3d"), 0)
+        # rank is compared before suit
+        self.assertEqual(card_cmp("4d", "3s"), 1)
+        self.assertEqual(card_cmp("3s", "4d"), -1)
+        self.assertEqual(card_cmp("2d", "as"), 1)
+        # suits are ordered diamonds, clubs, hearts, spades
+        self.assertEqual(card_cmp("7c", "7d"), 1)
+        self.assertEqual(card_cmp("7h", "7s"), -1)
+
+    def test_play_cmp(self):
+        # pairs compare their higher card
+        self.assertEqual(
+            play_cmp(CardSet("pair", ["7d", "7s"]), CardSet("pair", ["7c", "7h"])), 1
+        )
+        # hand type is compared before cards
+        self.assertEqual(
+            play_cmp(
+                CardSet("flush", ["3d", "4d", "5d", "6d", "8d"]),
+                CardSet("straight", ["td", "jc", "qs", "ks", "2s"]),
+            ),
+            1,
+        )
+        # four of a kinds compare the quartet rather than the extra card
+        self.assertEqual(
+            play_cmp(
+                CardSet("fourofakind", ["4d", "4c", "4h", "4s", "3d"]),
+                CardSet("fourofakind", ["3d", "3c", "3h", "3s", "2s"]),
+            ),
+            1,
+        )
+        self.assertEqual(
+            play_cmp(CardSet("single", ["9h"]), CardSet("single", ["9h"])), 0
+        )
+
+    def test_play_key_matches_play_cmp(self):
+        plays = [
+            CardSet("straight", ["3d", "4c", "5s", "6h", "7d"]),
+            CardSet("straight", ["3d", "4c", "5s", "6h", "7s"]),
+            CardSet("flush", ["3h", "4h", "5h", "6h", "8h"]),
+            CardSet("fullhouse", ["2d", "2c", "4d", "4c", "4s"]),
+            CardSet("fourofakind", ["3d", "3c", "3h", "3s", "2s"]),
+            CardSet("straightflush", ["3d", "4d", "5d", "6d", "7d"]),
+        ]
+        for play1 in plays:
+            for play2 in plays:
+                key_cmp = (play_key(play1) > play_key(play2)) - (
+                    play_key(play1) < play_key(play2)
+                )
+                self.assertEqual(key_cmp, play_cmp(play1, play2))
+
+    def test_play_key_pass(self):
+        self.assertEqual(play_key(CardSet("pass", [])), NO_PLAY_KEY)
+        self.assertLess(
+            play_key(CardSet("pass", [])), play_key(CardSet("single", ["3d"]))
+        )
+
+    def test_sort_cards(self):
+        cards = ["2s", "3h", "kd", "3d", "tc"]
+        sort_cards(cards)
+        self.assertEqual(cards, ["3d", "3h", "tc", "kd", "2s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from utils.bitmask import CARD_STRINGS
+from utils.dealing import (
+    deal_batch,
+    deal_hands,
+    deal_seats,
+    derive_seeds,
+    hands_to_cards,
+    iter_deals,
+)
+from utils.simulation import derive_seed
+
+
+class TestDealing(unittest.TestCase):
+    DEAL_IDS = np.array([0, 1, 12345, (1 << 64) - 1], dtype=np.uint64)
+
+    def test_derive_seeds_matches_derive_seed(self):
+        derived = derive_seeds(self.DEAL_IDS[:, None], np.arange(3)[None, :])
+        for row, seed in enumerate(self.DEAL_IDS):
+            for index in range(3):
+                self.assertEqual(
+                    int(derived[row, index]), derive_seed(int(seed), index)
+                )
+
+    def test_deal_batch(self):
+        deals = deal_batch(self.DEAL_IDS)
+        self.assertEqual(deals.shape, (4, 4, 13))
+        for deal in deals:
+            # every card dealt exactly once, each hand sorted
+            np.testing.assert_array_equal(np.sort(deal.ravel()), np.arange(52))
+            self.assertTrue((np.diff(deal, axis=1) > 0).all())
+        np.testing.assert_array_equal(deals, deal_batch(self.DEAL_IDS))
+        self.assertFalse((deals[0] == deals[1]).all())
+
+    def test_deal_uneven(self):
+        seats = deal_seats(self.DEAL_IDS, 3)
+        # 17 cards each, one card left over
+        self.assertTrue((np.sum(seats == 3, axis=1) == 1).all())
+        self.assertEqual(deal_batch(self.DEAL_IDS, 3).shape, (4, 3, 17))
+
+    def test_deal_hands(self):
+        deal_id = (1 << 64) - 1
+        hands = deal_hands(deal_id, 4)
+        self.assertEqual(hands, hands_to_cards(deal_batch(self.DEAL_IDS, 4)[3]))
+        self.assertEqual(
+            sorted(card for hand in hands for card in hand), sorted(CARD_STRINGS)
+        )
+        self.assertTrue(all(isinstance(card, str) for card in hands[0]))
+
+    def test_iter_deals(self):
+        deal_ids = [int(deal_id) for deal_id in self.DEAL_IDS]
+        self.assertEqual(
+            list(iter_deals(deal_ids, 4, chunk_size=3)),
+            [deal_hands(deal_id, 4) for deal_id in deal_ids],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
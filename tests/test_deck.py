@@ -1,6 +1,7 @@
 import unittest
 
 from classes.deck import Deck
+from utils.bitmask import FULL_DECK_MASK
 from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
 
 
@@ -30,6 +31,19 @@ class TestDeck(unittest.TestCase):
         self.assertEqual(len(player_decks), player_count)
         self.assertTrue(all(len(player_deck) == 1 for player_deck in player_decks))
 
+    def test_deal_masks(self):
+        deck = Deck()
+        player_count = 4
+        player_masks = deck.shuffle_and_deal_masks(player_count)
+        self.assertEqual(len(player_masks), player_count)
+        self.assertTrue(all(mask.bit_count() == 13 for mask in player_masks))
+        # every card dealt exactly once
+        self.assertEqual(sum(player_masks), FULL_DECK_MASK)
+
+    def test_seeded_deck_is_reproducible(self):
+        self.assertEqual(Deck(7).shuffle_and_deal(4), Deck(7).shuffle_and_deal(4))
+        self.assertNotEqual(Deck(7).shuffle_and_deal(4), Deck(8).shuffle_and_deal(4))
+
     def test_reset(self):
         deck = Deck()
         deck.reset()
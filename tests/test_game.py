@@ -34,6 +34,22 @@ class TestGame(unittest.TestCase):
         self.assertTrue(all(len(player.hand) == 1 for player in self.game.players))
         self.assertEqual(self.game.current_player_index, 1)
 
+    def test_start_new_game_with_hands(self):
+        mock_deck = MagicMock()
+        self.game.deck = mock_deck
+        self.game.start_new_game([["4c", "3c"], ["5d"], ["3h"], ["6s", "3d"]])
+        mock_deck.shuffle_and_deal.assert_not_called()
+        self.assertEqual(self.game.players[0].hand, ["3c", "4c"])
+        self.assertEqual(self.game.current_player_index, 3)
+        self.assertEqual(
+            self.game.dealt_hands, [("3c", "4c"), ("5d",), ("3h",), ("3d", "6s")]
+        )
+
+    def test_start_new_game_with_sorted_hands(self):
+        # hands marked as sorted are used as given
+        self.game.start_new_game([["4c", "3c"], ["5d"], ["3h"], ["3d"]], True)
+        self.assertEqual(self.game.players[0].hand, ["4c", "3c"])
+
     def test_start_new_round(self):
         self.game.start_new_game()
         self.game.start_new_round()
@@ -79,3 +95,31 @@ class TestGame(unittest.TestCase):
         self.assertFalse(self.game.did_player_win(CardSet("pass", [])))
         self.game.players[0].hand = []
         self.assertTrue(self.game.did_player_win(CardSet("pass", [])))
+
+    def test_observe(self):
+        self.game.start_new_game([["3d", "4d"], ["5d", "6d"], ["3c", "7d"], ["8d"]])
+        observation = self.game.observe()
+        self.assertEqual(observation.seat, 0)
+        self.assertEqual(list(observation.hand), ["3d", "4d"])
+        self.assertIsNone(observation.last_play)
+        self.assertEqual(observation.cards_left, (2, 2, 2, 1))
+        self.assertEqual(observation.played_mask, 0)
+        self.assertTrue(observation.is_first_turn)
+        self.assertEqual(observation.legal_actions, [CardSet("single", ["3d"])])
+
+        played_set = self.game.get_current_player().play_card_set_by_index(0)
+        self.game.next_player(played_set)
+        observation = self.game.observe()
+        self.assertEqual(observation.seat, 1)
+        self.assertEqual(observation.last_play, played_set)
+        self.assertEqual(observation.cards_left, (1, 2, 2, 1))
+        self.assertEqual(observation.played_mask, played_set.mask)
+        self.assertFalse(observation.is_first_turn)
+        self.assertEqual(
+            observation.legal_actions,
+            [
+                CardSet("single", ["5d"]),
+                CardSet("single", ["6d"]),
+                CardSet("pass", []),
+            ],
+        )
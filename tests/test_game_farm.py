@@ -0,0 +1,63 @@
+import unittest
+from functools import partial
+
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.game_farm import SimulationStats, collect_stats, run_farm
+from utils.simulation import GameResult, iter_duplicate, simulate
+
+
+class TestGameFarm(unittest.TestCase):
+    PLAYER_FACTORIES = [
+        RandomAIPlayer,
+        partial(RandomAIPlayer, use_play_index=True),
+        LowestAIPlayer,
+        RandomAIPlayer,
+    ]
+
+    def test_stats_add(self):
+        stats = SimulationStats(4)
+        stats.add(GameResult(0, 10, (0, 3, 4, 5)))
+        stats.add(GameResult(2, 20, (1, 2, 0, 5)))
+        self.assertEqual(stats.games, 2)
+        self.assertEqual(stats.wins, [1, 0, 1, 0])
+        self.assertEqual(stats.win_rates, [0.5, 0.0, 0.5, 0.0])
+        self.assertEqual(stats.mean_turns, 15)
+        self.assertEqual((stats.min_turns, stats.max_turns), (10, 20))
+        self.assertEqual(stats.mean_cards_left, [0.5, 2.5, 2.0, 5.0])
+
+    def test_stats_merge(self):
+        results = [
+            GameResult(0, 10, (0, 3, 4, 5)),
+            GameResult(2, 20, (1, 2, 0, 5)),
+            GameResult(3, 5, (1, 2, 3, 0)),
+        ]
+        merged = collect_stats(results[:1], 4)
+        merged.merge(collect_stats(results[1:], 4))
+        merged.merge(SimulationStats(4))
+        self.assertEqual(merged, collect_stats(results, 4))
+
+    def test_run_farm_matches_serial_run(self):
+        serial = collect_stats(simulate(12, self.PLAYER_FACTORIES, seed=5), 4)
+        shards = []
+        parallel = run_farm(
+            12,
+            self.PLAYER_FACTORIES,
+            seed=5,
+            workers=2,
+            shard_size=5,
+            on_shard=shards.append,
+        )
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sorted(shard.games for shard in shards), [2, 5, 5])
+
+    def test_run_farm_duplicate(self):
+        serial = collect_stats(iter_duplicate(3, self.PLAYER_FACTORIES, seed=2), 4)
+        parallel = run_farm(
+            3, self.PLAYER_FACTORIES, seed=2, workers=2, shard_size=2, duplicate=True
+        )
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel.games, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,34 @@
 import unittest
+from itertools import combinations
 
 from classes.card_set import CardSet
+from utils.bitmask import cards_to_mask
+from utils.comparison import play_key
+from utils.constants import RANK_PRIORITY
 from utils.game_logic import (
+    PlayCache,
     _get_five_card_hands,
     _get_flushes,
     _get_four_of_a_kinds,
     _get_full_houses,
     _get_pairs,
+    _get_singles,
     _get_straights,
+    _get_tier_candidates,
     _get_triplets,
+    first_beating,
     get_valid_plays,
+    iter_valid_plays,
 )
 
 
 class TestGameLogic(unittest.TestCase):
+    def test_get_singles(self):
+        cards = ["3d", "4s"]
+        singles = _get_singles(cards)
+        expected = [CardSet("single", ["3d"]), CardSet("single", ["4s"])]
+        self.assertEqual(singles, expected)
+
     def test_get_pairs(self):
         # if no pairs in hand
         cards = ["3d", "4s"]
@@ -93,6 +108,40 @@ class TestGameLogic(unittest.TestCase):
         ]
         self.assertEqual(straights, expected)
 
+    def test_get_straights_every_window(self):
+        # two full suits hold every straight window, each with two straight flushes
+        cards = [rank + suit for rank in RANK_PRIORITY for suit in "ds"]
+        straights = _get_straights(cards)
+        expected = []
+        for comb in combinations(cards, 5):
+            ranks = [RANK_PRIORITY.index(card[0]) for card in comb]
+            if len(set(ranks)) == 5 and ranks[4] - ranks[0] == 4:
+                flush = len({card[1] for card in comb}) == 1
+                expected.append(
+                    CardSet("straightflush" if flush else "straight", list(comb))
+                )
+        self.assertCountEqual(straights, expected)
+        self.assertEqual(len(straights), 9 * 2**5)
+        self.assertEqual(
+            sum(play.hand_type == "straightflush" for play in straights), 9 * 2
+        )
+
+    def test_get_straights_pruned(self):
+        cards = ["3d", "4d", "5d", "6d", "7d", "8c", "9c", "tc"]
+        # only straight flushes are returned below the minimum top rank
+        straights = _get_straights(cards, min_top_rank=5)
+        expected = [
+            CardSet("straightflush", ["3d", "4d", "5d", "6d", "7d"]),
+            CardSet("straight", ["4d", "5d", "6d", "7d", "8c"]),
+            CardSet("straight", ["5d", "6d", "7d", "8c", "9c"]),
+            CardSet("straight", ["6d", "7d", "8c", "9c", "tc"]),
+        ]
+        self.assertEqual(straights, expected)
+
+        straights = _get_straights(cards, flushes_only=True)
+        expected = [CardSet("straightflush", ["3d", "4d", "5d", "6d", "7d"])]
+        self.assertEqual(straights, expected)
+
     def test_get_flushes(self):
         # if no flushes in hand
         cards = ["3d", "4s"]
@@ -126,6 +175,38 @@ class TestGameLogic(unittest.TestCase):
         expected = []
         self.assertEqual(flushes, expected)
 
+    def test_get_flushes_strength_order(self):
+        # every five diamonds and spades that are not a straight flush
+        cards = [rank + suit for rank in RANK_PRIORITY for suit in "ds"]
+        flushes = _get_flushes(cards)
+        expected = []
+        for suit in "ds":
+            for comb in combinations(RANK_PRIORITY, 5):
+                if RANK_PRIORITY.index(comb[0]) + 4 != RANK_PRIORITY.index(comb[4]):
+                    expected.append(CardSet("flush", [rank + suit for rank in comb]))
+        self.assertCountEqual(flushes, expected)
+        self.assertEqual(len(flushes), 2 * (1287 - 9))
+        # ascending by highest card, then by the next highest cards
+        strengths = [
+            [cards.index(card) for card in reversed(flush.cards)] for flush in flushes
+        ]
+        self.assertEqual(strengths, sorted(strengths))
+
+    def test_get_flushes_min_top_card(self):
+        cards = ["3d", "4d", "5d", "6d", "8d", "3s", "4s", "5s", "6s", "8s", "9d"]
+        flushes = _get_flushes(
+            cards, min_top_card=cards_to_mask(["8s"]).bit_length() - 1
+        )
+        expected = [
+            CardSet("flush", ["3s", "4s", "5s", "6s", "8s"]),
+            CardSet("flush", ["3d", "4d", "5d", "6d", "9d"]),
+            CardSet("flush", ["3d", "4d", "5d", "8d", "9d"]),
+            CardSet("flush", ["3d", "4d", "6d", "8d", "9d"]),
+            CardSet("flush", ["3d", "5d", "6d", "8d", "9d"]),
+            CardSet("flush", ["4d", "5d", "6d", "8d", "9d"]),
+        ]
+        self.assertEqual(flushes, expected)
+
     def test_get_full_houses(self):
         # if no full houses in hand
         cards = ["3d", "4s", "5s", "6s", "7s"]
@@ -169,6 +250,39 @@ class TestGameLogic(unittest.TestCase):
         ]
         self.assertEqual(four_of_a_kinds, expected)
 
+    def test_get_full_houses_strength_order(self):
+        cards = ["3d", "3c", "4d", "4c", "4h", "4s", "5s"]
+        full_houses = _get_full_houses(cards)
+        expected = [
+            CardSet("fullhouse", ["3d", "3c", "4d", "4c", "4h"]),
+            CardSet("fullhouse", ["3d", "3c", "4d", "4c", "4s"]),
+            CardSet("fullhouse", ["3d", "3c", "4d", "4h", "4s"]),
+            CardSet("fullhouse", ["3d", "3c", "4c", "4h", "4s"]),
+        ]
+        self.assertEqual(full_houses, expected)
+        keys = [play_key(play) for play in full_houses]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_get_full_houses_min_rank(self):
+        cards = ["3d", "3c", "3s", "6c", "6h", "6s"]
+        full_houses = _get_full_houses(cards, min_rank=RANK_PRIORITY.index("6"))
+        expected = [
+            CardSet("fullhouse", ["3d", "3c", "6c", "6h", "6s"]),
+            CardSet("fullhouse", ["3d", "3s", "6c", "6h", "6s"]),
+            CardSet("fullhouse", ["3c", "3s", "6c", "6h", "6s"]),
+        ]
+        self.assertEqual(full_houses, expected)
+        self.assertEqual(_get_full_houses(cards, min_rank=RANK_PRIORITY.index("7")), [])
+
+    def test_get_four_of_a_kinds_min_rank(self):
+        cards = ["3d", "3c", "3h", "3s", "6d", "6c", "6h", "6s"]
+        four_of_a_kinds = _get_four_of_a_kinds(cards, min_rank=1)
+        expected = [
+            CardSet("fourofakind", ["6d", "6c", "6h", "6s", card])
+            for card in ["3d", "3c", "3h", "3s"]
+        ]
+        self.assertEqual(four_of_a_kinds, expected)
+
     def test_get_five_card_hands(self):
         # if no five card hands in hand
         cards = ["3d", "4s", "5s", "6s", "8s"]
@@ -210,6 +324,18 @@ class TestGameLogic(unittest.TestCase):
         expected = [CardSet("single", ["3d"])]
         self.assertEqual(valid_plays, expected)
 
+    def test_get_valid_plays_is_starting_hand_five_card_hands(self):
+        cards = ["3d", "3c", "3h", "3s", "4d", "5d", "5c", "6d", "7c", "9d", "9c"]
+        cards += ["9h", "9s", "jd", "kd"]
+        valid_plays = get_valid_plays(cards, is_starting_hand=True)
+        # same plays in the same order as filtering every play for the 3 of diamonds
+        expected = [play for play in get_valid_plays(cards) if "3d" in play.cards]
+        self.assertEqual(valid_plays, expected)
+        self.assertEqual(
+            [play.hand_type for play in valid_plays].count("fourofakind"), 12
+        )
+        self.assertEqual(get_valid_plays(cards[1:], is_starting_hand=True), [])
+
     def test_get_valid_plays_no_previous_not_starting_hand(self):
         cards = ["3d", "5s", "6s", "7s", "8d", "8s"]
         valid_plays = get_valid_plays(cards)
@@ -233,6 +359,154 @@ class TestGameLogic(unittest.TestCase):
         ]
         self.assertEqual(valid_plays, expected)
 
+    def test_get_valid_plays_with_card_mask(self):
+        cards = ["3c", "3s", "8d", "8h", "9s", "td", "jc", "qc"]
+        previous_play = CardSet("pair", ["4d", "4h"])
+        self.assertEqual(
+            get_valid_plays(cards_to_mask(cards), previous_play),
+            get_valid_plays(cards, previous_play),
+        )
+        self.assertEqual(
+            _get_five_card_hands(cards_to_mask(cards)), _get_five_card_hands(cards)
+        )
+        self.assertEqual(get_valid_plays(cards_to_mask(cards)), get_valid_plays(cards))
+
+    def test_get_valid_plays_with_five_card_previous(self):
+        cards = ["3d", "3c", "3h", "3s", "6c", "6h", "7d", "8d", "9d", "tc", "kd"]
+        cards += ["4d", "5d", "6d"]
+        five_card_hands = _get_five_card_hands(cards)
+        previous_plays = [
+            CardSet("straight", ["5d", "6d", "7h", "8s", "9s"]),
+            CardSet("straight", ["6s", "7h", "8s", "9s", "ts"]),
+            CardSet("flush", ["3s", "4s", "5s", "6s", "ks"]),
+            CardSet("fullhouse", ["2d", "2c", "4d", "4c", "4s"]),
+            CardSet("fourofakind", ["5d", "5c", "5h", "5s", "2s"]),
+            CardSet("straightflush", ["3c", "4c", "5c", "6c", "7c"]),
+        ]
+        for previous_play in previous_plays:
+            expected = [
+                play
+                for play in five_card_hands
+                if play_key(play) > play_key(previous_play)
+            ]
+            expected.append(CardSet("pass", []))
+            self.assertEqual(get_valid_plays(cards, previous_play), expected)
+
+    def test_get_tier_candidates(self):
+        cards = ["3d", "3c", "4c", "5h", "6c", "6h", "7d", "8d", "9d", "tc"]
+        straights = _get_straights(cards)
+        self.assertEqual(_get_tier_candidates(cards, 3), straights)
+        # straights topped below a 9 cannot beat 5-9, those topped by a 9 might
+        previous_key = play_key(CardSet("straight", ["5d", "6d", "7h", "8s", "9s"]))
+        self.assertEqual(
+            _get_tier_candidates(cards, 3, previous_key),
+            [play for play in straights if RANK_PRIORITY.index(play.cards[-1][0]) >= 6],
+        )
+        self.assertEqual(
+            _get_tier_candidates(cards, 1, play_key(CardSet("pair", ["4d", "4s"]))),
+            [CardSet("pair", ["6c", "6h"])],
+        )
+        self.assertEqual(
+            _get_tier_candidates(cards, 0, play_key(CardSet("single", ["9h"]))),
+            [CardSet("single", ["tc"])],
+        )
+
+    def test_iter_valid_plays(self):
+        cards = ["3d", "3c", "3h", "3s", "6c", "6h", "7d", "8d", "9d", "tc", "kd"]
+        previous_plays = [
+            None,
+            CardSet("single", ["6d"]),
+            CardSet("pair", ["3h", "3s"]),
+            CardSet("triplet", ["2d", "2c", "2s"]),
+            CardSet("straight", ["5d", "6d", "7h", "8s", "9s"]),
+            CardSet("flush", ["3s", "4s", "5s", "6s", "ks"]),
+        ]
+        for previous_play in previous_plays:
+            plays = list(iter_valid_plays(cards, previous_play))
+            expected = get_valid_plays(cards, previous_play)
+            self.assertCountEqual(plays, expected)
+            # plays are in ascending order of strength with pass last
+            real_plays = [play for play in plays if play.hand_type != "pass"]
+            keys = [play_key(play) for play in real_plays]
+            self.assertEqual(keys, sorted(keys))
+            if previous_play is not None:
+                self.assertEqual(plays[-1], CardSet("pass", []))
+
+        self.assertCountEqual(
+            list(iter_valid_plays(cards, is_starting_hand=True)),
+            get_valid_plays(cards, is_starting_hand=True),
+        )
+
+    def test_first_beating(self):
+        cards = ["3d", "3c", "6c", "6h", "7d", "8d", "9d", "tc", "kd"]
+        self.assertEqual(first_beating(cards, None), CardSet("single", ["3d"]))
+        self.assertEqual(
+            first_beating(cards, CardSet("single", ["9h"])), CardSet("single", ["tc"])
+        )
+        self.assertEqual(
+            first_beating(cards, CardSet("pair", ["4d", "4s"])),
+            CardSet("pair", ["6c", "6h"]),
+        )
+        self.assertEqual(
+            first_beating(cards, CardSet("straight", ["5d", "6d", "7h", "8s", "9s"])),
+            CardSet("straight", ["6c", "7d", "8d", "9d", "tc"]),
+        )
+        self.assertIsNone(first_beating(cards, CardSet("pair", ["ad", "as"])))
+
+    def test_play_cache(self):
+        cache = PlayCache()
+        cards = ["3d", "3c", "6c", "6h", "7d", "8d", "9d", "tc", "kd"]
+        previous_plays = [
+            None,
+            CardSet("single", ["6d"]),
+            CardSet("pair", ["4d", "4s"]),
+            CardSet("straight", ["5d", "6d", "7h", "8s", "9s"]),
+        ]
+        for previous_play in previous_plays:
+            for _ in range(2):
+                self.assertEqual(
+                    cache.get_valid_plays(cards, previous_play),
+                    get_valid_plays(cards, previous_play),
+                )
+        self.assertEqual(
+            cache.get_valid_plays(cards, is_starting_hand=True),
+            get_valid_plays(cards, is_starting_hand=True),
+        )
+        self.assertEqual((cache.hits, cache.misses), (4, 5))
+
+        # cached lists are copies
+        cache.get_valid_plays(cards).clear()
+        self.assertEqual(cache.get_valid_plays(cards), get_valid_plays(cards))
+
+    def test_play_cache_ignores_cards_that_cannot_beat(self):
+        cache = PlayCache()
+        previous_play = CardSet("pair", ["6d", "6s"])
+        cache.get_valid_plays(["3d", "3c", "7d", "7c"], previous_play)
+        # the 4s are lower than the previous pair, so the hand shares the entry
+        self.assertEqual(
+            cache.get_valid_plays(["4d", "4c", "7d", "7c"], previous_play),
+            [CardSet("pair", ["7d", "7c"]), CardSet("pass", [])],
+        )
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+    def test_play_cache_eviction(self):
+        cache = PlayCache(max_entries=2)
+        for card in ["3d", "4d", "5d"]:
+            cache.get_valid_plays([card])
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        # the least recently used entry was evicted
+        cache.get_valid_plays(["3d"])
+        self.assertEqual(cache.misses, 4)
+
+        cache = PlayCache(max_plays=3)
+        cache.get_valid_plays(["3d", "4d"])
+        cache.get_valid_plays(["5d", "6d"])
+        self.assertEqual(cache.stats()["plays"], 2)
+        self.assertEqual(cache.evictions, 1)
+        # results larger than the cache are not kept
+        cache.get_valid_plays(["3d", "4d", "5d", "6d"])
+        self.assertEqual(cache.stats()["plays"], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
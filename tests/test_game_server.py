@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.game_server import GameServer, LocalClient, _receive, _send
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = GameServer(
+            [None, LowestAIPlayer, RandomAIPlayer, LowestAIPlayer],
+            games_per_table=2,
+            seed=3,
+        )
+        self.host, self.port = await self.server.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self) -> None:
+        await self.server.close()
+
+    async def test_many_tables(self):
+        clients = [LocalClient(LowestAIPlayer()) for _ in range(5)]
+        reasons = await asyncio.gather(
+            *(client.play(self.host, self.port) for client in clients)
+        )
+        self.assertEqual(reasons, ["finished"] * 5)
+        self.assertEqual(sorted(client.table for client in clients), list(range(5)))
+        for client in clients:
+            self.assertEqual(client.seat, 0)
+            self.assertEqual(len(client.results), 2)
+            for result in client.results:
+                self.assertEqual(result["cards_left"][result["winner"]], 0)
+
+        metrics = self.server.metrics()
+        self.assertEqual(len(metrics), 5)
+        for table_metrics in metrics.values():
+            self.assertEqual(table_metrics["games"], 2)
+            self.assertGreater(table_metrics["decisions"], 0)
+            self.assertGreater(table_metrics["decisions_per_second"], 0)
+            self.assertIsNotNone(table_metrics["mean_remote_latency"])
+            self.assertIsNotNone(table_metrics["mean_ai_decision"])
+            self.assertEqual(table_metrics["closed_reason"], "finished")
+
+    async def test_same_seed_same_games(self):
+        client = LocalClient(LowestAIPlayer())
+        await client.play(self.host, self.port)
+        other_server = GameServer(self.server.seat_factories, 2, seed=3)
+        host, port = await other_server.start("127.0.0.1", 0)
+        other_client = LocalClient(LowestAIPlayer())
+        await other_client.play(host, port)
+        await other_server.close()
+        self.assertEqual(client.messages, other_client.messages)
+
+    async def test_slow_client_does_not_block_other_tables(self):
+        slow = LocalClient(LowestAIPlayer(), delay=0.05)
+        slow_task = asyncio.create_task(slow.play(self.host, self.port))
+        fast = LocalClient(LowestAIPlayer())
+        self.assertEqual(await fast.play(self.host, self.port), "finished")
+        self.assertFalse(slow_task.done())
+        self.assertEqual(await slow_task, "finished")
+
+        metrics = self.server.metrics()
+        self.assertGreater(
+            metrics[slow.table]["mean_remote_latency"],
+            metrics[fast.table]["mean_remote_latency"],
+        )
+
+    async def test_invalid_play_and_disconnect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        await _send(writer, {"type": "join"})
+        self.assertEqual((await _receive(reader))["type"], "seated")
+        message = await _receive(reader)
+        while message["type"] != "turn":
+            message = await _receive(reader)
+        await _send(writer, {"type": "play", "index": len(message["options"])})
+        self.assertEqual((await _receive(reader))["type"], "error")
+        # true is not an index, even though bool is a subclass of int
+        await _send(writer, {"type": "play", "index": True})
+        self.assertEqual((await _receive(reader))["type"], "error")
+        # not UTF-8
+        writer.write(b"\xff\xfe\n")
+        self.assertEqual((await _receive(reader))["type"], "error")
+        # over the line limit, answered at least once
+        writer.write(b"x" * 100_000 + b"\n")
+        self.assertEqual((await _receive(reader))["type"], "error")
+        writer.close()
+        await writer.wait_closed()
+
+        await self.server.tables[0].finished.wait()
+        metrics = self.server.metrics()[0]
+        self.assertEqual(metrics["closed_reason"], "player_disconnected")
+        self.assertGreaterEqual(metrics["profile"]["counters"]["invalid_messages"], 4)
+
+    async def test_invalid_join(self):
+        lines = [b"[]\n", b"1\n", b"not json\n", b"\xff\xfe\n", b'{"type": "play"}\n']
+        for line in lines:
+            with self.subTest(line):
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                writer.write(line)
+                await writer.drain()
+                self.assertEqual(
+                    await _receive(reader),
+                    {"type": "error", "message": "Expected join"},
+                )
+                self.assertEqual(await reader.read(), b"")
+                writer.close()
+                await writer.wait_closed()
+        self.assertEqual(self.server.tables, [])
+
+    def test_needs_a_client_seat(self):
+        with self.assertRaises(ValueError):
+            GameServer([LowestAIPlayer] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
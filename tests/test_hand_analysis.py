@@ -0,0 +1,34 @@
+import unittest
+
+from utils.bitmask import cards_to_mask
+from utils.hand_analysis import HandAnalysis, analyse_hand
+
+
+class TestHandAnalysis(unittest.TestCase):
+    def test_analysis(self):
+        cards = ["3d", "3s", "4d", "7c", "7h", "7s", "2d"]
+        analysis = HandAnalysis(cards_to_mask(cards))
+        self.assertEqual(analysis.cards, cards)
+        self.assertEqual(analysis.rank_cards[0], ("3d", "3s"))
+        self.assertEqual(analysis.rank_cards[4], ("7c", "7h", "7s"))
+        self.assertEqual(analysis.rank_cards[5], ())
+        self.assertEqual(analysis.rank_counts, [2, 1, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(analysis.rank_bits, 0b1000000010011)
+        # diamonds, clubs, hearts, spades
+        self.assertEqual(
+            analysis.suit_rank_bits, (0b1000000000011, 0b10000, 0b10000, 0b10001)
+        )
+
+    def test_empty_hand(self):
+        analysis = HandAnalysis(0)
+        self.assertEqual(analysis.cards, [])
+        self.assertEqual(analysis.rank_bits, 0)
+        self.assertEqual(sum(analysis.rank_counts), 0)
+
+    def test_analyse_hand_is_cached(self):
+        mask = cards_to_mask(["3d", "4d"])
+        self.assertIs(analyse_hand(mask), analyse_hand(mask))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from classes.card_set import CardSet
+from classes.deck import Deck
+from utils.comparison import sort_cards
+from utils.game_logic import get_valid_plays
+from utils.play_index import PlayIndex
+
+
+class TestPlayIndex(unittest.TestCase):
+    def test_get_plays_matches_get_valid_plays(self):
+        hand = ["3d", "3c", "3h", "4d", "5d", "6d", "7d", "7s", "8d", "9h"]
+        index = PlayIndex(hand)
+        self.assertEqual(index.get_plays(), get_valid_plays(hand))
+        self.assertEqual(
+            index.get_plays(is_starting_hand=True),
+            get_valid_plays(hand, is_starting_hand=True),
+        )
+        previous_play = CardSet("pair", ["3s", "3c"])
+        self.assertEqual(
+            index.get_plays(previous_play), get_valid_plays(hand, previous_play)
+        )
+
+    def test_remove_cards(self):
+        hand = ["3d", "3c", "3h", "4d", "5d", "6d", "7d", "7s", "8d", "9h"]
+        index = PlayIndex(hand)
+        index.remove_cards(["3c", "7d"])
+        remaining = ["3d", "3h", "4d", "5d", "6d", "7s", "8d", "9h"]
+        self.assertEqual(index.get_plays(), get_valid_plays(remaining))
+        self.assertEqual(len(index), len(get_valid_plays(remaining)))
+
+        index.remove_cards(["3d"])
+        self.assertEqual(index.get_plays(is_starting_hand=True), [])
+
+    def test_pairs_out_of_key_order(self):
+        # get_valid_plays lists the king pairs grouped by their lower card, so their
+        # keys are not ascending
+        hand = ["3c", "3s", "kd", "kc", "kh", "ks"]
+        index = PlayIndex(hand)
+        previous_play = CardSet("pair", ["3d", "3h"])
+        self.assertEqual(
+            index.get_plays(previous_play), get_valid_plays(hand, previous_play)
+        )
+        index.remove_cards(["kc"])
+        self.assertEqual(
+            len(index), len(get_valid_plays(["3c", "3s", "kd", "kh", "ks"]))
+        )
+        self.assertEqual(
+            index.get_plays(previous_play),
+            get_valid_plays(["3c", "3s", "kd", "kh", "ks"], previous_play),
+        )
+
+    def test_random_games_match_get_valid_plays(self):
+        rng = random.Random(0)
+        deck = Deck()
+        for _ in range(20):
+            hand = rng.sample(deck.cards, 13)
+            sort_cards(hand)
+            index = PlayIndex(hand)
+            while hand:
+                previous_play = rng.choice(get_valid_plays(rng.sample(deck.cards, 13)))
+                self.assertEqual(
+                    index.get_plays(previous_play), get_valid_plays(hand, previous_play)
+                )
+                self.assertEqual(index.get_plays(), get_valid_plays(hand))
+                played = rng.choice(get_valid_plays(hand))
+                index.remove_cards(played.cards)
+                hand = [card for card in hand if card not in played.cards]
+
+
+if __name__ == "__main__":
+    unittest.main()
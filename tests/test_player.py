@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
-from classes.player import HumanPlayer
+from classes.agent import Observation
+from classes.player import AgentPlayer, HumanPlayer, LowestAIPlayer, RandomAIPlayer
 from classes.card_set import CardSet
+from utils.bitmask import cards_to_mask
 
 
 class TestPlayer(unittest.TestCase):
@@ -19,6 +21,72 @@ class TestPlayer(unittest.TestCase):
         player._play_cards(cards)
         self.assertEqual(player.hand, ["3d", "4h", "7c", "9s"])
 
+    def test_hand_mask(self):
+        player = HumanPlayer()
+        player.hand = ["3d", "4h"]
+        self.assertEqual(player.hand_mask, cards_to_mask(["3d", "4h"]))
+
+    def test_random_player_seed(self):
+        choices = []
+        for _ in range(2):
+            player = RandomAIPlayer(seed=3)
+            player.play_options = [
+                CardSet("single", [card])
+                for card in ["3d", "4d", "5d", "6d", "7d", "8d"]
+            ]
+            choices.append([player.get_play_choice() for _ in range(20)])
+        self.assertEqual(choices[0], choices[1])
+
+    def test_decide(self):
+        legal_actions = [CardSet("single", ["4d"]), CardSet("pass", [])]
+        observation = Observation(
+            1, ("4d",), CardSet("single", ["3d"]), (1, 1), 1, legal_actions, False
+        )
+        self.assertEqual(RandomAIPlayer(seed=1).decide(observation), 0)
+        self.assertEqual(LowestAIPlayer().decide(observation), 0)
+        self.assertEqual(
+            LowestAIPlayer().decide_batch(
+                [observation, observation._replace(legal_actions=[])]
+            ),
+            [0, -1],
+        )
+
+    def test_get_play_choice_decides_from_play_options(self):
+        player = LowestAIPlayer()
+        self.assertEqual(player.get_play_choice(), -1)
+        player.play_options = [CardSet("single", ["3d"])]
+        self.assertEqual(player.get_play_choice(), 0)
+
+    def test_agent_player(self):
+        agent = LowestAIPlayer()
+        player = AgentPlayer(agent)
+        player.hand = ["3d", "4d", "5d"]
+        player.get_play_options()
+        self.assertEqual(player.get_play_choice(), 0)
+        self.assertEqual(player.player_type(), agent.player_type())
+
+    @patch("classes.player.get_valid_plays")
+    def test_get_play_options_with_play_index(self, get_valid_plays_mock):
+        player = HumanPlayer(use_play_index=True)
+        player.hand = ["3d", "4h", "7d", "7c", "7s"]
+        previous_play = CardSet("pair", ["5d", "5c"])
+        self.assertEqual(
+            player.get_play_options(previous_play),
+            [
+                CardSet("pair", ["7d", "7c"]),
+                CardSet("pair", ["7d", "7s"]),
+                CardSet("pair", ["7c", "7s"]),
+                CardSet("pass", []),
+            ],
+        )
+        player._play_cards(CardSet("single", ["7c"]))
+        self.assertEqual(player.hand, ["3d", "4h", "7d", "7s"])
+        self.assertEqual(
+            player.get_play_options(previous_play),
+            [CardSet("pair", ["7d", "7s"]), CardSet("pass", [])],
+        )
+        get_valid_plays_mock.assert_not_called()
+
     @patch("classes.player.get_valid_plays")
     def test_get_play_options_with_previous_play(self, get_valid_plays_mock):
         player = HumanPlayer()
@@ -0,0 +1,80 @@
+import unittest
+from functools import partial
+
+from classes.card_set import CardSet
+from classes.game import Game
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.game_logic import get_valid_plays
+from utils.profiling import GameProfile
+from utils.simulation import simulate
+
+
+class TestGameProfile(unittest.TestCase):
+    PLAYER_FACTORIES = [RandomAIPlayer, LowestAIPlayer, RandomAIPlayer, LowestAIPlayer]
+
+    def test_counters_and_timers(self):
+        profile = GameProfile()
+        profile.count("a")
+        profile.count("a", 2)
+        profile.add_time("t", 0.0)
+        profile.add_time("t", 0.0)
+        self.assertEqual(profile.counters, {"a": 3})
+        self.assertEqual(profile.calls("t"), 2)
+        self.assertGreater(profile.total_time("t"), 0)
+        self.assertIsNone(profile.mean_time("missing"))
+
+        other = GameProfile()
+        other.count("a")
+        other.add_time("u", 0.0)
+        profile.merge(other)
+        self.assertEqual(profile.counters, {"a": 4})
+        self.assertEqual(set(profile.as_dict()["timers"]), {"t", "u"})
+        self.assertIn("t", profile.report())
+
+    def test_game_shares_profile_with_players(self):
+        profile = GameProfile()
+        game = Game([LowestAIPlayer() for _ in range(4)], profile)
+        self.assertTrue(all(player.profile is profile for player in game.players))
+        self.assertIsNone(LowestAIPlayer().profile)
+
+    def test_get_valid_plays_counts_candidates(self):
+        profile = GameProfile()
+        hand = ["3d", "5d", "5c", "7h", "7s"]
+        plays = get_valid_plays(hand, CardSet("pair", ["5h", "5s"]), profile=profile)
+        # 5d5c and 7h7s are generated, only 7h7s beats 5h5s
+        self.assertEqual(len(plays), 2)
+        self.assertEqual(profile.counters["candidates_generated"], 2)
+        self.assertEqual(profile.counters["candidates_kept"], 1)
+
+    def test_simulate_with_profile(self):
+        profile = GameProfile()
+        results = simulate(5, self.PLAYER_FACTORIES, seed=2, profile=profile)
+        # profiling does not change the games
+        self.assertEqual(results, simulate(5, self.PLAYER_FACTORIES, seed=2))
+        turns = sum(result.turns for result in results)
+        self.assertEqual(profile.counters["games"], 5)
+        self.assertEqual(profile.calls("deal"), 5)
+        self.assertEqual(profile.calls("move_generation.get_valid_plays"), turns)
+        self.assertEqual(
+            profile.calls("decision.AI (random)")
+            + profile.calls("decision.AI (plays lowest)"),
+            turns,
+        )
+        self.assertEqual(profile.calls("bookkeeping"), turns)
+        self.assertGreaterEqual(
+            profile.counters["candidates_generated"],
+            profile.counters["candidates_kept"],
+        )
+
+    def test_profile_play_index(self):
+        profile = GameProfile()
+        factories = [partial(LowestAIPlayer, use_play_index=True)] * 4
+        results = simulate(2, factories, seed=2, profile=profile)
+        self.assertEqual(
+            profile.calls("move_generation.play_index"),
+            sum(result.turns for result in results),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from functools import partial
+
+from classes.agent import Agent
+from classes.game import Game
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.simulation import (
+    GameResult,
+    derive_seed,
+    iter_duplicate,
+    play_game,
+    simulate,
+    simulate_lockstep,
+)
+
+
+class TestSimulation(unittest.TestCase):
+    PLAYER_FACTORIES = [RandomAIPlayer, LowestAIPlayer, RandomAIPlayer, LowestAIPlayer]
+
+    def test_derive_seed(self):
+        self.assertEqual(derive_seed(1, 0), derive_seed(1, 0))
+        self.assertNotEqual(derive_seed(1, 0), derive_seed(1, 1))
+        self.assertNotEqual(derive_seed(1, 0), derive_seed(2, 0))
+        self.assertLess(derive_seed(1, 0), 1 << 64)
+
+    def test_play_game(self):
+        game = Game([LowestAIPlayer() for _ in range(4)])
+        result = play_game(game)
+        self.assertIsInstance(result, GameResult)
+        self.assertEqual(result.cards_left[result.winner], 0)
+        self.assertEqual(len(result.cards_left), 4)
+        self.assertEqual(result.cards_left.count(0), 1)
+        # a play or pass is recorded in the history for every turn, plus the win
+        self.assertEqual(len(game.history), result.turns + 1)
+
+    def test_simulate(self):
+        results = simulate(5, self.PLAYER_FACTORIES, seed=7)
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertEqual(result.cards_left[result.winner], 0)
+            self.assertTrue(
+                all(0 <= cards_left <= 13 for cards_left in result.cards_left)
+            )
+
+    def test_simulate_is_reproducible(self):
+        self.assertEqual(
+            simulate(5, self.PLAYER_FACTORIES, seed=7),
+            simulate(5, self.PLAYER_FACTORIES, seed=7),
+        )
+
+    def test_simulate_with_play_index(self):
+        # the play index returns the same plays, so the games are identical
+        factories = [
+            partial(factory, use_play_index=True) for factory in self.PLAYER_FACTORIES
+        ]
+        self.assertEqual(
+            simulate(5, factories, seed=3), simulate(5, self.PLAYER_FACTORIES, seed=3)
+        )
+
+    def test_simulate_with_play_cache(self):
+        factories = [
+            partial(factory, use_play_cache=True) for factory in self.PLAYER_FACTORIES
+        ]
+        self.assertEqual(
+            simulate(5, factories, seed=3), simulate(5, self.PLAYER_FACTORIES, seed=3)
+        )
+
+    def test_simulate_lockstep(self):
+        # the lowest-play agent has no randomness, so the games match `simulate`
+        self.assertEqual(
+            simulate_lockstep(10, [LowestAIPlayer()] * 4, seed=5, table_count=4),
+            simulate(10, [LowestAIPlayer] * 4, seed=5),
+        )
+
+    def test_simulate_lockstep_batches_decisions(self):
+        class CountingAgent(Agent):
+            def __init__(self) -> None:
+                self.batch_sizes = []
+
+            def decide(self, observation) -> int:
+                return 0
+
+            def decide_batch(self, observations):
+                self.batch_sizes.append(len(observations))
+                return super().decide_batch(observations)
+
+        agents = [CountingAgent() for _ in range(4)]
+        results = simulate_lockstep(20, agents, seed=6, table_count=8)
+        self.assertEqual(len(results), 20)
+        for result in results:
+            self.assertEqual(result.cards_left[result.winner], 0)
+        decisions = sum(sum(agent.batch_sizes) for agent in agents)
+        self.assertEqual(decisions, sum(result.turns for result in results))
+        self.assertGreater(max(max(agent.batch_sizes) for agent in agents), 1)
+
+    def test_duplicate(self):
+        games = []
+        results = list(
+            iter_duplicate(2, self.PLAYER_FACTORIES, seed=4, on_game_end=games.append)
+        )
+        self.assertEqual(len(results), 8)
+        self.assertEqual(
+            results, list(iter_duplicate(2, self.PLAYER_FACTORIES, seed=4))
+        )
+        for deal in range(2):
+            rotations = games[deal * 4 : deal * 4 + 4]
+            # every rotation plays the same deal
+            self.assertTrue(
+                all(game.dealt_hands == rotations[0].dealt_hands for game in rotations)
+            )
+            # each player plays each seat's hand once
+            for rotation, game in enumerate(rotations):
+                self.assertIsInstance(game.players[0], self.PLAYER_FACTORIES[rotation])
+        for result in results:
+            self.assertEqual(result.cards_left[result.winner], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import unittest
+
+from benchmarks.stress import (
+    ALLOCATION_BUDGET_BYTES,
+    TIME_BUDGET_SECONDS,
+    build_stress_corpus,
+    load_stress_corpus,
+    measure_hand,
+)
+from classes.card_set import CardSet
+from utils.game_logic import get_valid_plays
+
+
+class TestStressCorpus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.corpus = load_stress_corpus()
+
+    def setUp(self) -> None:
+        # measuring clears the shared card set intern table, so put it back afterwards
+        self.interned = dict(CardSet._interned)
+
+    def tearDown(self) -> None:
+        CardSet._interned.clear()
+        CardSet._interned.update(self.interned)
+
+    def test_corpus_is_up_to_date(self):
+        hands = build_stress_corpus()
+        self.assertEqual(
+            hands, {name: record["cards"] for name, record in self.corpus.items()}
+        )
+        self.assertTrue(
+            all(len(hand) == len(set(hand)) == 13 for hand in hands.values())
+        )
+
+    def test_generation_within_budget(self):
+        for name, record in self.corpus.items():
+            with self.subTest(name):
+                result = measure_hand(record["cards"])
+                # the plays generated must not change, only how fast they are found
+                self.assertEqual(result.counts, record["counts"])
+                self.assertLess(result.seconds, TIME_BUDGET_SECONDS)
+                self.assertLess(result.peak_bytes, ALLOCATION_BUDGET_BYTES)
+
+    def test_allocation_traced_cold(self):
+        # warming the caches first must not hide the allocations of a first call
+        record = self.corpus["one_suit"]
+        get_valid_plays(record["cards"])
+        peak_bytes = measure_hand(record["cards"]).peak_bytes
+        self.assertGreater(peak_bytes, record["peak_bytes"] // 2)
+
+    def test_time_measured_cold(self):
+        # a warm call reuses cached analyses and interned card sets, which makes it
+        # several times faster than the cold calls that must be measured
+        cards = self.corpus["one_suit"]["cards"]
+        get_valid_plays(cards)
+        warm_seconds = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            get_valid_plays(cards)
+            warm_seconds = min(warm_seconds, time.perf_counter() - start)
+        self.assertGreater(measure_hand(cards).seconds, 2 * warm_seconds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from classes.card_set import CardSet
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.simulation import simulate
+from utils.trajectory import (
+    GameRecord,
+    Move,
+    TrajectoryReader,
+    TrajectoryWriter,
+    replay_game,
+)
+
+
+class TestTrajectory(unittest.TestCase):
+    PLAYER_FACTORIES = [RandomAIPlayer, LowestAIPlayer, RandomAIPlayer, LowestAIPlayer]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.b2tr")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        games = []
+
+        def record(game):
+            games.append(game)
+            writer(game)
+
+        with TrajectoryWriter(self.path) as writer:
+            results = simulate(5, self.PLAYER_FACTORIES, seed=3, on_game_end=record)
+        self.assertEqual(writer.games_written, 5)
+
+        reader = TrajectoryReader(self.path)
+        records = list(reader)
+        self.assertEqual(len(reader), 5)
+        for game, record, result in zip(games, records, results):
+            self.assertEqual(record.moves, [Move(*entry) for entry in game.history])
+            self.assertEqual(record.winner, result.winner)
+            self.assertEqual(sum(hand.bit_count() for hand in record.hands), 52)
+        self.assertEqual(reader[3], records[3])
+
+    def test_replay(self):
+        with TrajectoryWriter(self.path) as writer:
+            simulate(3, self.PLAYER_FACTORIES, seed=5, on_game_end=writer)
+        for record in TrajectoryReader(self.path):
+            game = replay_game(record)
+            self.assertEqual([Move(*entry) for entry in game.history], record.moves)
+
+    def test_replay_invalid_play(self):
+        with TrajectoryWriter(self.path) as writer:
+            simulate(1, self.PLAYER_FACTORIES, seed=5, on_game_end=writer)
+        record = TrajectoryReader(self.path)[0]
+        round_number, seat, _ = record.moves[0]
+        moves = [Move(round_number, seat, CardSet("single", ["2s"]))]
+        with self.assertRaises(ValueError):
+            replay_game(GameRecord(record.hands, moves + record.moves[1:]))
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a trajectory")
+        with self.assertRaises(ValueError):
+            TrajectoryReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from classes.batch_env import IN_HAND, PLAYED
+from classes.player import LowestAIPlayer, RandomAIPlayer
+from utils.action_catalogue import get_catalogue
+from utils.simulation import simulate
+from utils.trajectory_dataset import DatasetWriter, TrajectoryDataset
+
+
+class TestTrajectoryDataset(unittest.TestCase):
+    PLAYER_FACTORIES = [RandomAIPlayer, LowestAIPlayer, RandomAIPlayer, LowestAIPlayer]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.catalogue = get_catalogue(None)
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        self.results = []
+        for part in range(2):
+            path = os.path.join(self.directory.name, f"part{part}.b2ds")
+            with DatasetWriter(path, catalogue=self.catalogue) as writer:
+                self.results += simulate(
+                    3, self.PLAYER_FACTORIES, seed=part, on_game_end=writer
+                )
+            self.paths.append(path)
+        self.dataset = TrajectoryDataset(self.paths, self.catalogue)
+
+    def tearDown(self) -> None:
+        del self.dataset
+        self.directory.cleanup()
+
+    def test_length(self):
+        self.assertEqual(
+            len(self.dataset), sum(result.turns for result in self.results)
+        )
+
+    def test_records(self):
+        records = self.dataset.records(np.arange(len(self.dataset)))
+        # every game starts with the 3 of diamonds in the first player's hand
+        first_turns = records[records["is_first_turn"]]
+        self.assertEqual(len(first_turns), len(self.results))
+        self.assertTrue((first_turns["hand"] & 1 == 1).all())
+        self.assertTrue((first_turns["previous_action"] == -1).all())
+        self.assertTrue((first_turns["played"] == 0).all())
+        # one winner per game
+        self.assertTrue(set(np.unique(records["outcome"])) <= {-1, 1})
+
+    def test_batch(self):
+        indices = np.array([0, len(self.dataset) - 1, 5, 5])
+        batch = self.dataset.batch(indices)
+        records = self.dataset.records(indices)
+        self.assertEqual(batch.state.shape, (4, 52))
+        self.assertEqual(batch.legal.shape, (4, self.catalogue.action_count))
+        np.testing.assert_array_equal(
+            (batch.state == IN_HAND).sum(axis=1), records["cards_left"][:, 0]
+        )
+        self.assertTrue((batch.state[0] != PLAYED).all())
+        self.assertTrue(batch.legal[np.arange(4), batch.action].all())
+        np.testing.assert_array_equal(batch.state[2], batch.state[3])
+
+    def test_iter_batches(self):
+        batches = list(self.dataset.iter_batches(64, seed=1))
+        self.assertEqual(sum(len(batch.action) for batch in batches), len(self.dataset))
+        for batch in batches:
+            self.assertTrue(
+                batch.legal[np.arange(len(batch.action)), batch.action].all()
+            )
+
+    def test_invalid_file(self):
+        path = os.path.join(self.directory.name, "invalid")
+        with open(path, "wb") as file:
+            file.write(b"not a dataset")
+        with self.assertRaises(ValueError):
+            TrajectoryDataset(path, self.catalogue)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,341 @@
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from classes.card_set import CardSet
+from utils.bitmask import CARD_COUNT, CARD_INDICES, CARD_STRINGS, cards_to_mask
+from utils.comparison import HAND_TYPE_TIER, play_key
+from utils.constants import PLAYABLE_PRIORITY
+from utils.game_logic import Hand, get_valid_plays
+
+# bump whenever the catalogue contents or ordering change, so stale files are rebuilt
+CATALOGUE_VERSION = 1
+DEFAULT_CATALOGUE_PATH = os.path.join(
+    os.path.expanduser("~"),
+    ".cache",
+    "big_two",
+    f"action_catalogue_v{CATALOGUE_VERSION}.npz",
+)
+
+# number of hands whose legal masks are computed at once, to bound temporary memory
+_LEGAL_MASK_CHUNK = 256
+
+# spacing between play sizes in the (size, strength) ordering key
+_SIZE_STRIDE = 1 << 16
+
+_BIT_VALUES = np.uint64(1) << np.arange(CARD_COUNT, dtype=np.uint64)
+
+
+def to_card_masks(cards: np.ndarray) -> np.ndarray:
+    """
+    Packs boolean card arrays into card masks.
+
+    Args:
+        cards (np.ndarray): A (..., 52) boolean array, True for each card held.
+
+    Returns:
+        np.ndarray: A (...) uint64 array of card masks.
+    """
+    return (cards.astype(np.uint64) * _BIT_VALUES).sum(axis=-1, dtype=np.uint64)
+
+
+def from_card_masks(masks: np.ndarray) -> np.ndarray:
+    """
+    Unpacks card masks into boolean card arrays, the inverse of `to_card_masks`.
+
+    Args:
+        masks (np.ndarray): A (...) array of card masks.
+
+    Returns:
+        np.ndarray: A (..., 52) boolean array, True for each card held.
+    """
+    masks = np.asarray(masks, dtype="<u8")
+    bits = np.unpackbits(masks[..., None].view(np.uint8), axis=-1, bitorder="little")
+    return bits[..., :CARD_COUNT].astype(bool)
+
+
+class ActionCatalogue:
+    """
+    A fixed enumeration of every play that can be made in Big Two, each with a stable
+    integer id, plus a final pass action.
+
+    Plays are ordered by size then strength, so the plays that beat a given play form
+    a contiguous range of ids. Card masks, sizes and strength keys of every play are
+    precomputed as arrays so legal-action masks can be computed without building any
+    CardSet objects.
+    """
+
+    def __init__(self, plays: Sequence[CardSet]) -> None:
+        self.plays = list(plays)
+        self.pass_action = len(self.plays)
+        self.action_count = len(self.plays) + 1
+
+        self.cards = np.zeros((len(self.plays), CARD_COUNT), dtype=bool)
+        for action_id, play in enumerate(self.plays):
+            self.cards[action_id, [CARD_INDICES[c] for c in play.cards]] = True
+        self.masks = to_card_masks(self.cards)
+        self.sizes = self.cards.sum(axis=1).astype(np.int8)
+        self.keys = np.array([play_key(play) for play in self.plays], dtype=np.int32)
+        self.order_keys = self.sizes.astype(np.int64) * _SIZE_STRIDE + self.keys
+        if (np.diff(self.order_keys) < 0).any():
+            raise ValueError("Plays must be ordered by size then strength")
+        self.five_card_start = int(np.searchsorted(self.order_keys, 5 * _SIZE_STRIDE))
+        # plays that include the 3 of diamonds (card 0)
+        self.has_3d = self.cards[:, 0].copy()
+
+        self._ids: Dict[int, int] = {
+            int(mask): action_id for action_id, mask in enumerate(self.masks)
+        }
+
+    def __len__(self) -> int:
+        return self.action_count
+
+    def action_id(self, play: CardSet) -> int:
+        """
+        Returns the id of a play (or pass).
+
+        Args:
+            play (CardSet): The play.
+
+        Returns:
+            int: The play's action id.
+        """
+        if play.hand_type == "pass":
+            return self.pass_action
+        return self._ids[cards_to_mask(play.cards)]
+
+    def play(self, action_id: int) -> CardSet:
+        """
+        Returns the play (or pass) with the given action id.
+
+        Args:
+            action_id (int): The action id.
+
+        Returns:
+            CardSet: The play.
+        """
+        if action_id == self.pass_action:
+            return CardSet("pass", [])
+        return self.plays[action_id]
+
+    def save(self, path: str) -> None:
+        """
+        Saves the catalogue to a .npz file.
+
+        Args:
+            path (str): The file to save to.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first so concurrent readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(
+                file,
+                version=np.int32(CATALOGUE_VERSION),
+                tiers=np.array(
+                    [HAND_TYPE_TIER[play.hand_type] for play in self.plays],
+                    dtype=np.int8,
+                ),
+                masks=self.masks,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ActionCatalogue":
+        """
+        Loads a catalogue saved with `save`.
+
+        Args:
+            path (str): The file to load.
+
+        Raises:
+            ValueError: If the file was saved by a different catalogue version.
+
+        Returns:
+            ActionCatalogue: The catalogue.
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != CATALOGUE_VERSION:
+                raise ValueError(f"Unsupported action catalogue version in {path}")
+            return cls(
+                [
+                    CardSet.from_mask(PLAYABLE_PRIORITY[tier], int(mask))
+                    for tier, mask in zip(data["tiers"], data["masks"])
+                ]
+            )
+
+    def _beating_range(
+        self, previous_actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # the [low, high) range of ids of plays that beat each previous action, or all
+        # plays where there is no previous action (-1)
+        responding = previous_actions >= 0
+        previous = np.where(responding, previous_actions, 0)
+        previous_sizes = np.where(responding, self.sizes[previous], 0).astype(np.int64)
+        low = np.where(
+            responding,
+            np.searchsorted(self.order_keys, self.order_keys[previous], "right"),
+            0,
+        )
+        high = np.where(
+            responding,
+            np.searchsorted(self.order_keys, (previous_sizes + 1) * _SIZE_STRIDE),
+            self.pass_action,
+        )
+        return low, high
+
+    def legal_mask(
+        self,
+        hand: Hand,
+        previous_play: Optional[CardSet] = None,
+        is_starting_hand: bool = False,
+    ) -> np.ndarray:
+        """
+        Returns which actions can be taken from a hand, following the same rules as
+        `get_valid_plays`.
+
+        Args:
+            hand (Hand): The list of cards in the hand, or its card mask.
+            previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
+            is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+
+        Returns:
+            np.ndarray: A boolean array over the catalogue's actions.
+        """
+        hand_mask = hand if isinstance(hand, int) else cards_to_mask(hand)
+        previous_action = -1 if previous_play is None else self.action_id(previous_play)
+        low, high = self._beating_range(np.array([previous_action]))
+        low, high = int(low[0]), int(high[0])
+
+        legal = np.zeros(self.action_count, dtype=bool)
+        legal[low:high] = (self.masks[low:high] & ~np.uint64(hand_mask)) == 0
+        if is_starting_hand:
+            legal[:-1] &= self.has_3d
+        legal[self.pass_action] = previous_play is not None
+        return legal
+
+    def legal_masks(
+        self,
+        hand_masks: np.ndarray,
+        previous_actions: np.ndarray,
+        is_first_turn: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Returns which actions can be taken for a batch of hands.
+
+        Args:
+            hand_masks (np.ndarray): The card mask of each hand (B, uint64).
+            previous_actions (np.ndarray): The action id of the play to beat for each
+                hand, -1 if the player is free to play anything (B).
+            is_first_turn (np.ndarray): Whether each hand is making the first play of
+                the game and must include the 3 of diamonds (B, bool).
+
+        Returns:
+            np.ndarray: A (B x A) boolean array of legal actions.
+        """
+        batch_size = len(hand_masks)
+        previous_actions = np.asarray(previous_actions)
+        responding = previous_actions >= 0
+        low, high = self._beating_range(previous_actions)
+        previous_sizes = np.where(
+            responding, self.sizes[np.where(responding, previous_actions, 0)], 0
+        )
+
+        legal = np.zeros((batch_size, self.action_count), dtype=bool)
+        # the five-card block is only needed for hands that are free to play anything
+        # or are responding to a five-card hand
+        blocks = (
+            (slice(0, self.five_card_start), np.ones(batch_size, dtype=bool)),
+            (
+                slice(self.five_card_start, self.pass_action),
+                (previous_sizes == 0) | (previous_sizes == 5),
+            ),
+        )
+        for block, block_hands in blocks:
+            action_ids = np.arange(self.pass_action)[block]
+            for start in range(0, batch_size, _LEGAL_MASK_CHUNK):
+                rows = start + np.flatnonzero(
+                    block_hands[start : start + _LEGAL_MASK_CHUNK]
+                )
+                if len(rows) == 0:
+                    continue
+                mask = (self.masks[None, block] & ~hand_masks[rows, None]) == 0
+                mask &= (action_ids[None, :] >= low[rows, None]) & (
+                    action_ids[None, :] < high[rows, None]
+                )
+                legal[rows, block] = mask
+
+        legal[np.flatnonzero(is_first_turn), :-1] &= self.has_3d[None, :]
+        legal[:, self.pass_action] = responding
+        return legal
+
+    def is_legal(
+        self,
+        actions: np.ndarray,
+        hand_masks: np.ndarray,
+        previous_actions: np.ndarray,
+        is_first_turn: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Checks one action per hand against the same rules as `legal_masks`.
+
+        Args:
+            actions (np.ndarray): The action id taken for each hand (B).
+            hand_masks (np.ndarray): The card mask of each hand (B, uint64).
+            previous_actions (np.ndarray): The action id of the play to beat for each
+                hand, -1 if the player is free to play anything (B).
+            is_first_turn (np.ndarray): Whether each hand is making the first play of
+                the game (B, bool).
+
+        Returns:
+            np.ndarray: Whether each action is legal (B, bool).
+        """
+        responding = previous_actions >= 0
+        is_pass = actions == self.pass_action
+        played = np.where(is_pass, 0, actions)
+        previous = np.where(responding, previous_actions, 0)
+        legal = (self.masks[played] & ~hand_masks) == 0
+        legal &= ~responding | (
+            (self.sizes[played] == self.sizes[previous])
+            & (self.keys[played] > self.keys[previous])
+        )
+        legal &= self.has_3d[played] | ~is_first_turn
+        return np.where(is_pass, responding, legal)
+
+
+def build_catalogue() -> ActionCatalogue:
+    """
+    Builds the catalogue from every play `get_valid_plays` finds in the full deck.
+
+    Returns:
+        ActionCatalogue: The catalogue.
+    """
+    plays = get_valid_plays(list(CARD_STRINGS))
+    plays.sort(key=lambda play: (len(play.cards), play_key(play)))
+    return ActionCatalogue(plays)
+
+
+@lru_cache(maxsize=None)
+def get_catalogue(path: Optional[str] = DEFAULT_CATALOGUE_PATH) -> ActionCatalogue:
+    """
+    Returns the shared action catalogue, loading it from disk if it has been saved
+    before and otherwise building and saving it.
+
+    Args:
+        path (Optional[str], optional): Where the catalogue is persisted. Defaults to
+            DEFAULT_CATALOGUE_PATH. If None the catalogue is built without persisting.
+
+    Returns:
+        ActionCatalogue: The catalogue.
+    """
+    if path is None:
+        return build_catalogue()
+    if os.path.exists(path):
+        return ActionCatalogue.load(path)
+    catalogue = build_catalogue()
+    catalogue.save(path)
+    return catalogue
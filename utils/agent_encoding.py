@@ -0,0 +1,105 @@
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from classes.agent import Observation
+from utils.action_catalogue import ActionCatalogue, get_catalogue
+from utils.bitmask import cards_to_mask
+from utils.trajectory_dataset import state_encoding
+
+
+class ObservationBatch(NamedTuple):
+    """
+    A batch of observations encoded as arrays, e.g. for scoring with a neural network.
+    """
+
+    # (B x 52) int8, 0 if the card's location is unknown, 1 if it is in the deciding
+    # player's hand and 2 if it has been played
+    state: np.ndarray
+    # (B x P) int8 cards left in each hand, starting from the deciding player's seat
+    cards_left: np.ndarray
+    # (B x A) bool legal actions over the action catalogue
+    legal: np.ndarray
+
+
+def encode_observations(
+    observations: Sequence[Observation], catalogue: Optional[ActionCatalogue] = None
+) -> ObservationBatch:
+    """
+    Encodes observations as arrays, with the same state encoding as `BatchGameEnv`
+    and `TrajectoryDataset` (see `utils.trajectory_dataset.state_encoding`).
+
+    Args:
+        observations (Sequence[Observation]): The observations. All of them must know
+            their seat and the cards left in each hand.
+        catalogue (Optional[ActionCatalogue], optional): The action catalogue the legal
+            masks are over. Defaults to the default catalogue.
+
+    Returns:
+        ObservationBatch: The encoded observations.
+    """
+    catalogue = catalogue or get_catalogue()
+    hand_masks = np.array(
+        [cards_to_mask(observation.hand) for observation in observations],
+        dtype=np.uint64,
+    )
+    played_masks = np.array(
+        [observation.played_mask for observation in observations], dtype=np.uint64
+    )
+    state = state_encoding(hand_masks, played_masks)
+
+    cards_left = np.array(
+        [
+            observation.cards_left[observation.seat :]
+            + observation.cards_left[: observation.seat]
+            for observation in observations
+        ],
+        dtype=np.int8,
+    )
+    previous_actions = np.array(
+        [
+            (
+                -1
+                if observation.last_play is None
+                else catalogue.action_id(observation.last_play)
+            )
+            for observation in observations
+        ]
+    )
+    is_first_turn = np.array(
+        [observation.is_first_turn for observation in observations], dtype=bool
+    )
+    legal = catalogue.legal_masks(hand_masks, previous_actions, is_first_turn)
+    return ObservationBatch(state, cards_left, legal)
+
+
+def choices_from_actions(
+    observations: Sequence[Observation],
+    action_ids: Sequence[int],
+    catalogue: Optional[ActionCatalogue] = None,
+) -> List[int]:
+    """
+    Converts the action ids chosen over the action catalogue (e.g. the best legal
+    action of each row of an `ObservationBatch`) to indices in each observation's
+    `legal_actions`, as returned by `Agent.decide_batch`.
+
+    Args:
+        observations (Sequence[Observation]): The observations.
+        action_ids (Sequence[int]): The legal action id chosen for each observation.
+        catalogue (Optional[ActionCatalogue], optional): The action catalogue the ids
+            are from. Defaults to the default catalogue.
+
+    Returns:
+        List[int]: The index of each chosen play in its observation's `legal_actions`.
+
+    Raises:
+        ValueError: If an action is not one of its observation's legal actions.
+    """
+    catalogue = catalogue or get_catalogue()
+    choices = []
+    for observation, action_id in zip(observations, action_ids):
+        legal_ids = [catalogue.action_id(play) for play in observation.legal_actions]
+        if action_id not in legal_ids:
+            raise ValueError(f"Action {action_id} is not legal for this observation")
+        choices.append(legal_ids.index(action_id))
+    return choices
@@ -0,0 +1,125 @@
+from typing import Iterable, Iterator, List
+
+from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
+
+# a card is encoded as rank * 4 + suit (0..51), so a higher index is always a higher
+# card and a hand is a 52-bit integer with one bit set per card held
+CARD_COUNT = len(RANK_PRIORITY) * len(SUIT_PRIORITY)
+FULL_DECK_MASK = (1 << CARD_COUNT) - 1
+
+CARD_STRINGS = [rank + suit for rank in RANK_PRIORITY for suit in SUIT_PRIORITY]
+CARD_INDICES = {card: idx for idx, card in enumerate(CARD_STRINGS)}
+
+# all four cards of a rank sit in a contiguous 4-bit nibble
+RANK_MASKS = [0b1111 << (rank * 4) for rank in range(len(RANK_PRIORITY))]
+SUIT_MASKS = [
+    sum(1 << (rank * 4 + suit) for rank in range(len(RANK_PRIORITY)))
+    for suit in range(len(SUIT_PRIORITY))
+]
+
+
+def card_to_index(card: str) -> int:
+    """
+    Converts a card string (e.g. "3d") to its integer index.
+
+    Args:
+        card (str): The card to convert.
+
+    Returns:
+        int: The card's index, rank * 4 + suit.
+    """
+    return CARD_INDICES[card]
+
+
+def index_to_card(index: int) -> str:
+    """
+    Converts a card index back to its string form.
+
+    Args:
+        index (int): The card index (0..51).
+
+    Returns:
+        str: The card string (e.g. "3d").
+    """
+    return CARD_STRINGS[index]
+
+
+def cards_to_mask(cards: Iterable[str]) -> int:
+    """
+    Converts a collection of card strings to a hand mask.
+
+    Args:
+        cards (Iterable[str]): The cards to convert.
+
+    Returns:
+        int: A 52-bit integer with the bit of each card set.
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_INDICES[card]
+    return mask
+
+
+def mask_to_indices(mask: int) -> Iterator[int]:
+    """
+    Yields the indices of the cards in a hand mask, from lowest to highest.
+
+    Args:
+        mask (int): The hand mask.
+
+    Returns:
+        Iterator[int]: The card indices in ascending order.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def mask_to_cards(mask: int) -> List[str]:
+    """
+    Converts a hand mask to a list of card strings. As card indices follow card
+    strength the list is already sorted from lowest to highest.
+
+    Args:
+        mask (int): The hand mask.
+
+    Returns:
+        List[str]: The cards in the hand, sorted.
+    """
+    return [CARD_STRINGS[idx] for idx in mask_to_indices(mask)]
+
+
+def rank_of(index: int) -> int:
+    """
+    Returns the rank (0 = 3, 12 = 2) of a card index.
+    """
+    return index >> 2
+
+
+def suit_of(index: int) -> int:
+    """
+    Returns the suit (0 = diamonds, 3 = spades) of a card index.
+    """
+    return index & 0b11
+
+
+def rank_cards(mask: int, rank: int) -> int:
+    """
+    Returns the 4-bit suit nibble of a rank in a hand mask (bit n set = suit n held).
+
+    Args:
+        mask (int): The hand mask.
+        rank (int): The rank to extract (0 = 3, 12 = 2).
+
+    Returns:
+        int: The suits held for that rank.
+    """
+    return (mask >> (rank * 4)) & 0b1111
+
+
+def card_count(mask: int) -> int:
+    """
+    Returns the number of cards in a hand mask.
+    """
+    return mask.bit_count()
@@ -1,8 +1,22 @@
-from functools import cmp_to_key
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Sequence
 
-from classes.card_set import CardSet
-from utils.constants import PLAYABLE_PRIORITY, RANK_PRIORITY, SUIT_PRIORITY
+from utils.bitmask import CARD_COUNT, CARD_INDICES
+from utils.constants import PLAYABLE_PRIORITY
+
+if TYPE_CHECKING:
+    from classes.card_set import CardSet
+
+# card -> integer strength, lowest (3d) to highest (2s); a card's strength is its
+# bitmask index so the two can be used interchangeably
+CARD_STRENGTH: Dict[str, int] = CARD_INDICES
+
+# hand type -> integer tier, lowest (single) to highest (straightflush)
+HAND_TYPE_TIER: Dict[str, int] = {
+    hand_type: tier for tier, hand_type in enumerate(PLAYABLE_PRIORITY)
+}
+
+# key given to non-playable sets (e.g. "pass"), lower than every real play
+NO_PLAY_KEY = -1
 
 
 def card_cmp(card1: str, card2: str) -> int:
@@ -16,22 +30,55 @@ def card_cmp(card1: str, card2: str) -> int:
     Returns:
         int: 1 if card1 is greater than card2, -1 if card1 is less than card2, and 0 if they are equal.
     """
-    if RANK_PRIORITY.index(card1[0]) > RANK_PRIORITY.index(card2[0]):
-        return 1
-    elif RANK_PRIORITY.index(card1[0]) < RANK_PRIORITY.index(card2[0]):
-        return -1
-    elif SUIT_PRIORITY.index(card1[1]) > SUIT_PRIORITY.index(card2[1]):
-        return 1
-    elif SUIT_PRIORITY.index(card1[1]) < SUIT_PRIORITY.index(card2[1]):
-        return -1
-    else:
-        return 0
+    strength1 = CARD_STRENGTH[card1]
+    strength2 = CARD_STRENGTH[card2]
+    return (strength1 > strength2) - (strength1 < strength2)
+
+
+card_cmp_key = CARD_STRENGTH.__getitem__
 
 
-card_cmp_key = cmp_to_key(card_cmp)
+def hand_key(hand_type: str, cards: Sequence[str]) -> int:
+    """
+    Returns a single integer sort key for a hand. For two hands with the same number of
+    cards, comparing their keys gives the same result as `play_cmp`.
+
+    The key is the hand type's tier followed by the strength of the deciding card: the
+    first card for four-of-a-kinds (the lowest card of the quartet) and the last card
+    for every other hand type.
 
+    Args:
+        hand_type (str): The type of the hand (e.g. "pair").
+        cards (Sequence[str]): The cards in the hand.
 
-def play_cmp(hand1: CardSet, hand2: CardSet) -> int:
+    Returns:
+        int: The sort key, or NO_PLAY_KEY if the hand is not a playable hand type.
+    """
+    tier = HAND_TYPE_TIER.get(hand_type)
+    if tier is None or not cards:
+        return NO_PLAY_KEY
+    if tier == 6:
+        # four-of-a-kind compare first card
+        return tier * CARD_COUNT + CARD_STRENGTH[cards[0]]
+    # all other cases (single, pair, triplet, straight, flush, full house, straight flush) compare last card
+    return tier * CARD_COUNT + CARD_STRENGTH[cards[-1]]
+
+
+def play_key(hand: "CardSet") -> int:
+    """
+    Returns the integer sort key of a CardSet (see `hand_key`), which is precomputed
+    when the CardSet is created.
+
+    Args:
+        hand (CardSet): The set of cards.
+
+    Returns:
+        int: The sort key, or NO_PLAY_KEY if the set is not a playable hand type.
+    """
+    return hand.key
+
+
+def play_cmp(hand1: "CardSet", hand2: "CardSet") -> int:
     """
     Compares two CardSet objects based on their hand type and cards.
 
@@ -42,24 +89,12 @@ def play_cmp(hand1: CardSet, hand2: CardSet) -> int:
     Returns:
         int: 1 if hand1 is greater than hand2, -1 if hand1 is less than hand2, and 0 if they are equal.
     """
-    if PLAYABLE_PRIORITY.index(hand1.hand_type) > PLAYABLE_PRIORITY.index(
-        hand2.hand_type
-    ):
-        return 1
-    elif PLAYABLE_PRIORITY.index(hand1.hand_type) < PLAYABLE_PRIORITY.index(
-        hand2.hand_type
-    ):
-        return -1
-    else:
-        if hand1.hand_type == PLAYABLE_PRIORITY[6]:
-            # four-of-a-kind compare first card
-            return card_cmp(hand1.cards[0], hand2.cards[0])
-        else:
-            # all other cases (single, pair, triplet, straight, flush, full house, straight flush) compare last card
-            return card_cmp(hand1.cards[-1], hand2.cards[-1])
-
-
-play_cmp_key = cmp_to_key(play_cmp)
+    key1 = play_key(hand1)
+    key2 = play_key(hand2)
+    return (key1 > key2) - (key1 < key2)
+
+
+play_cmp_key = play_key
 
 
 def sort_cards(cards: List[str]) -> None:
@@ -0,0 +1,122 @@
+from typing import Iterator, List, Sequence
+
+import numpy as np
+
+from utils.bitmask import CARD_COUNT, CARD_STRINGS
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_CARD_NUMBERS = np.arange(1, CARD_COUNT + 1, dtype=np.uint64)
+_CARD_STRINGS = np.array(CARD_STRINGS)
+
+
+def derive_seeds(seeds: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Vectorised `utils.simulation.derive_seed`: the splitmix64 mix of each seed and
+    index, broadcasting the two arrays against each other.
+
+    Args:
+        seeds (np.ndarray): The seeds (uint64).
+        indices (np.ndarray): The indices to derive seeds for.
+
+    Returns:
+        np.ndarray: The derived 64-bit seeds (uint64).
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    numbers = np.asarray(indices, dtype=np.uint64) + np.uint64(1)
+    with np.errstate(over="ignore"):
+        z = seeds + numbers * _GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+def deal_seats(deal_ids: np.ndarray, player_count: int = 4) -> np.ndarray:
+    """
+    Deals a batch of games at once. Deal `d` orders the deck by the random keys
+    `derive_seed(d, card)` and gives each player an equal run of the shuffled deck, so
+    a deal id always maps to the same deal.
+
+    Args:
+        deal_ids (np.ndarray): The 64-bit id of each deal (B).
+        player_count (int, optional): Number of players to deal to. Defaults to 4.
+
+    Returns:
+        np.ndarray: The seat each card is dealt to (B x 52, int8), or `player_count`
+            for cards left over when the deck does not divide equally.
+    """
+    deal_ids = np.asarray(deal_ids, dtype=np.uint64)
+    hand_size = CARD_COUNT // player_count
+    keys = derive_seeds(deal_ids[:, None], _CARD_NUMBERS[None, :] - np.uint64(1))
+    order = np.argsort(keys, axis=1)
+    seats = np.empty((len(deal_ids), CARD_COUNT), dtype=np.int8)
+    positions = np.minimum(np.arange(CARD_COUNT) // hand_size, player_count)
+    np.put_along_axis(seats, order, positions.astype(np.int8)[None, :], axis=1)
+    return seats
+
+
+def deal_batch(deal_ids: np.ndarray, player_count: int = 4) -> np.ndarray:
+    """
+    Deals a batch of games with every hand already sorted from lowest to highest card.
+
+    Args:
+        deal_ids (np.ndarray): The 64-bit id of each deal (B).
+        player_count (int, optional): Number of players to deal to. Defaults to 4.
+
+    Returns:
+        np.ndarray: The card indices of each hand (B x P x 52 // P, int8), sorted.
+    """
+    hand_size = CARD_COUNT // player_count
+    seats = deal_seats(deal_ids, player_count)
+    # a stable sort by seat keeps each seat's cards in ascending (strength) order
+    cards = np.argsort(seats, axis=1, kind="stable")[:, : hand_size * player_count]
+    return cards.reshape(len(seats), player_count, hand_size).astype(np.int8)
+
+
+def hands_to_cards(hands: np.ndarray) -> list:
+    """
+    Converts card indices (e.g. one deal or a whole batch from `deal_batch`) to nested
+    lists of card strings.
+
+    Args:
+        hands (np.ndarray): The card indices (... x N).
+
+    Returns:
+        list: The cards of each hand, nested in the same shape as `hands`.
+    """
+    return _CARD_STRINGS[hands].tolist()
+
+
+def deal_hands(deal_id: int, player_count: int) -> List[List[str]]:
+    """
+    Returns the sorted hands of the deal with the given (64-bit) deal id. The same id
+    always gives the same deal.
+
+    Args:
+        deal_id (int): The deal id.
+        player_count (int): Number of players to deal cards to.
+
+    Returns:
+        List[List[str]]: List of cards dealt to each player.
+    """
+    return hands_to_cards(deal_batch(np.array([deal_id]), player_count)[0])
+
+
+def iter_deals(
+    deal_ids: Sequence[int], player_count: int, chunk_size: int = 256
+) -> Iterator[List[List[str]]]:
+    """
+    Yields the sorted hands of each deal, dealing `chunk_size` deals at a time.
+
+    Args:
+        deal_ids (Sequence[int]): The deal ids.
+        player_count (int): Number of players to deal cards to.
+        chunk_size (int, optional): Number of deals made at once. Defaults to 256.
+
+    Returns:
+        Iterator[List[List[str]]]: The cards of each hand, for each deal in order.
+    """
+    for start in range(0, len(deal_ids), chunk_size):
+        chunk = np.array(deal_ids[start : start + chunk_size], dtype=np.uint64)
+        yield from hands_to_cards(deal_batch(chunk, player_count))
@@ -0,0 +1,173 @@
+import os
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.simulation import GameResult, PlayerFactory, iter_duplicate, iter_simulate
+
+
+class SimulationStats:
+    """
+    Running totals over a stream of game results. Stats from separate runs (e.g. one
+    per worker process) can be merged, so results never need to be kept in memory.
+    """
+
+    def __init__(self, player_count: int) -> None:
+        self.player_count = player_count
+        self.games = 0
+        self.total_turns = 0
+        self.min_turns: Optional[int] = None
+        self.max_turns: Optional[int] = None
+        self.wins = [0] * player_count
+        self.total_cards_left = [0] * player_count
+
+    def add(self, result: GameResult) -> None:
+        """
+        Adds the result of a single game to the totals.
+
+        Args:
+            result (GameResult): The result to add.
+        """
+        self.games += 1
+        self.total_turns += result.turns
+        if self.min_turns is None or result.turns < self.min_turns:
+            self.min_turns = result.turns
+        if self.max_turns is None or result.turns > self.max_turns:
+            self.max_turns = result.turns
+        self.wins[result.winner] += 1
+        for seat, cards_left in enumerate(result.cards_left):
+            self.total_cards_left[seat] += cards_left
+
+    def merge(self, other: "SimulationStats") -> None:
+        """
+        Adds the totals of another SimulationStats object to this one.
+
+        Args:
+            other (SimulationStats): The stats to merge in.
+        """
+        self.games += other.games
+        self.total_turns += other.total_turns
+        if other.min_turns is not None and (
+            self.min_turns is None or other.min_turns < self.min_turns
+        ):
+            self.min_turns = other.min_turns
+        if other.max_turns is not None and (
+            self.max_turns is None or other.max_turns > self.max_turns
+        ):
+            self.max_turns = other.max_turns
+        for seat in range(self.player_count):
+            self.wins[seat] += other.wins[seat]
+            self.total_cards_left[seat] += other.total_cards_left[seat]
+
+    @property
+    def mean_turns(self) -> float:
+        return self.total_turns / self.games if self.games else 0.0
+
+    @property
+    def win_rates(self) -> List[float]:
+        return [wins / self.games if self.games else 0.0 for wins in self.wins]
+
+    @property
+    def mean_cards_left(self) -> List[float]:
+        return [
+            cards_left / self.games if self.games else 0.0
+            for cards_left in self.total_cards_left
+        ]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "games": self.games,
+            "total_turns": self.total_turns,
+            "min_turns": self.min_turns,
+            "max_turns": self.max_turns,
+            "wins": list(self.wins),
+            "total_cards_left": list(self.total_cards_left),
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SimulationStats):
+            return False
+        return self.as_dict() == other.as_dict()
+
+
+def collect_stats(results: Iterable[GameResult], player_count: int) -> SimulationStats:
+    """
+    Aggregates a stream of game results.
+
+    Args:
+        results (Iterable[GameResult]): The results to aggregate.
+        player_count (int): Number of players in each game.
+
+    Returns:
+        SimulationStats: The aggregated stats.
+    """
+    stats = SimulationStats(player_count)
+    for result in results:
+        stats.add(result)
+    return stats
+
+
+def _run_shard(
+    args: Tuple[int, int, Sequence[PlayerFactory], Optional[int], bool],
+) -> SimulationStats:
+    first_game, n_games, player_factories, seed, duplicate = args
+    simulator = iter_duplicate if duplicate else iter_simulate
+    return collect_stats(
+        simulator(n_games, player_factories, seed, first_game),
+        len(player_factories),
+    )
+
+
+def run_farm(
+    n_games: int,
+    player_factories: Sequence[PlayerFactory],
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    shard_size: int = 100,
+    on_shard: Optional[Callable[[SimulationStats], None]] = None,
+    duplicate: bool = False,
+) -> SimulationStats:
+    """
+    Plays games in parallel across worker processes and aggregates their results.
+
+    Games are split into shards of consecutive game numbers. Every game is seeded from
+    the master seed and its game number (see `derive_seed`), so the merged stats are
+    identical to a serial `simulate` run with the same seed, whatever the number of
+    workers or shard size. Each worker only sends back the stats of its shard.
+
+    Player factories must be picklable, e.g. player classes or `functools.partial`
+    objects rather than lambdas.
+
+    Args:
+        n_games (int): Number of games to play.
+        player_factories (Sequence[PlayerFactory]): One callable per seat returning a
+            new (non-human) player.
+        seed (Optional[int], optional): The master seed. Defaults to None (unseeded).
+        workers (Optional[int], optional): Number of worker processes. Defaults to the
+            number of CPUs.
+        shard_size (int, optional): Number of games per shard. Defaults to 100.
+        on_shard (Optional[Callable[[SimulationStats], None]], optional): Called with
+            the stats of each shard as it completes, e.g. to report progress.
+        duplicate (bool, optional): Whether to play duplicate-style (see
+            `iter_duplicate`), in which case `n_games` is the number of deals and the
+            stats are by player rather than by seat. Defaults to False.
+
+    Returns:
+        SimulationStats: The stats over all games.
+    """
+    shards = [
+        (
+            first_game,
+            min(shard_size, n_games - first_game),
+            player_factories,
+            seed,
+            duplicate,
+        )
+        for first_game in range(0, n_games, shard_size)
+    ]
+    total = SimulationStats(len(player_factories))
+    with Pool(workers or os.cpu_count()) as pool:
+        for shard_stats in pool.imap_unordered(_run_shard, shards):
+            total.merge(shard_stats)
+            if on_shard is not None:
+                on_shard(shard_stats)
+    return total
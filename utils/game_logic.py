@@ -1,64 +1,122 @@
+from collections import OrderedDict
+from functools import lru_cache
 from itertools import combinations
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from classes.card_set import CardSet
+from utils.bitmask import CARD_COUNT, CARD_STRINGS, RANK_MASKS, cards_to_mask, rank_of
 from utils.constants import PLAYABLE_PRIORITY, RANK_PRIORITY, SUIT_PRIORITY
-from utils.comparison import card_cmp, play_cmp
+from utils.comparison import HAND_TYPE_TIER, NO_PLAY_KEY, play_key
+from utils.hand_analysis import HandAnalysis, analyse_hand
+
+if TYPE_CHECKING:
+    from utils.profiling import GameProfile
+
+# a hand can be given either as a list of card strings or as a 52-bit card mask
+Hand = Union[List[str], int]
+# the play generators also accept a hand's precomputed analysis
+AnalysedHand = Union[Hand, HandAnalysis]
+
+
+# the nine legal straight windows (3-7 up to J-2) as (starting rank, rank bits)
+_STRAIGHT_WINDOWS = [
+    (starting_rank, 0b11111 << starting_rank)
+    for starting_rank in range(len(RANK_PRIORITY) - 4)
+]
+# the cards of the straight flush of each window and suit
+_STRAIGHT_FLUSH_CARDS = [
+    [
+        [
+            CARD_STRINGS[rank * 4 + suit]
+            for rank in range(starting_rank, starting_rank + 5)
+        ]
+        for suit in range(len(SUIT_PRIORITY))
+    ]
+    for starting_rank, _ in _STRAIGHT_WINDOWS
+]
+# the card strings of each rank, by suit
+_SUIT_CARDS = [
+    [CARD_STRINGS[rank * 4 + suit] for rank in range(len(RANK_PRIORITY))]
+    for suit in range(len(SUIT_PRIORITY))
+]
+
+
+def _as_mask(deck: Hand) -> int:
+    if isinstance(deck, int):
+        return deck
+    return cards_to_mask(deck)
+
 
+def _analyse(deck: AnalysedHand) -> HandAnalysis:
+    if isinstance(deck, HandAnalysis):
+        return deck
+    return analyse_hand(_as_mask(deck))
 
-def _get_pairs(deck: List[str]) -> List[CardSet]:
+
+def _get_singles(deck: AnalysedHand) -> List[CardSet]:
+    """
+    Returns a list of CardSet objects representing every single card in the given deck.
+
+    Args:
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+
+    Returns:
+        List[CardSet]: A list of CardSet objects representing the single cards in the deck.
+    """
+    if not isinstance(deck, list):
+        deck = _analyse(deck).cards
+    return [CardSet(PLAYABLE_PRIORITY[0], [card]) for card in deck]
+
+
+def _get_pairs(deck: AnalysedHand) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the pairs of cards in the given deck.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the pairs of cards in the deck. Empty if there are no pairs.
     """
-    # assumes deck is sorted
-    pairs = []
-
     pairs = [
-        CardSet(PLAYABLE_PRIORITY[1], [deck[i], deck[j]])
-        for i, j in combinations(range(len(deck)), 2)
-        if deck[i][0] == deck[j][0] and i != j
+        CardSet(PLAYABLE_PRIORITY[1], list(comb))
+        for bucket in _analyse(deck).rank_cards
+        if len(bucket) >= 2
+        for comb in combinations(bucket, 2)
     ]
     return pairs
 
 
-def _get_triplets(deck: List[str]) -> List[CardSet]:
+def _get_triplets(deck: AnalysedHand) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the triplets of cards in the given deck.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the triplets of cards in the deck. Empty if there are no triplets.
     """
-    # assumes deck is sorted
-    triplets = []
-    card_ranks = [card[0] for card in deck]
-    rank_counts = [card_ranks.count(rank) for rank in RANK_PRIORITY]
-    valid_ranks = [
-        [rank, count] for rank, count in zip(RANK_PRIORITY, rank_counts) if count >= 3
+    triplets = [
+        CardSet(PLAYABLE_PRIORITY[2], list(comb))
+        for bucket in _analyse(deck).rank_cards
+        if len(bucket) >= 3
+        for comb in combinations(bucket, 3)
     ]
-    for rank, count in valid_ranks:
-        if count == 3:
-            triplets.append(
-                CardSet(
-                    PLAYABLE_PRIORITY[2], [card for card in deck if card[0] == rank]
-                )
-            )
-        else:  # count must be 4
-            combs = combinations([card for card in deck if card[0] == rank], 3)
-            for comb in combs:
-                triplets.append(CardSet(PLAYABLE_PRIORITY[2], list(comb)))
     return triplets
 
 
-def _get_straights(deck: List[str]) -> List[CardSet]:
+def _get_straights(
+    deck: AnalysedHand, min_top_rank: int = 0, flushes_only: bool = False
+) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the straights in the given deck.
 
@@ -68,40 +126,52 @@ def _get_straights(deck: List[str]) -> List[CardSet]:
     This function handles straight flushes as a special case.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+        min_top_rank (int, optional): Skip straights whose highest rank is below this rank (straight flushes are still
+            returned as they beat every straight). Defaults to 0.
+        flushes_only (bool, optional): Only return straight flushes. Defaults to False.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the straights in the deck. Empty if there are no straights.
     """
     straights = []
-    deck_ranks = sorted(
-        list(set([card[0] for card in deck])), key=lambda x: RANK_PRIORITY.index(x)
-    )
-
-    straight_starting_ranks = [
-        deck_ranks[i]
-        for i in range(len(deck_ranks) - 4)
-        if RANK_PRIORITY.index(deck_ranks[i]) + 4
-        == RANK_PRIORITY.index(deck_ranks[i + 4])
-    ]
-
-    for starting_rank in straight_starting_ranks:
-        rank_index = RANK_PRIORITY.index(starting_rank)
-        card1 = [card for card in deck if RANK_PRIORITY.index(card[0]) == rank_index]
-        card2 = [
-            card for card in deck if RANK_PRIORITY.index(card[0]) == rank_index + 1
-        ]
-        card3 = [
-            card for card in deck if RANK_PRIORITY.index(card[0]) == rank_index + 2
-        ]
-        card4 = [
-            card for card in deck if RANK_PRIORITY.index(card[0]) == rank_index + 3
-        ]
-        card5 = [
-            card for card in deck if RANK_PRIORITY.index(card[0]) == rank_index + 4
+    analysis = _analyse(deck)
+    buckets = analysis.rank_cards
+    rank_bits = analysis.rank_bits
+    suit_rank_bits = analysis.suit_rank_bits
+
+    for starting_rank, window in _STRAIGHT_WINDOWS:
+        if rank_bits & window != window:
+            continue
+        flush_suits = [
+            suit
+            for suit, suit_bits in enumerate(suit_rank_bits)
+            if suit_bits & window == window
         ]
-
-        # list comprehension reversed to preserve value order of straights (higher last card = better straight)
+        if flushes_only or starting_rank + 4 < min_top_rank:
+            # in suit order, matching the order they are found in below
+            straights.extend(
+                CardSet(
+                    PLAYABLE_PRIORITY[7], _STRAIGHT_FLUSH_CARDS[starting_rank][suit]
+                )
+                for suit in flush_suits
+            )
+            continue
+        card1, card2, card3, card4, card5 = buckets[starting_rank : starting_rank + 5]
+
+        # list comprehensions reversed to preserve value order of straights (higher last card = better straight)
+        if not flush_suits:
+            straights.extend(
+                [
+                    CardSet(PLAYABLE_PRIORITY[3], [c1, c2, c3, c4, c5])
+                    for c5 in card5
+                    for c4 in card4
+                    for c3 in card3
+                    for c2 in card2
+                    for c1 in card1
+                ]
+            )
+            continue
         straights.extend(
             [
                 (
@@ -121,136 +191,355 @@ def _get_straights(deck: List[str]) -> List[CardSet]:
     return straights
 
 
-def _get_flushes(deck: List[str]) -> List[CardSet]:
+@lru_cache(maxsize=1024)
+def _suit_flushes(
+    rank_bits: int,
+) -> Tuple[Tuple[int, Tuple[Tuple[int, ...], ...]], ...]:
+    # the flushes that can be made from a suit holding the ranks set in rank_bits, as
+    # (highest rank, the ranks of each flush with that highest rank) by ascending
+    # highest rank, with each group in colex order (i.e. ascending strength) and the
+    # straight flush of the four ranks below the highest rank left out
+    ranks = [rank for rank in range(len(RANK_PRIORITY)) if rank_bits >> rank & 1]
+    groups = []
+    for position in range(4, len(ranks)):
+        top_rank = ranks[position]
+        lower = sorted(combinations(ranks[:position], 4), key=lambda quad: quad[::-1])
+        if ranks[position - 4] == top_rank - 4:
+            # the last is always the four ranks just below
+            lower.pop()
+        groups.append((top_rank, tuple(quad + (top_rank,) for quad in lower)))
+    return tuple(groups)
+
+
+def _get_flushes(deck: AnalysedHand, min_top_card: int = 0) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the flushes in the given deck.
 
     This function intentionally omits straight flushes as it is assumed that _get_straights will be called beforehand.
+    Flushes are returned in ascending order of strength: by their highest card, then by their next highest cards.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+        min_top_card (int, optional): Skip flushes whose highest card has a lower index (card strength) than this.
+            Defaults to 0.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the flushes in the deck. Empty if there are no flushes.
     """
     flushes = []
-    # count suits, if any >=5 use combinations
-    deck_suits = [card[1] for card in deck]
-    valid_suits = [suit for suit in SUIT_PRIORITY if deck_suits.count(suit) >= 5]
-    for suit in valid_suits:
-        combs = combinations([card for card in deck if card[1] == suit], 5)
-        for comb in combs:
-            if RANK_PRIORITY.index(comb[0][0]) + 4 != RANK_PRIORITY.index(comb[4][0]):
-                # skip straight flushes
-                flushes.append(CardSet(PLAYABLE_PRIORITY[4], list(comb)))
+    # (highest card, suit, the ranks of each flush) of every flush that can be made
+    tops = []
+    for suit, suit_bits in enumerate(_analyse(deck).suit_rank_bits):
+        if suit_bits.bit_count() < 5:
+            continue
+        for top_rank, rank_sets in _suit_flushes(suit_bits):
+            top_card = top_rank * 4 + suit
+            if top_card >= min_top_card:
+                tops.append((top_card, suit, rank_sets))
+    if not tops:
+        return flushes
+    # order the suits' flushes by their highest card
+    tops.sort()
+    for _, suit, rank_sets in tops:
+        cards = _SUIT_CARDS[suit]
+        flushes.extend(
+            CardSet(
+                PLAYABLE_PRIORITY[4], [cards[a], cards[b], cards[c], cards[d], cards[e]]
+            )
+            for a, b, c, d, e in rank_sets
+        )
 
     return flushes
 
 
-def _get_full_houses(deck: List[str]) -> List[CardSet]:
+def _get_full_houses(deck: AnalysedHand, min_rank: int = 0) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the full houses in the given deck.
 
-    Full houses are stored in the CardSet as the pair followed by the triplet.
+    Full houses are stored in the CardSet as the pair followed by the triplet, and are returned in ascending order of
+    strength: by the triplet, then by the pair.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+        min_rank (int, optional): Skip full houses whose triplet is of a lower rank than this. Defaults to 0.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the full houses in the deck. Empty if there are no full houses.
     """
     full_houses = []
-    deck_ranks = [card[0] for card in deck]
+    analysis = _analyse(deck)
+    buckets = analysis.rank_cards
 
-    # only care about ranks with 2 or more cards
-    rank_counts = [
-        [rank, deck_ranks.count(rank)]
-        for rank in RANK_PRIORITY
-        if deck_ranks.count(rank) >= 2
+    rank_counts = analysis.rank_counts
+    if max(rank_counts[min_rank:], default=0) < 3:
+        return full_houses
+
+    # the pairs of each rank with 2 or more cards, worked out once
+    pairs = [
+        (rank, list(combinations(buckets[rank], 2)))
+        for rank, count in enumerate(rank_counts)
+        if count >= 2
     ]
-    for rank1, count1 in rank_counts:
-        if count1 >= 3:
-            for rank2, _ in rank_counts:
-                if rank1 != rank2:
-                    combs1 = list(
-                        combinations([card for card in deck if card[0] == rank1], 3)
-                    )
-                    combs2 = list(
-                        combinations([card for card in deck if card[0] == rank2], 2)
-                    )
-                    for comb1 in combs1:
-                        for comb2 in combs2:
-                            full_houses.append(
-                                CardSet(
-                                    PLAYABLE_PRIORITY[5],
-                                    # put triplet at end of list
-                                    list(comb2) + list(comb1),
-                                )
-                            )
+    for rank1, _ in pairs:
+        if rank1 < min_rank or rank_counts[rank1] < 3:
+            continue
+        # in ascending order of their highest card
+        for triplet in combinations(buckets[rank1], 3):
+            for rank2, combs2 in pairs:
+                if rank2 != rank1:
+                    for pair in combs2:
+                        # put triplet at end of list
+                        full_houses.append(
+                            CardSet(PLAYABLE_PRIORITY[5], pair + triplet)
+                        )
     return full_houses
 
 
-def _get_four_of_a_kinds(deck: List[str]) -> List[CardSet]:
+def _get_four_of_a_kinds(deck: AnalysedHand, min_rank: int = 0) -> List[CardSet]:
     """
     Returns a list of CardSet objects representing all the four of a kinds in the given deck.
 
-    Four of a kinds are stored in the CardSet as the quartet followed by the extra card.
+    Four of a kinds are stored in the CardSet as the quartet followed by the extra card, and are returned in ascending
+    order of strength: by the quartet, then by the extra card.
 
     Args:
-        deck (List[str]): The (sorted) list of cards in the deck.
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+        min_rank (int, optional): Skip four of a kinds whose quartet is of a lower rank than this. Defaults to 0.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the four of a kinds in the deck. Empty if there are no four of a kinds.
     """
-    deck_ranks = [card[0] for card in deck]
-    rank_counts = [[rank, deck_ranks.count(rank)] for rank in RANK_PRIORITY]
-    four_of_a_kinds = [
-        CardSet(
-            PLAYABLE_PRIORITY[6],
-            [card for card in deck if card[0] == rank] + [other_card],
+    four_of_a_kinds = []
+    analysis = _analyse(deck)
+    rank_counts = analysis.rank_counts
+    for rank in range(min_rank, len(RANK_PRIORITY)):
+        if rank_counts[rank] != 4:
+            continue
+        quartet = list(analysis.rank_cards[rank])
+        four_of_a_kinds.extend(
+            CardSet(PLAYABLE_PRIORITY[6], quartet + [other_card])
+            for other_card in analysis.cards
+            if other_card[0] != RANK_PRIORITY[rank]
         )
-        for rank, count in rank_counts
-        if count == 4
-        for other_card in deck
-        if other_card[0] != rank
-    ]
 
     return four_of_a_kinds
 
 
-def _get_five_card_hands(deck: List[str]) -> List[CardSet]:
+def _get_five_card_hands(deck: AnalysedHand) -> List[CardSet]:
     """
     Generates a list of all possible five-card hands from a given deck.
 
     Args:
-        deck (List[str]): The list of cards in the deck.
+        deck (AnalysedHand): The list of cards in the deck, its card mask or its analysis.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the five-card hands.
     """
     five_card_hands = []
+    analysis = _analyse(deck)
 
     # straights
-    five_card_hands.extend(_get_straights(deck))
+    five_card_hands.extend(_get_straights(analysis))
 
     # flushes
-    five_card_hands.extend(_get_flushes(deck))
+    five_card_hands.extend(_get_flushes(analysis))
 
     # full houses
-    five_card_hands.extend(_get_full_houses(deck))
+    five_card_hands.extend(_get_full_houses(analysis))
 
     # four of a kind plus any filler card
-    five_card_hands.extend(_get_four_of_a_kinds(deck))
+    five_card_hands.extend(_get_four_of_a_kinds(analysis))
 
     # straight flush handled in straight & flush functions
 
     return five_card_hands
 
 
+# the 3 of diamonds plus every 4, 5, 6 and 7
+_OPENING_STRAIGHT_MASK = (
+    1 | RANK_MASKS[1] | RANK_MASKS[2] | RANK_MASKS[3] | RANK_MASKS[4]
+)
+
+
+def _get_opening_plays(deck: AnalysedHand) -> List[CardSet]:
+    """
+    Generates the plays that can open a game, i.e. every play containing the 3 of
+    diamonds. Only combinations built around the 3 of diamonds are enumerated, and the
+    plays are returned in the same order as `get_valid_plays` would list them.
+
+    Args:
+        deck (AnalysedHand): The (sorted) list of cards in the deck, its card mask or its analysis.
+
+    Returns:
+        List[CardSet]: A list of CardSet objects representing the opening plays. Empty if the 3 of diamonds is not in
+            the deck.
+    """
+    analysis = _analyse(deck)
+    mask = analysis.mask
+    # the 3 of diamonds is card index 0, the lowest card of the lowest rank
+    if not mask & 1:
+        return []
+    buckets = analysis.rank_cards
+    threes = list(buckets[0])
+    other_threes = threes[1:]
+
+    plays = [CardSet(PLAYABLE_PRIORITY[0], ["3d"])]
+    plays.extend(CardSet(PLAYABLE_PRIORITY[1], ["3d", card]) for card in other_threes)
+    three_triplets = [["3d"] + list(comb) for comb in combinations(other_threes, 2)]
+    plays.extend(CardSet(PLAYABLE_PRIORITY[2], triplet) for triplet in three_triplets)
+
+    # straights must be 3-4-5-6-7 starting with the 3 of diamonds
+    plays.extend(_get_straights(mask & _OPENING_STRAIGHT_MASK))
+
+    # diamond flushes with the 3 of diamonds as their lowest card
+    diamonds = _SUIT_CARDS[0]
+    for _, rank_sets in _suit_flushes(analysis.suit_rank_bits[0]):
+        plays.extend(
+            CardSet(
+                PLAYABLE_PRIORITY[4],
+                ["3d", diamonds[b], diamonds[c], diamonds[d], diamonds[e]],
+            )
+            for a, b, c, d, e in rank_sets
+            # rank 0 held by a diamond is the 3 of diamonds
+            if a == 0
+        )
+
+    # full houses with a triplet of 3s containing the 3 of diamonds...
+    rank_counts = analysis.rank_counts
+    pair_ranks = [
+        rank for rank in range(1, len(RANK_PRIORITY)) if rank_counts[rank] >= 2
+    ]
+    for triplet in three_triplets:
+        for rank in pair_ranks:
+            for comb in combinations(buckets[rank], 2):
+                plays.append(CardSet(PLAYABLE_PRIORITY[5], list(comb) + triplet))
+    # ...or a pair of 3s containing it
+    for rank in pair_ranks:
+        if rank_counts[rank] >= 3:
+            for comb in combinations(buckets[rank], 3):
+                for card in other_threes:
+                    plays.append(
+                        CardSet(PLAYABLE_PRIORITY[5], ["3d", card] + list(comb))
+                    )
+
+    # four 3s with any other card, or any other four of a kind with the 3 of diamonds
+    if len(threes) == 4:
+        plays.extend(
+            CardSet(PLAYABLE_PRIORITY[6], threes + [card])
+            for card in analysis.cards[4:]
+        )
+    plays.extend(
+        CardSet(PLAYABLE_PRIORITY[6], list(buckets[rank]) + ["3d"])
+        for rank in range(1, len(RANK_PRIORITY))
+        if rank_counts[rank] == 4
+    )
+
+    return plays
+
+
+def _get_tier_candidates(
+    deck: AnalysedHand, tier: int, previous_key: int = NO_PLAY_KEY
+) -> List[CardSet]:
+    """
+    Generates the candidate plays of one hand type (tier) from a deck.
+
+    If the previous play is of the same hand type, candidates whose deciding card is too
+    low to beat it are skipped where the generator allows; the rest still need comparing
+    against the previous play's key. The straight tier also returns any straight
+    flushes, and the straight flush tier returns nothing else.
+
+    Args:
+        deck (AnalysedHand): The list of cards in the deck, its card mask or its analysis.
+        tier (int): The hand type's tier.
+        previous_key (int, optional): The key of the previous play. Defaults to
+            NO_PLAY_KEY.
+
+    Returns:
+        List[CardSet]: The candidate plays, in the order their generator returns them.
+    """
+    previous_tier, previous_strength = divmod(previous_key, CARD_COUNT)
+    if tier != previous_tier:
+        # no previous play of this hand type, so every play of it is a candidate
+        match tier:
+            case 0:
+                return _get_singles(deck)
+            case 1:
+                return _get_pairs(deck)
+            case 2:
+                return _get_triplets(deck)
+            case 3 | 7:
+                return _get_straights(deck, flushes_only=tier == 7)
+            case 4:
+                return _get_flushes(deck)
+            case 5:
+                return _get_full_houses(deck)
+            case _:
+                return _get_four_of_a_kinds(deck)
+
+    previous_rank = rank_of(previous_strength)
+    mask = deck.mask if isinstance(deck, HandAnalysis) else _as_mask(deck)
+    # cards below the rank of the previous play's deciding card can only be part of a
+    # winning play in a five-card hand
+    higher_ranks_mask = mask & ~((1 << (previous_rank * 4)) - 1)
+    match tier:
+        case 0:
+            return _get_singles(mask & ~((1 << (previous_strength + 1)) - 1))
+        case 1:
+            return _get_pairs(higher_ranks_mask)
+        case 2:
+            return _get_triplets(higher_ranks_mask)
+        case 3:
+            return _get_straights(deck, previous_rank)
+        case 4:
+            return _get_flushes(deck, previous_strength + 1)
+        case 5:
+            return _get_full_houses(deck, previous_rank)
+        case 6:
+            return _get_four_of_a_kinds(deck, previous_rank)
+        case _:
+            return _get_straights(deck, flushes_only=True)
+
+
+def _get_five_card_hands_beating(
+    mask: int, previous_play: CardSet, profile: Optional["GameProfile"] = None
+) -> List[CardSet]:
+    """
+    Generates the five-card hands from a card mask that beat a previous five-card play.
+
+    Hand types weaker than the previous play are never generated, and within the same
+    hand type only the candidates whose deciding card could be high enough are.
+
+    Args:
+        mask (int): The card mask of the deck.
+        previous_play (CardSet): The five-card play to beat.
+        profile (Optional[GameProfile], optional): Counts the candidates generated.
+            Defaults to None.
+
+    Returns:
+        List[CardSet]: The five-card hands that beat the previous play, in the same order
+            as `_get_five_card_hands`.
+    """
+    previous_tier = HAND_TYPE_TIER[previous_play.hand_type]
+    previous_key = play_key(previous_play)
+    analysis = analyse_hand(mask)
+
+    # only straight flushes can still win out of the straights once they are beaten
+    five_card_hands = _get_tier_candidates(
+        analysis, 3 if previous_tier <= 3 else 7, previous_key
+    )
+    for tier in range(max(previous_tier, 4), 7):
+        five_card_hands.extend(_get_tier_candidates(analysis, tier, previous_key))
+
+    if profile is not None:
+        profile.count("candidates_generated", len(five_card_hands))
+    return [play for play in five_card_hands if play.key > previous_key]
+
+
 def get_valid_plays(
-    deck: List[str],
+    deck: Hand,
     previous_play: Optional[CardSet] = None,
     is_starting_hand: bool = False,
+    profile: Optional["GameProfile"] = None,
 ) -> List[CardSet]:
     """
     Generates a list of valid plays from a deck, given the game state (previous play or if it is a new game or round).
@@ -262,55 +551,264 @@ def get_valid_plays(
     If it is the starting hand of a round or game there is no option to pass.
 
     Args:
-        deck (List[str]): The list of cards in the deck.
+        deck (Hand): The list of cards in the deck, or its card mask.
         previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
         is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+        profile (Optional[GameProfile], optional): Counts the candidate plays generated
+            and the valid plays kept. Defaults to None.
 
     Returns:
         List[CardSet]: A list of CardSet objects representing the valid plays.
     """
     # plays must have same number of cards as previous play
     if previous_play is not None:
+        mask = _as_mask(deck)
         required_length = len(previous_play.cards)
+        # a single integer key per play, so filtering is a plain integer comparison
+        previous_key = play_key(previous_play)
         plays = []
         match required_length:
             case 1:
-                plays = [
-                    CardSet(PLAYABLE_PRIORITY[0], [card])
-                    for card in deck
-                    if card_cmp(card, previous_play.cards[0]) > 0
-                ]
+                # only singles higher than the previous play are generated
+                plays = _get_tier_candidates(mask, 0, previous_key)
+                if profile is not None:
+                    profile.count("candidates_generated", len(plays))
             case 2:
                 # identify pairs in hand that are higher than previous play
-                pairs = _get_pairs(deck)
+                pairs = _get_tier_candidates(mask, 1, previous_key)
+                if profile is not None:
+                    profile.count("candidates_generated", len(pairs))
                 # pairs only compare the higher card of the two to determine which is higher
                 # i.e. 7D + 7S beats 7C + 7H
-                plays = [pair for pair in pairs if play_cmp(pair, previous_play) > 0]
+                plays = [pair for pair in pairs if pair.key > previous_key]
             case 3:
                 # identify triplets in hand that are higher than previous play
-                triplets = _get_triplets(deck)
+                triplets = _get_tier_candidates(mask, 2, previous_key)
+                if profile is not None:
+                    profile.count("candidates_generated", len(triplets))
                 # cannot compare triplets of the same rank so just compare first card of each
-                plays = [
-                    triplet
-                    for triplet in triplets
-                    if play_cmp(triplet, previous_play) > 0
-                ]
+                plays = [triplet for triplet in triplets if triplet.key > previous_key]
             case 5:
-                fives = _get_five_card_hands(deck)
                 # identify 5-card combinations in hand that are higher than previous play
-                # use separate comparator for 5-card combinations
-                plays = [five for five in fives if play_cmp(five, previous_play) > 0]
+                plays = _get_five_card_hands_beating(mask, previous_play, profile)
 
+        if profile is not None:
+            profile.count("candidates_kept", len(plays))
         plays.append(CardSet("pass", []))
         return plays
     else:
-        plays = []
-        for card in deck:
-            plays.append(CardSet(PLAYABLE_PRIORITY[0], [card]))
-        plays.extend(_get_pairs(deck))
-        plays.extend(_get_triplets(deck))
-        plays.extend(_get_five_card_hands(deck))
+        # analyse the hand once for every generator
+        analysis = _analyse(deck)
         if is_starting_hand:
-            # TODO: make this more efficient (skip finding hands that don't contain the 3 of diamonds in the first place)
-            plays = [play for play in plays if "3d" in play.cards]
+            # only plays containing the 3 of diamonds can open the game
+            plays = _get_opening_plays(analysis)
+        else:
+            plays = _get_singles(analysis)
+            plays.extend(_get_pairs(analysis))
+            plays.extend(_get_triplets(analysis))
+            plays.extend(_get_five_card_hands(analysis))
+        if profile is not None:
+            # every play generated is valid when not responding
+            profile.count("candidates_generated", len(plays))
+            profile.count("candidates_kept", len(plays))
         return plays
+
+
+# number of cards in each hand type, by tier
+_TIER_SIZES = [1, 2, 3, 5, 5, 5, 5, 5]
+# the tiers generated together by _get_straights
+_STRAIGHT_TIERS = (3, 7)
+
+
+def iter_valid_plays(
+    deck: Hand,
+    previous_play: Optional[CardSet] = None,
+    is_starting_hand: bool = False,
+) -> Iterator[CardSet]:
+    """
+    Lazily yields the valid plays from a deck in ascending order of strength, following
+    the same rules as `get_valid_plays`. If passing is allowed it is yielded last.
+
+    Each hand type is only generated once the plays of the weaker hand types have all
+    been consumed, so callers that stop early (e.g. after the weakest play) skip
+    generating the stronger hand types entirely.
+
+    Args:
+        deck (Hand): The list of cards in the deck, or its card mask.
+        previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
+        is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+
+    Returns:
+        Iterator[CardSet]: The valid plays, weakest first.
+    """
+    analysis = _analyse(deck)
+
+    if previous_play is None:
+        tiers = range(len(PLAYABLE_PRIORITY))
+        previous_key = NO_PLAY_KEY
+    else:
+        # only hand types with the same number of cards that are not weaker
+        required_length = len(previous_play.cards)
+        tiers = [
+            tier
+            for tier in range(HAND_TYPE_TIER[previous_play.hand_type], len(_TIER_SIZES))
+            if _TIER_SIZES[tier] == required_length
+        ]
+        previous_key = play_key(previous_play)
+
+    # straights and straight flushes are generated together, so keep them for both tiers
+    straights: Optional[List[CardSet]] = None
+    for tier in tiers:
+        if tier in _STRAIGHT_TIERS:
+            if straights is None:
+                straights = _get_tier_candidates(analysis, tier, previous_key)
+            plays = [
+                play for play in straights if HAND_TYPE_TIER[play.hand_type] == tier
+            ]
+        else:
+            plays = _get_tier_candidates(analysis, tier, previous_key)
+        plays.sort(key=play_key)
+        for play in plays:
+            if play.key <= previous_key:
+                continue
+            if is_starting_hand and "3d" not in play.cards:
+                continue
+            yield play
+
+    if previous_play is not None:
+        yield CardSet("pass", [])
+
+
+def first_beating(deck: Hand, previous_play: Optional[CardSet]) -> Optional[CardSet]:
+    """
+    Returns the weakest play from a deck that beats the previous play, generating as
+    few candidate plays as possible.
+
+    Args:
+        deck (Hand): The list of cards in the deck, or its card mask.
+        previous_play (Optional[CardSet]): The previous play, or None for the weakest play
+            of any type.
+
+    Returns:
+        Optional[CardSet]: The weakest valid play, or None if there is none.
+    """
+    play = next(iter_valid_plays(deck, previous_play), None)
+    if play is None or play.hand_type == "pass":
+        return None
+    return play
+
+
+class PlayCache:
+    """
+    A bounded least-recently-used cache of `get_valid_plays` results, shared across
+    players and games.
+
+    Entries are keyed on the hand's card mask, the previous play's key and whether it
+    is the starting hand. When responding to a single, pair or triplet only the cards
+    that could beat the previous play are kept in the key, so hands that differ only in
+    lower cards share an entry. The cache holds at most `max_entries` entries and
+    `max_plays` plays in total (CardSet objects are interned, so each cached play costs
+    one reference), evicting the least recently used entries first.
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_plays: int = 2_000_000) -> None:
+        self.max_entries = max_entries
+        self.max_plays = max_plays
+        self._entries: "OrderedDict[Tuple[int, int, bool], Tuple[CardSet, ...]]" = (
+            OrderedDict()
+        )
+        # number of plays held over all entries
+        self.plays = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the stats.
+        """
+        self._entries.clear()
+        self.plays = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "plays": self.plays,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get_valid_plays(
+        self,
+        deck: Hand,
+        previous_play: Optional[CardSet] = None,
+        is_starting_hand: bool = False,
+    ) -> List[CardSet]:
+        """
+        Returns `get_valid_plays(deck, previous_play, is_starting_hand)`, from the cache
+        if the same situation has been seen before.
+
+        Args:
+            deck (Hand): The list of cards in the deck, or its card mask.
+            previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
+            is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+
+        Returns:
+            List[CardSet]: A new list of the valid plays.
+        """
+        mask = _as_mask(deck)
+        if previous_play is None:
+            previous_key = NO_PLAY_KEY
+        else:
+            previous_key = play_key(previous_play)
+            match len(previous_play.cards):
+                case 1:
+                    mask &= ~((1 << (previous_key % CARD_COUNT + 1)) - 1)
+                case 2 | 3:
+                    mask &= ~((1 << (rank_of(previous_key % CARD_COUNT) * 4)) - 1)
+        key = (mask, previous_key, is_starting_hand)
+
+        entries = self._entries
+        plays = entries.get(key)
+        if plays is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return list(plays)
+
+        self.misses += 1
+        valid_plays = get_valid_plays(mask, previous_play, is_starting_hand)
+        if len(valid_plays) <= self.max_plays:
+            entries[key] = tuple(valid_plays)
+            self.plays += len(valid_plays)
+            while len(entries) > self.max_entries or self.plays > self.max_plays:
+                _, evicted = entries.popitem(last=False)
+                self.plays -= len(evicted)
+                self.evictions += 1
+        return valid_plays
+
+
+# the cache shared by every player using one
+PLAY_CACHE = PlayCache()
+
+
+def get_valid_plays_cached(
+    deck: Hand,
+    previous_play: Optional[CardSet] = None,
+    is_starting_hand: bool = False,
+) -> List[CardSet]:
+    """
+    `get_valid_plays` through the shared PLAY_CACHE.
+
+    Args:
+        deck (Hand): The list of cards in the deck, or its card mask.
+        previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
+        is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+
+    Returns:
+        List[CardSet]: A list of CardSet objects representing the valid plays.
+    """
+    return PLAY_CACHE.get_valid_plays(deck, previous_play, is_starting_hand)
@@ -0,0 +1,503 @@
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from classes.agent import Agent, Observation
+from classes.card_set import CardSet
+from classes.game import Game
+from classes.player import Player, RandomAIPlayer
+from utils.dealing import deal_hands
+from utils.profiling import GameProfile
+from utils.simulation import GameResult, PlayerFactory, derive_seed, seed_players
+
+# Protocol: every message is a JSON object on its own line.
+#   client -> server:
+#     {"type": "join"}                       asks for a seat at the next open table
+#     {"type": "play", "index": i}           the index of the chosen option (-1 passes)
+#   server -> client:
+#     {"type": "seated", "table": t, "seat": s}
+#     {"type": "turn", ...}                  the seat's observation (see `_turn_message`)
+#     {"type": "error", "message": m}        the last message was not valid
+#     {"type": "played", "seat": s, "play": [hand type, cards]}
+#     {"type": "game_over", "winner": s, "cards_left": [...]}
+#     {"type": "table_closed", "reason": r}  no more games will be played at the table
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _play_message(play: Optional[CardSet]) -> Optional[list]:
+    if play is None:
+        return None
+    return [play.hand_type, list(play.cards)]
+
+
+def _play_from_message(play: Optional[list]) -> Optional[CardSet]:
+    if play is None:
+        return None
+    return CardSet(play[0], play[1])
+
+
+def _turn_message(observation: Observation) -> Dict[str, object]:
+    return {
+        "type": "turn",
+        "seat": observation.seat,
+        "hand": list(observation.hand),
+        "last_play": _play_message(observation.last_play),
+        "cards_left": list(observation.cards_left),
+        "played_mask": observation.played_mask,
+        "options": [_play_message(play) for play in observation.legal_actions],
+        "is_first_turn": observation.is_first_turn,
+    }
+
+
+def observation_from_message(message: Dict[str, object]) -> Observation:
+    """
+    Rebuilds the observation sent in a "turn" message.
+
+    Args:
+        message (Dict[str, object]): The decoded "turn" message.
+
+    Returns:
+        Observation: The deciding seat's observation.
+    """
+    return Observation(
+        message["seat"],
+        tuple(message["hand"]),
+        _play_from_message(message["last_play"]),
+        tuple(message["cards_left"]),
+        message["played_mask"],
+        [_play_from_message(play) for play in message["options"]],
+        message["is_first_turn"],
+    )
+
+
+async def _send(writer: asyncio.StreamWriter, message: Dict[str, object]) -> None:
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> Dict[str, object]:
+    # raises ValueError for a line over the reader's limit, or one that is not UTF-8
+    # encoded JSON
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    return json.loads(line)
+
+
+class RemotePlayer(Player):
+    """
+    A seat taken by a client connected to the server. Its decisions arrive over the
+    connection (see `Table`), so `decide` cannot be called directly.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        super().__init__()
+        self.reader = reader
+        self.writer = writer
+
+    def decide(self, observation: Observation) -> int:
+        raise RuntimeError("Remote players decide over their connection")
+
+    def player_type(self) -> str:
+        return "Remote"
+
+
+class Table:
+    """
+    A table of the server, playing one or more games with the rules and state of a
+    `Game`. Seats without a factory are taken by connecting clients, and the game
+    starts once all of them are taken.
+
+    Each table keeps its own `GameProfile`, which also collects the game's move
+    generation timings, with:
+        - counters: "games", "decisions", "remote_decisions", "invalid_messages"
+        - timers: "remote_latency" (from sending a turn until a valid play arrives)
+          and "ai_decision"
+    """
+
+    def __init__(
+        self,
+        table_id: int,
+        seat_factories: Sequence[Optional[PlayerFactory]],
+        seed: int,
+        games: int = 1,
+    ) -> None:
+        """
+        Args:
+            table_id (int): The table's id.
+            seat_factories (Sequence[Optional[PlayerFactory]]): One callable per seat
+                returning an AI player, or None for a seat taken by a client.
+            seed (int): Seed for the table's deals and AI players.
+            games (int, optional): Number of games to play. Defaults to 1.
+        """
+        self.table_id = table_id
+        self.seed = seed
+        self.games = games
+        self.profile = GameProfile()
+        self.players: List[Optional[Player]] = [
+            None if factory is None else factory() for factory in seat_factories
+        ]
+        self.results: List[GameResult] = []
+        self.closed_reason: Optional[str] = None
+        self.finished = asyncio.Event()
+        # perf_counter() values when the first game started and the last one ended
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+
+    @property
+    def open_seats(self) -> List[int]:
+        return [seat for seat, player in enumerate(self.players) if player is None]
+
+    def take_seat(self, player: RemotePlayer) -> int:
+        """
+        Seats a connected client in the first open seat.
+
+        Args:
+            player (RemotePlayer): The client's player.
+
+        Returns:
+            int: The seat taken.
+        """
+        seat = self.open_seats[0]
+        self.players[seat] = player
+        return seat
+
+    def _remote_players(self) -> List[RemotePlayer]:
+        return [player for player in self.players if isinstance(player, RemotePlayer)]
+
+    async def _broadcast(self, message: Dict[str, object]) -> None:
+        for player in self._remote_players():
+            try:
+                await _send(player.writer, message)
+            except ConnectionError:
+                # the player's own turn will notice the closed connection
+                pass
+
+    async def _remote_decision(
+        self, player: RemotePlayer, observation: Observation
+    ) -> int:
+        start = perf_counter()
+        await _send(player.writer, _turn_message(observation))
+        option_count = len(observation.legal_actions)
+        can_pass = (
+            option_count > 0 and observation.legal_actions[-1].hand_type == "pass"
+        )
+        while True:
+            try:
+                message = await _receive(player.reader)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                message = {}
+            index = message.get("index") if message.get("type") == "play" else None
+            # bool is a subclass of int, but true and false are not indices
+            if (
+                isinstance(index, int)
+                and not isinstance(index, bool)
+                and (0 <= index < option_count or (index == -1 and can_pass))
+            ):
+                break
+            self.profile.count("invalid_messages")
+            await _send(player.writer, {"type": "error", "message": "Invalid play"})
+        self.profile.add_time("remote_latency", start)
+        self.profile.count("remote_decisions")
+        return index
+
+    async def _play_game(self, game_number: int) -> GameResult:
+        game = Game(self.players, self.profile)
+        seed_players(game.players, derive_seed(self.seed, game_number))
+        game.start_new_game(
+            deal_hands(derive_seed(self.seed, game_number), len(self.players)),
+            hands_sorted=True,
+        )
+        turns = 0
+        while True:
+            player = game.get_current_player()
+            observation = game.observe()
+            if isinstance(player, RemotePlayer):
+                choice = await self._remote_decision(player, observation)
+            else:
+                start = perf_counter()
+                choice = player.decide(observation)
+                self.profile.add_time("ai_decision", start)
+                # let the other tables run between AI decisions
+                await asyncio.sleep(0)
+            played_set = player.play_card_set_by_index(choice)
+            turns += 1
+            self.profile.count("decisions")
+            await self._broadcast(
+                {
+                    "type": "played",
+                    "seat": game.current_player_index,
+                    "play": _play_message(played_set),
+                }
+            )
+            if game.did_player_win(played_set):
+                break
+            game.next_player(played_set)
+
+        result = GameResult(
+            game.current_player_index,
+            turns,
+            tuple(len(player.hand) for player in game.players),
+        )
+        await self._broadcast(
+            {
+                "type": "game_over",
+                "winner": result.winner,
+                "cards_left": list(result.cards_left),
+            }
+        )
+        return result
+
+    async def run(self) -> None:
+        """
+        Plays the table's games, then notifies and disconnects its clients. If a
+        client disconnects the table is closed early.
+        """
+        self.started_at = perf_counter()
+        try:
+            for game_number in range(self.games):
+                self.results.append(await self._play_game(game_number))
+            self.closed_reason = "finished"
+        except ConnectionError:
+            self.closed_reason = "player_disconnected"
+        finally:
+            self.ended_at = perf_counter()
+            await self._broadcast(
+                {"type": "table_closed", "reason": self.closed_reason}
+            )
+            for player in self._remote_players():
+                player.writer.close()
+            self.finished.set()
+
+    def metrics(self) -> Dict[str, object]:
+        """
+        Returns the table's latency and throughput metrics.
+
+        Returns:
+            Dict[str, object]: The number of games played and decisions made, the
+                decisions per second since the first game started, the mean and
+                total remote latency and AI decision times (in seconds), and the full
+                profile.
+        """
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.ended_at or perf_counter()) - self.started_at
+        decisions = self.profile.counters.get("decisions", 0)
+        return {
+            "games": len(self.results),
+            "decisions": decisions,
+            "seconds": elapsed,
+            "decisions_per_second": decisions / elapsed if elapsed else 0.0,
+            "mean_remote_latency": self.profile.mean_time("remote_latency"),
+            "mean_ai_decision": self.profile.mean_time("ai_decision"),
+            "closed_reason": self.closed_reason,
+            "profile": self.profile.as_dict(),
+        }
+
+
+class GameServer:
+    """
+    Hosts many tables in one process over a local TCP socket, with asyncio so that a
+    slow client only holds up its own table. Clients send a "join" message and are
+    seated at the first table with an open seat (a new table is opened when there is
+    none); the table starts playing once all its client seats are taken. AI seats
+    decide in between, yielding to the other tables after every decision.
+    """
+
+    def __init__(
+        self,
+        seat_factories: Sequence[Optional[PlayerFactory]],
+        games_per_table: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            seat_factories (Sequence[Optional[PlayerFactory]]): One callable per seat
+                returning an AI player, or None for a seat taken by a client. At least
+                one seat must be taken by a client.
+            games_per_table (int, optional): Number of games played at each table.
+                Defaults to 1.
+            seed (Optional[int], optional): The master seed; table `t` is seeded with
+                `derive_seed(seed, t)`. Defaults to None (unseeded).
+
+        Raises:
+            ValueError: If no seat is taken by a client.
+        """
+        if all(factory is not None for factory in seat_factories):
+            raise ValueError("At least one seat must be taken by a client")
+        self.seat_factories = list(seat_factories)
+        self.games_per_table = games_per_table
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.tables: List[Table] = []
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> Tuple[str, int]:
+        """
+        Starts listening for clients.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to 127.0.0.1.
+            port (int, optional): The port to listen on, 0 for any free port. Defaults
+                to 8765.
+
+        Returns:
+            Tuple[str, int]: The address and port being listened on.
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """
+        Stops listening and waits for the tables being played to finish. A table that
+        failed does not stop the others from being waited for.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _open_table(self) -> Table:
+        for table in self.tables:
+            if table.open_seats:
+                return table
+        table_id = len(self.tables)
+        table = Table(
+            table_id,
+            self.seat_factories,
+            derive_seed(self.seed, table_id),
+            self.games_per_table,
+        )
+        self.tables.append(table)
+        return table
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            message = await _receive(reader)
+        except ConnectionError:
+            writer.close()
+            return
+        except ValueError:
+            message = None
+        if not isinstance(message, dict) or message.get("type") != "join":
+            await _send(writer, {"type": "error", "message": "Expected join"})
+            writer.close()
+            return
+
+        table = self._open_table()
+        seat = table.take_seat(RemotePlayer(reader, writer))
+        await _send(writer, {"type": "seated", "table": table.table_id, "seat": seat})
+        if not table.open_seats:
+            self._tasks.append(asyncio.create_task(table.run()))
+        # the table reads the client's messages from here on
+        await table.finished.wait()
+
+    def metrics(self) -> Dict[int, Dict[str, object]]:
+        """
+        Returns the metrics of every table (see `Table.metrics`), by table id.
+        """
+        return {table.table_id: table.metrics() for table in self.tables}
+
+
+class LocalClient:
+    """
+    A client that joins a server's table and plays with an agent, standing in for a
+    human's front end in tests and load checks.
+    """
+
+    def __init__(self, agent: Agent, delay: float = 0.0) -> None:
+        """
+        Args:
+            agent (Agent): The agent making the client's decisions.
+            delay (float, optional): Seconds to wait before answering each turn, to
+                act like a slow human. Defaults to 0.
+        """
+        self.agent = agent
+        self.delay = delay
+        self.table: Optional[int] = None
+        self.seat: Optional[int] = None
+        # every message received from the server
+        self.messages: List[Dict[str, object]] = []
+
+    async def play(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> str:
+        """
+        Connects, joins a table and plays until the table closes.
+
+        Args:
+            host (str, optional): The server's address. Defaults to 127.0.0.1.
+            port (int, optional): The server's port. Defaults to 8765.
+
+        Returns:
+            str: The reason the table closed.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await _send(writer, {"type": "join"})
+            while True:
+                message = await _receive(reader)
+                self.messages.append(message)
+                if message["type"] == "seated":
+                    self.table = message["table"]
+                    self.seat = message["seat"]
+                elif message["type"] == "turn":
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    index = self.agent.decide(observation_from_message(message))
+                    await _send(writer, {"type": "play", "index": index})
+                elif message["type"] == "table_closed":
+                    return message["reason"]
+        finally:
+            writer.close()
+
+    @property
+    def results(self) -> List[Dict[str, object]]:
+        """
+        The "game_over" messages received, one per game played.
+        """
+        return [message for message in self.messages if message["type"] == "game_over"]
+
+
+async def _serve(host: str, port: int, clients: int, games: int) -> None:
+    seat_factories = [None] * clients + [RandomAIPlayer] * (4 - clients)
+    server = GameServer(seat_factories, games)
+    host, port = await server.start(host, port)
+    print(f"Serving Big Two on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Host Big Two tables for clients connecting over TCP."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--clients", type=int, default=1, help="client seats per table (1-4)"
+    )
+    parser.add_argument("--games", type=int, default=1, help="games per table")
+    args = parser.parse_args()
+    if not 1 <= args.clients <= 4:
+        parser.error("--clients must be between 1 and 4")
+    asyncio.run(_serve(args.host, args.port, args.clients, args.games))
+
+
+if __name__ == "__main__":
+    main()
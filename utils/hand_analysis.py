@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+from utils.bitmask import CARD_STRINGS
+from utils.constants import RANK_PRIORITY, SUIT_PRIORITY
+
+RANK_COUNT = len(RANK_PRIORITY)
+SUIT_COUNT = len(SUIT_PRIORITY)
+
+# the cards of each rank for every 4-bit suit nibble, e.g. _NIBBLE_CARDS[0][0b0101]
+# is ("3d", "3h")
+_NIBBLE_CARDS = [
+    [
+        tuple(
+            CARD_STRINGS[rank * 4 + suit]
+            for suit in range(SUIT_COUNT)
+            if nibble >> suit & 1
+        )
+        for nibble in range(1 << SUIT_COUNT)
+    ]
+    for rank in range(RANK_COUNT)
+]
+_NIBBLE_SUITS = [
+    tuple(suit for suit in range(SUIT_COUNT) if nibble >> suit & 1)
+    for nibble in range(1 << SUIT_COUNT)
+]
+
+
+class HandAnalysis:
+    """
+    Everything the play generators need to know about a hand, derived from its card
+    mask in a single pass so the generators never rescan the hand.
+
+    Analyses are shared between callers (see `analyse_hand`, which caches them by
+    mask), so they must never be modified.
+    """
+
+    __slots__ = (
+        "mask",
+        "cards",
+        "rank_cards",
+        "rank_counts",
+        "rank_bits",
+        "suit_rank_bits",
+    )
+
+    def __init__(self, mask: int) -> None:
+        # the hand's card mask
+        self.mask = mask
+        # every card, sorted from lowest to highest
+        self.cards: List[str] = []
+        # the cards of each rank, lowest suit first
+        self.rank_cards: List[Tuple[str, ...]] = []
+        # the number of cards of each rank
+        self.rank_counts: List[int] = []
+        # bit n set if at least one card of rank n is held
+        self.rank_bits = 0
+        # bit n set if the card of rank n is held, for each suit
+        suit_rank_bits = [0] * SUIT_COUNT
+
+        for rank in range(RANK_COUNT):
+            nibble = mask >> (rank * 4) & 0b1111
+            cards = _NIBBLE_CARDS[rank][nibble]
+            self.rank_cards.append(cards)
+            self.rank_counts.append(len(cards))
+            if nibble:
+                self.cards.extend(cards)
+                self.rank_bits |= 1 << rank
+                for suit in _NIBBLE_SUITS[nibble]:
+                    suit_rank_bits[suit] |= 1 << rank
+        self.suit_rank_bits = tuple(suit_rank_bits)
+
+
+@lru_cache(maxsize=4096)
+def analyse_hand(mask: int) -> HandAnalysis:
+    """
+    Returns the (cached) analysis of a hand.
+
+    Args:
+        mask (int): The hand's card mask.
+
+    Returns:
+        HandAnalysis: The analysis.
+    """
+    return HandAnalysis(mask)
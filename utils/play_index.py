@@ -0,0 +1,110 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+from classes.card_set import CardSet
+from utils.bitmask import CARD_INDICES, mask_to_indices
+from utils.comparison import play_key
+from utils.game_logic import Hand, get_valid_plays
+
+
+class PlayIndex:
+    """
+    An index of every combination that can be played from a hand, built once when the
+    hand is dealt and kept up to date as cards leave it.
+
+    Playing cards only touches the combinations containing those cards, and the plays
+    available on a turn are answered by filtering the surviving combinations rather than
+    regenerating them. Plays are returned in the same order as `get_valid_plays`.
+    """
+
+    def __init__(self, hand: Hand) -> None:
+        # every play available from the full hand, in get_valid_plays order
+        self._plays = get_valid_plays(hand)
+        self._keys = [play.key for play in self._plays]
+        self._alive = [True] * len(self._plays)
+        # ids of the plays still available, in get_valid_plays order
+        self._live_ids = list(range(len(self._plays)))
+
+        # live play ids grouped by the number of cards in the play, sorted by key (ties
+        # in id order), with their keys alongside for bisecting
+        self._ids_by_size: Dict[int, List[int]] = {}
+        self._keys_by_size: Dict[int, List[int]] = {}
+        # play ids grouped by each card index they contain
+        self._ids_by_card: Dict[int, List[int]] = {}
+        for play_id in sorted(self._live_ids, key=self._keys.__getitem__):
+            size = len(self._plays[play_id].cards)
+            self._ids_by_size.setdefault(size, []).append(play_id)
+            self._keys_by_size.setdefault(size, []).append(self._keys[play_id])
+        for play_id, play in enumerate(self._plays):
+            for card_index in mask_to_indices(play.mask):
+                self._ids_by_card.setdefault(card_index, []).append(play_id)
+
+    def __len__(self) -> int:
+        return len(self._live_ids)
+
+    def remove_cards(self, cards: Iterable[str]) -> None:
+        """
+        Removes every combination containing any of the given cards from the index.
+
+        Args:
+            cards (Iterable[str]): The cards that have left the hand.
+        """
+        for card in cards:
+            for play_id in self._ids_by_card.pop(CARD_INDICES[card], ()):
+                if self._alive[play_id]:
+                    self._alive[play_id] = False
+                    self._remove_play(play_id)
+
+    def _remove_play(self, play_id: int) -> None:
+        """
+        Drops a play from the live lists, finding it by bisecting rather than scanning.
+        """
+        live_ids = self._live_ids
+        del live_ids[bisect_left(live_ids, play_id)]
+
+        key = self._keys[play_id]
+        size = len(self._plays[play_id].cards)
+        ids = self._ids_by_size[size]
+        keys = self._keys_by_size[size]
+        # plays with the same key are in id order
+        position = bisect_left(
+            ids, play_id, bisect_left(keys, key), bisect_right(keys, key)
+        )
+        del ids[position]
+        del keys[position]
+
+    def get_plays(
+        self, previous_play: Optional[CardSet] = None, is_starting_hand: bool = False
+    ) -> List[CardSet]:
+        """
+        Returns the plays still available from the hand, with the same rules and
+        ordering as `get_valid_plays`.
+
+        Args:
+            previous_play (Optional[CardSet], optional): The previous play. Defaults to None.
+            is_starting_hand (bool, optional): Whether or not this is the starting hand. Defaults to False.
+
+        Returns:
+            List[CardSet]: A list of CardSet objects representing the valid plays.
+        """
+        plays = self._plays
+        if previous_play is not None:
+            size = len(previous_play.cards)
+            ids = self._ids_by_size.get(size, [])
+            start = bisect_right(
+                self._keys_by_size.get(size, []), play_key(previous_play)
+            )
+            # back to get_valid_plays order, which is not always sorted by key
+            valid_plays = [plays[play_id] for play_id in sorted(ids[start:])]
+            valid_plays.append(CardSet("pass", []))
+            return valid_plays
+
+        if is_starting_hand:
+            # the 3 of diamonds is card index 0
+            alive = self._alive
+            return [
+                plays[play_id]
+                for play_id in self._ids_by_card.get(0, ())
+                if alive[play_id]
+            ]
+        return [plays[play_id] for play_id in self._live_ids]
@@ -0,0 +1,94 @@
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+class GameProfile:
+    """
+    Counters and cumulative timers collected while games are played, to see how time
+    splits between dealing, move generation, decisions and bookkeeping.
+
+    Profiling is opt-in: pass a GameProfile to `Game` (or `simulate`) and it is shared
+    with the game's players. When no profile is given the instrumented code only pays
+    for a `None` check.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        # per timer: number of timed calls and their total time in seconds
+        self.timers: Dict[str, List[float]] = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The counter.
+            amount (int, optional): The amount to add. Defaults to 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, start: float) -> None:
+        """
+        Records a call to a timer that started at `start` and ends now.
+
+        Args:
+            name (str): The timer.
+            start (float): The `time.perf_counter()` value when the call started.
+        """
+        elapsed = perf_counter() - start
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, elapsed]
+        else:
+            timer[0] += 1
+            timer[1] += elapsed
+
+    def calls(self, name: str) -> int:
+        return int(self.timers[name][0]) if name in self.timers else 0
+
+    def total_time(self, name: str) -> float:
+        return self.timers[name][1] if name in self.timers else 0.0
+
+    def mean_time(self, name: str) -> Optional[float]:
+        calls = self.calls(name)
+        return self.total_time(name) / calls if calls else None
+
+    def merge(self, other: "GameProfile") -> None:
+        """
+        Adds the counters and timers of another profile (e.g. from another worker) to
+        this one.
+
+        Args:
+            other (GameProfile): The profile to merge in.
+        """
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for name, (calls, seconds) in other.timers.items():
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += calls
+            timer[1] += seconds
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "counters": dict(self.counters),
+            "timers": {
+                name: {"calls": int(calls), "seconds": seconds}
+                for name, (calls, seconds) in self.timers.items()
+            },
+        }
+
+    def report(self) -> str:
+        """
+        Formats the profile as a table, timers first (slowest total first).
+        """
+        lines = []
+        for name, (calls, seconds) in sorted(
+            self.timers.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                f"{name:<32} {int(calls):>10} calls {seconds:>10.3f} s"
+                f" {seconds / calls * 1e6:>10.1f} us/call"
+            )
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"{name:<32} {amount:>10}")
+        return "\n".join(lines)
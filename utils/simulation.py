@@ -0,0 +1,326 @@
+import random
+from time import perf_counter
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from classes.agent import Agent
+from classes.game import Game
+from classes.player import AgentPlayer, Player
+from utils.dealing import deal_hands, iter_deals
+from utils.profiling import GameProfile
+
+PlayerFactory = Callable[[], Player]
+
+_MASK_64 = (1 << 64) - 1
+# number of games dealt at once
+_DEAL_CHUNK = 256
+
+
+class GameResult(NamedTuple):
+    """
+    The compact outcome of a single simulated game.
+    """
+
+    # seat index of the winning player
+    winner: int
+    # number of decisions made (plays and passes)
+    turns: int
+    # number of cards left in each player's hand, by seat
+    cards_left: Tuple[int, ...]
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """
+    Derives an independent 64-bit seed from a master seed and an index (e.g. a game
+    number) using the splitmix64 mixing function, so that every game can be seeded on
+    its own regardless of which order or process it is played in.
+
+    Args:
+        seed (int): The master seed.
+        index (int): The index to derive a seed for.
+
+    Returns:
+        int: The derived 64-bit seed.
+    """
+    z = (seed + (index + 1) * 0x9E3779B97F4A7C15) & _MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return z ^ (z >> 31)
+
+
+def seed_players(players: Sequence[Player], seed: int) -> None:
+    """
+    Seeds each player's random number generator with `derive_seed(seed, seat)`.
+
+    Args:
+        players (Sequence[Player]): The players, by seat.
+        seed (int): The seed to derive the players' seeds from.
+    """
+    for seat, player in enumerate(players):
+        player.rng.seed(derive_seed(seed, seat))
+
+
+def play_game(
+    game: Game,
+    hands: Optional[Sequence[List[str]]] = None,
+    hands_sorted: bool = False,
+) -> GameResult:
+    """
+    Plays a new game to completion without any output, with every player deciding
+    their plays from the game's observation (see `Game.observe`).
+
+    Args:
+        game (Game): The game to play. A new game is started on it.
+        hands (Optional[Sequence[List[str]]], optional): The hand to give each player,
+            e.g. from `deal_hands`. Defaults to None (dealt from the game's deck).
+        hands_sorted (bool, optional): Whether the given hands are already sorted.
+            Defaults to False.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    game.start_new_game(hands, hands_sorted)
+    profile = game.profile
+    turns = 0
+    while True:
+        player = game.get_current_player()
+        observation = game.observe()
+        if profile is None:
+            played_set = player.play_card_set_by_index(player.decide(observation))
+            turns += 1
+            if game.did_player_win(played_set):
+                break
+            game.next_player(played_set)
+            continue
+
+        start = perf_counter()
+        choice = player.decide(observation)
+        profile.add_time(f"decision.{player.player_type()}", start)
+        start = perf_counter()
+        played_set = player.play_card_set_by_index(choice)
+        turns += 1
+        won = game.did_player_win(played_set)
+        if not won:
+            game.next_player(played_set)
+        profile.add_time("bookkeeping", start)
+        if won:
+            break
+
+    return GameResult(
+        game.current_player_index,
+        turns,
+        tuple(len(player.hand) for player in game.players),
+    )
+
+
+def iter_simulate(
+    n_games: int,
+    player_factories: Sequence[PlayerFactory],
+    seed: Optional[int] = None,
+    first_game: int = 0,
+    on_game_end: Optional[Callable[[Game], None]] = None,
+    profile: Optional[GameProfile] = None,
+) -> Iterator[GameResult]:
+    """
+    Plays games one after another, yielding each result as soon as the game ends.
+
+    Each game gets fresh players from the factories. The game's deal id is
+    `derive_seed(seed, game_number)` and the players' random number generators are
+    seeded from it too, so any game can be reproduced on its own. Deals are made in
+    bulk with their hands already sorted (see `utils.dealing.iter_deals`).
+
+    Args:
+        n_games (int): Number of games to play.
+        player_factories (Sequence[PlayerFactory]): One callable per seat returning a
+            new (non-human) player.
+        seed (Optional[int], optional): The master seed. Defaults to None (unseeded).
+        first_game (int, optional): Game number of the first game, used when splitting
+            a run into parts. Defaults to 0.
+        on_game_end (Optional[Callable[[Game], None]], optional): Called with each
+            finished game, e.g. a `TrajectoryWriter` to record it. Defaults to None.
+        profile (Optional[GameProfile], optional): Collects counters and timings over
+            every game. Defaults to None (no profiling).
+
+    Returns:
+        Iterator[GameResult]: The result of each game in order.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    end_game = first_game + n_games
+    for chunk_start in range(first_game, end_game, _DEAL_CHUNK):
+        deal_ids = [
+            derive_seed(seed, game_number)
+            for game_number in range(
+                chunk_start, min(chunk_start + _DEAL_CHUNK, end_game)
+            )
+        ]
+        deals = iter_deals(deal_ids, len(player_factories), _DEAL_CHUNK)
+        for deal_id, hands in zip(deal_ids, deals):
+            game = Game([factory() for factory in player_factories], profile)
+            seed_players(game.players, deal_id)
+            result = play_game(game, hands, hands_sorted=True)
+            if on_game_end is not None:
+                on_game_end(game)
+            yield result
+
+
+def simulate(
+    n_games: int,
+    player_factories: Sequence[PlayerFactory],
+    seed: Optional[int] = None,
+    on_game_end: Optional[Callable[[Game], None]] = None,
+    profile: Optional[GameProfile] = None,
+) -> List[GameResult]:
+    """
+    Plays a batch of games headlessly (no printing or waiting) and returns their results.
+
+    Args:
+        n_games (int): Number of games to play.
+        player_factories (Sequence[PlayerFactory]): One callable per seat returning a
+            new (non-human) player, e.g. `[RandomAIPlayer] * 4`.
+        seed (Optional[int], optional): The master seed. Defaults to None (unseeded).
+        on_game_end (Optional[Callable[[Game], None]], optional): Called with each
+            finished game. Defaults to None.
+        profile (Optional[GameProfile], optional): Collects counters and timings over
+            every game, e.g. to print `profile.report()` at the end. Defaults to None.
+
+    Returns:
+        List[GameResult]: The result of each game in order.
+    """
+    return list(
+        iter_simulate(
+            n_games, player_factories, seed, on_game_end=on_game_end, profile=profile
+        )
+    )
+
+
+def iter_duplicate(
+    n_deals: int,
+    player_factories: Sequence[PlayerFactory],
+    seed: Optional[int] = None,
+    first_deal: int = 0,
+    on_game_end: Optional[Callable[[Game], None]] = None,
+    profile: Optional[GameProfile] = None,
+) -> Iterator[GameResult]:
+    """
+    Plays duplicate-style games: every deal is played once per rotation of the seats,
+    so each player gets to play every hand of the deal and luck of the deal cancels
+    out when comparing players.
+
+    Deal `n` has deal id `derive_seed(seed, n)`. Unlike `iter_simulate`, results are
+    indexed by player (position in `player_factories`) rather than by seat.
+
+    Args:
+        n_deals (int): Number of deals to play. Each deal is played once per player.
+        player_factories (Sequence[PlayerFactory]): One callable per player returning a
+            new (non-human) player.
+        seed (Optional[int], optional): The master seed. Defaults to None (random deals).
+        first_deal (int, optional): Number of the first deal, used when splitting a run
+            into parts. Defaults to 0.
+        on_game_end (Optional[Callable[[Game], None]], optional): Called with each
+            finished game. Defaults to None.
+        profile (Optional[GameProfile], optional): Collects counters and timings over
+            every game. Defaults to None (no profiling).
+
+    Returns:
+        Iterator[GameResult]: The result of each game, by player, with the rotations
+            of each deal in order.
+    """
+    player_count = len(player_factories)
+    for deal_number in range(first_deal, first_deal + n_deals):
+        if seed is None:
+            deal_id = random.getrandbits(64)
+        else:
+            deal_id = derive_seed(seed, deal_number)
+        hands = deal_hands(deal_id, player_count)
+        for rotation in range(player_count):
+            # seat s is taken by player (s + rotation) % player_count
+            seat_players = [
+                (seat + rotation) % player_count for seat in range(player_count)
+            ]
+            game = Game(
+                [player_factories[player]() for player in seat_players], profile
+            )
+            seed_players(game.players, derive_seed(deal_id, rotation))
+            result = play_game(game, hands, hands_sorted=True)
+            if on_game_end is not None:
+                on_game_end(game)
+            yield GameResult(
+                seat_players[result.winner],
+                result.turns,
+                tuple(
+                    result.cards_left[(player - rotation) % player_count]
+                    for player in range(player_count)
+                ),
+            )
+
+
+def simulate_lockstep(
+    n_games: int,
+    agents: Sequence[Agent],
+    seed: Optional[int] = None,
+    table_count: int = 256,
+) -> List[GameResult]:
+    """
+    Plays games on many tables at once, advancing every table by one decision per
+    step. At each step the observations of all the tables waiting on the same seat are
+    decided in a single `decide_batch` call to that seat's agent, so a policy can score
+    hundreds of tables together.
+
+    Game `n` is dealt with deal id `derive_seed(seed, n)`, as in `iter_simulate`, but
+    the agents are shared by every table so their random number generators are not
+    reseeded per game.
+
+    Args:
+        n_games (int): Number of games to play.
+        agents (Sequence[Agent]): The agent deciding for each seat of every table.
+        seed (Optional[int], optional): The master seed. Defaults to None (unseeded).
+        table_count (int, optional): Number of tables played at once. Defaults to 256.
+
+    Returns:
+        List[GameResult]: The result of each game in order.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    player_count = len(agents)
+    results = []
+    for chunk_start in range(0, n_games, table_count):
+        deal_ids = [
+            derive_seed(seed, game_number)
+            for game_number in range(
+                chunk_start, min(chunk_start + table_count, n_games)
+            )
+        ]
+        tables = []
+        for hands in iter_deals(deal_ids, player_count, table_count):
+            game = Game([AgentPlayer(agent) for agent in agents])
+            game.start_new_game(hands, hands_sorted=True)
+            tables.append(game)
+        chunk_results: List[Optional[GameResult]] = [None] * len(tables)
+        turns = [0] * len(tables)
+
+        active = list(range(len(tables)))
+        while active:
+            waiting = [[] for _ in range(player_count)]
+            for table in active:
+                waiting[tables[table].current_player_index].append(table)
+            active = []
+            for seat, seat_tables in enumerate(waiting):
+                if not seat_tables:
+                    continue
+                observations = [tables[table].observe() for table in seat_tables]
+                choices = agents[seat].decide_batch(observations)
+                for table, choice in zip(seat_tables, choices):
+                    game = tables[table]
+                    played_set = game.players[seat].play_card_set_by_index(choice)
+                    turns[table] += 1
+                    if game.did_player_win(played_set):
+                        chunk_results[table] = GameResult(
+                            seat,
+                            turns[table],
+                            tuple(len(player.hand) for player in game.players),
+                        )
+                    else:
+                        game.next_player(played_set)
+                        active.append(table)
+        results.extend(chunk_results)
+    return results
@@ -0,0 +1,246 @@
+import struct
+from typing import (
+    BinaryIO,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from classes.card_set import CardSet
+from classes.game import Game
+from classes.player import LowestAIPlayer, Player
+from utils.bitmask import cards_to_mask, mask_to_cards
+from utils.comparison import HAND_TYPE_TIER
+from utils.constants import PLAYABLE_PRIORITY
+
+# File layout (all little-endian):
+#   file header: magic, format version
+#   per game:    player count, move count, then the card mask dealt to each player,
+#                then one fixed-width record per history entry:
+#                round number, seat, hand type (tier, -1 pass, -2 win), card mask
+_MAGIC = b"B2TR"
+FORMAT_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sH")
+_GAME_HEADER = struct.Struct("<BI")
+_HAND = struct.Struct("<Q")
+_MOVE = struct.Struct("<HBbQ")
+
+_PASS_TIER = -1
+_WIN_TIER = -2
+
+
+class Move(NamedTuple):
+    round_number: int
+    seat: int
+    play: CardSet
+
+
+class GameRecord(NamedTuple):
+    """
+    A recorded game: the hand dealt to each player and the game's history.
+    """
+
+    # card mask of the hand dealt to each player, by seat
+    hands: Tuple[int, ...]
+    # every entry of Game.history, in order
+    moves: List[Move]
+
+    @property
+    def winner(self) -> int:
+        return self.moves[-1].seat
+
+
+def _encode_play(play: CardSet) -> Tuple[int, int]:
+    if play.hand_type == "pass":
+        return _PASS_TIER, 0
+    if play.hand_type == "win":
+        return _WIN_TIER, 0
+    return HAND_TYPE_TIER[play.hand_type], cards_to_mask(play.cards)
+
+
+def _decode_play(tier: int, mask: int) -> CardSet:
+    if tier == _PASS_TIER:
+        return CardSet("pass", [])
+    if tier == _WIN_TIER:
+        return CardSet("win", [])
+    return CardSet.from_mask(PLAYABLE_PRIORITY[tier], mask)
+
+
+def record_game(game: Game) -> GameRecord:
+    """
+    Creates a GameRecord from a game's dealt hands and history.
+
+    Args:
+        game (Game): The game to record.
+
+    Returns:
+        GameRecord: The record of the game.
+    """
+    return GameRecord(
+        tuple(cards_to_mask(hand) for hand in game.dealt_hands),
+        [Move(*entry) for entry in game.history],
+    )
+
+
+class TrajectoryWriter:
+    """
+    Streams games to a compact binary trajectory file as they are played.
+
+    A writer can be passed directly as the `on_game_end` hook of
+    `utils.simulation.simulate` to record every simulated game.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(_MAGIC, FORMAT_VERSION))
+        self.games_written = 0
+
+    def write_record(self, record: GameRecord) -> None:
+        """
+        Writes a single game record to the file.
+
+        Args:
+            record (GameRecord): The record to write.
+        """
+        parts = [_GAME_HEADER.pack(len(record.hands), len(record.moves))]
+        parts.extend(_HAND.pack(hand) for hand in record.hands)
+        for round_number, seat, play in record.moves:
+            parts.append(_MOVE.pack(round_number, seat, *_encode_play(play)))
+        self._file.write(b"".join(parts))
+        self.games_written += 1
+
+    def write_game(self, game: Game) -> None:
+        """
+        Writes a finished game to the file.
+
+        Args:
+            game (Game): The game to write.
+        """
+        self.write_record(record_game(game))
+
+    def __call__(self, game: Game) -> None:
+        self.write_game(game)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Reads the games from a binary trajectory file written by TrajectoryWriter, either
+    in order or by game number.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._offsets: Optional[List[int]] = None
+        with open(path, "rb") as file:
+            magic, version = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a trajectory file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trajectory format version {version}")
+
+    @staticmethod
+    def _read_record(file: BinaryIO) -> Optional[GameRecord]:
+        header = file.read(_GAME_HEADER.size)
+        if not header:
+            return None
+        player_count, move_count = _GAME_HEADER.unpack(header)
+        hands = tuple(
+            hand for (hand,) in _HAND.iter_unpack(file.read(_HAND.size * player_count))
+        )
+        moves = [
+            Move(round_number, seat, _decode_play(tier, mask))
+            for round_number, seat, tier, mask in _MOVE.iter_unpack(
+                file.read(_MOVE.size * move_count)
+            )
+        ]
+        return GameRecord(hands, moves)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        with open(self.path, "rb") as file:
+            file.seek(_FILE_HEADER.size)
+            while True:
+                record = self._read_record(file)
+                if record is None:
+                    return
+                yield record
+
+    def _index(self) -> List[int]:
+        # file offset of each game, found by skipping from header to header
+        if self._offsets is None:
+            self._offsets = []
+            with open(self.path, "rb") as file:
+                offset = _FILE_HEADER.size
+                file.seek(offset)
+                while header := file.read(_GAME_HEADER.size):
+                    self._offsets.append(offset)
+                    player_count, move_count = _GAME_HEADER.unpack(header)
+                    offset += (
+                        _GAME_HEADER.size
+                        + _HAND.size * player_count
+                        + _MOVE.size * move_count
+                    )
+                    file.seek(offset)
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __getitem__(self, game_number: int) -> GameRecord:
+        offset = self._index()[game_number]
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            return self._read_record(file)
+
+
+def replay_game(
+    record: GameRecord,
+    player_factory: Callable[[], Player] = LowestAIPlayer,
+) -> Game:
+    """
+    Replays a recorded game through Game, checking that every recorded play was a
+    valid option at the time it was made.
+
+    Args:
+        record (GameRecord): The game to replay.
+        player_factory (Callable[[], Player], optional): Creates the player for each
+            seat. Their choices are ignored, the recorded plays are made instead.
+            Defaults to LowestAIPlayer.
+
+    Raises:
+        ValueError: If a recorded play is out of turn or not a valid option.
+
+    Returns:
+        Game: The finished game, with the same history as the recorded game.
+    """
+    players: Sequence[Player] = [player_factory() for _ in record.hands]
+    game = Game(players)
+    game.start_new_game([mask_to_cards(hand) for hand in record.hands])
+
+    for _, seat, play in record.moves:
+        if play.hand_type == "win":
+            break
+        if seat != game.current_player_index:
+            raise ValueError(f"Recorded play {play} is out of turn")
+        player = game.get_current_player()
+        options = player.get_play_options(game.last_played_set, game.is_first_turn)
+        if play not in options:
+            raise ValueError(f"Recorded play {play} is not a valid option")
+        player.play_card_set_by_index(options.index(play))
+        if game.did_player_win(play):
+            break
+        game.next_player(play)
+
+    return game
@@ -0,0 +1,274 @@
+import os
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from classes.batch_env import IN_HAND, PLAYED, UNKNOWN
+from classes.game import Game
+from utils.action_catalogue import ActionCatalogue, from_card_masks, get_catalogue
+from utils.bitmask import CARD_COUNT, cards_to_mask
+
+# File layout: an 8-byte header (magic, format version, player count) followed by one
+# DECISION_DTYPE record per decision, so a file can be memory-mapped as a flat array.
+_MAGIC = b"B2DS"
+FORMAT_VERSION = 1
+_HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u2"), ("players", "<u2")])
+MAX_PLAYERS = 4
+
+DECISION_DTYPE = np.dtype(
+    [
+        # card mask of the deciding player's hand
+        ("hand", "<u8"),
+        # card mask of every card played before the decision
+        ("played", "<u8"),
+        # cards left in each hand, starting from the deciding player's seat
+        ("cards_left", "i1", (MAX_PLAYERS,)),
+        ("seat", "u1"),
+        ("is_first_turn", "?"),
+        # action id of the play to beat, -1 if free to play anything
+        ("previous_action", "<i4"),
+        # action id of the decision taken
+        ("action", "<i4"),
+        # 1 if the deciding player went on to win the game, -1 otherwise
+        ("outcome", "i1"),
+    ]
+)
+
+
+class DecisionBatch(NamedTuple):
+    # (B x 52) card states from the deciding player's point of view
+    state: np.ndarray
+    # (B x A) legal actions
+    legal: np.ndarray
+    # (B) action id taken
+    action: np.ndarray
+    # (B) 1 if the deciding player won the game, -1 otherwise
+    outcome: np.ndarray
+
+
+def game_decisions(game: Game, catalogue: ActionCatalogue) -> np.ndarray:
+    """
+    Rebuilds every decision of a finished game from its dealt hands and history.
+
+    Args:
+        game (Game): The finished game.
+        catalogue (ActionCatalogue): The catalogue giving each play's action id.
+
+    Returns:
+        np.ndarray: One DECISION_DTYPE record per play or pass.
+    """
+    player_count = len(game.dealt_hands)
+    if player_count > MAX_PLAYERS:
+        raise ValueError(f"At most {MAX_PLAYERS} players are supported")
+    hands = [cards_to_mask(hand) for hand in game.dealt_hands]
+    moves = [entry for entry in game.history if entry[2].hand_type != "win"]
+    winner = game.history[-1][1]
+
+    decisions = np.zeros(len(moves), dtype=DECISION_DTYPE)
+    played = 0
+    previous_action = -1
+    previous_round = moves[0][0] if moves else 0
+    for idx, (round_number, seat, play) in enumerate(moves):
+        if round_number != previous_round:
+            previous_action = -1
+            previous_round = round_number
+        action = catalogue.action_id(play)
+        decision = decisions[idx]
+        decision["hand"] = hands[seat]
+        decision["played"] = played
+        decision["cards_left"][:player_count] = [
+            hands[(seat + offset) % player_count].bit_count()
+            for offset in range(player_count)
+        ]
+        decision["seat"] = seat
+        decision["is_first_turn"] = idx == 0
+        decision["previous_action"] = previous_action
+        decision["action"] = action
+        decision["outcome"] = 1 if seat == winner else -1
+        if action != catalogue.pass_action:
+            play_mask = int(catalogue.masks[action])
+            hands[seat] &= ~play_mask
+            played |= play_mask
+            previous_action = action
+    return decisions
+
+
+class DatasetWriter:
+    """
+    Appends the decisions of finished games to a dataset file. Pass it as the
+    `on_game_end` hook of `utils.simulation.simulate` to record simulated games.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        player_count: int = 4,
+        catalogue: Optional[ActionCatalogue] = None,
+    ) -> None:
+        self.catalogue = catalogue or get_catalogue()
+        self.player_count = player_count
+        self.decisions_written = 0
+        self._file = open(path, "wb")
+        header = np.array([(_MAGIC, FORMAT_VERSION, player_count)], dtype=_HEADER_DTYPE)
+        self._file.write(header.tobytes())
+
+    def write_game(self, game: Game) -> None:
+        """
+        Writes every decision of a finished game.
+
+        Args:
+            game (Game): The finished game.
+        """
+        if len(game.dealt_hands) != self.player_count:
+            raise ValueError(f"Expected a game with {self.player_count} players")
+        decisions = game_decisions(game, self.catalogue)
+        self._file.write(decisions.tobytes())
+        self.decisions_written += len(decisions)
+
+    def __call__(self, game: Game) -> None:
+        self.write_game(game)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def open_decisions(path: str) -> np.ndarray:
+    """
+    Memory-maps the decisions of a dataset file without reading them into memory.
+
+    Args:
+        path (str): The dataset file.
+
+    Raises:
+        ValueError: If the file is not a dataset file of a supported version.
+
+    Returns:
+        np.ndarray: A read-only memory-mapped array of DECISION_DTYPE records.
+    """
+    header = np.fromfile(path, dtype=_HEADER_DTYPE, count=1)
+    if len(header) == 0 or header["magic"][0] != _MAGIC:
+        raise ValueError(f"{path} is not a trajectory dataset")
+    if header["version"][0] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format version in {path}")
+    if os.path.getsize(path) == _HEADER_DTYPE.itemsize:
+        return np.zeros(0, dtype=DECISION_DTYPE)
+    return np.memmap(
+        path, dtype=DECISION_DTYPE, mode="r", offset=_HEADER_DTYPE.itemsize
+    )
+
+
+def state_encoding(hand_masks: np.ndarray, played_masks: np.ndarray) -> np.ndarray:
+    """
+    Encodes decisions the same way as `BatchGameEnv.state_encoding` (B x 52): 0 if the
+    card's location is unknown, 1 if it is in the player's hand and 2 if it has been
+    played.
+
+    Args:
+        hand_masks (np.ndarray): The card mask of each deciding player's hand (B).
+        played_masks (np.ndarray): The card mask of the cards played so far (B).
+
+    Returns:
+        np.ndarray: The (B x 52) int8 encoding.
+    """
+    encoding = np.full((len(hand_masks), CARD_COUNT), UNKNOWN, dtype=np.int8)
+    encoding[from_card_masks(hand_masks)] = IN_HAND
+    encoding[from_card_masks(played_masks)] = PLAYED
+    return encoding
+
+
+class TrajectoryDataset:
+    """
+    Random access to the decisions of one or more dataset files, memory-mapped so
+    corpora larger than memory can be sampled from. Only the records of a requested
+    batch are read, and state encodings and legal masks are derived per batch.
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, Sequence[str]],
+        catalogue: Optional[ActionCatalogue] = None,
+    ) -> None:
+        if isinstance(paths, str):
+            paths = [paths]
+        self.catalogue = catalogue or get_catalogue()
+        self._files: List[np.ndarray] = [open_decisions(path) for path in paths]
+        # index of the first decision of each file, plus the total
+        self._starts = np.cumsum([0] + [len(file) for file in self._files])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def records(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the raw DECISION_DTYPE records at the given indices.
+
+        Args:
+            indices (np.ndarray): Indices of the decisions across all files.
+
+        Returns:
+            np.ndarray: The records, in the order requested.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(self._files) == 1:
+            return self._files[0][indices]
+        records = np.empty(len(indices), dtype=DECISION_DTYPE)
+        file_numbers = np.searchsorted(self._starts, indices, "right") - 1
+        for file_number in np.unique(file_numbers):
+            rows = np.flatnonzero(file_numbers == file_number)
+            records[rows] = self._files[file_number][
+                indices[rows] - self._starts[file_number]
+            ]
+        return records
+
+    def batch(self, indices: np.ndarray) -> DecisionBatch:
+        """
+        Returns the decisions at the given indices as training arrays.
+
+        Args:
+            indices (np.ndarray): Indices of the decisions across all files.
+
+        Returns:
+            DecisionBatch: The batch.
+        """
+        records = self.records(indices)
+        return DecisionBatch(
+            state_encoding(records["hand"], records["played"]),
+            self.catalogue.legal_masks(
+                records["hand"], records["previous_action"], records["is_first_turn"]
+            ),
+            records["action"],
+            records["outcome"],
+        )
+
+    def iter_batches(
+        self, batch_size: int, shuffle: bool = True, seed: Optional[int] = None
+    ) -> Iterator[DecisionBatch]:
+        """
+        Yields batches covering every decision once.
+
+        Args:
+            batch_size (int): Number of decisions per batch. The last batch may be
+                smaller.
+            shuffle (bool, optional): Whether to visit decisions in a random order.
+                Defaults to True.
+            seed (Optional[int], optional): Seed for the shuffle. Defaults to None.
+
+        Returns:
+            Iterator[DecisionBatch]: The batches.
+        """
+        if shuffle:
+            order = np.random.default_rng(seed).permutation(len(self))
+        else:
+            order = np.arange(len(self))
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start : start + batch_size]
+            if shuffle:
+                # reading in file order keeps page access sequential within a batch
+                batch_indices = np.sort(batch_indices)
+            yield self.batch(batch_indices)